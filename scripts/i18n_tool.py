@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+"""
+Ferramenta de linha de comando para os arquivos de idioma (src/locales).
+
+Uso:
+    python3 scripts/i18n_tool.py sync                  # aplica todos os patches
+    python3 scripts/i18n_tool.py sync --source sync_i18n --locale es
+    python3 scripts/i18n_tool.py sync --jobs 0         # um processo por CPU
+    python3 scripts/i18n_tool.py sync --no-manifest    # força o reprocessamento
+    python3 scripts/i18n_tool.py sync --dry-run        # mostra as mudanças chave a chave
+    python3 scripts/i18n_tool.py sync --stream         # memória limitada em catálogos enormes
+    python3 scripts/i18n_tool.py journal list          # lotes gravados
+    python3 scripts/i18n_tool.py journal rollback [ID] # desfaz um lote (padrão: o último)
+    python3 scripts/i18n_tool.py watch [--poll]        # reaplica os patches a cada edição
+    python3 scripts/i18n_tool.py sync --profile .i18n-cache/sync.trace.json  # tempo por fase
+    python3 scripts/i18n_tool.py audit [--json]        # chaves faltando/extras/órfãs
+    python3 scripts/i18n_tool.py validate [--strict]   # placeholders, plurais e estrutura
+    python3 scripts/i18n_tool.py fill-missing --url http://127.0.0.1:8765/  # tradução automática
+    python3 scripts/i18n_tool.py mt-stub               # backend de tradução local para testes
+    python3 scripts/i18n_tool.py store missing --locale ja  # consultas no banco SQLite dos idiomas
+    python3 scripts/i18n_tool.py store diff v1.2           # mudanças desde o snapshot v1.2
+    python3 scripts/i18n_tool.py bench --keys 10000 1000000 [--compare abc123]
+    python3 scripts/i18n_tool.py bundle --split admin.usersDashboard [--production]
+    python3 scripts/i18n_tool.py emit                  # JSON minificado + .gz/.br
+    python3 scripts/i18n_tool.py emit --fallbacks      # catálogos completos (pt-PT → pt → en)
+    python3 scripts/i18n_tool.py emit --hashed         # es.<hash>.json canônico + catalogs.json
+    python3 scripts/i18n_tool.py emit --variants delta # variantes regionais só com o que difere da base
+    python3 scripts/i18n_tool.py compile [--fallbacks]  # catálogos binários (.cat) para leitura via mmap
+    python3 scripts/i18n_tool.py variant list          # variantes, base e tamanho do delta
+    python3 scripts/i18n_tool.py variant extract pt-PT # grava o delta em src/locales/variants
+    python3 scripts/i18n_tool.py usage [--prune]       # chaves sem uso no código
+    python3 scripts/i18n_tool.py dedup [--json]        # textos duplicados e idênticos ao en
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from i18n_tools import LOCALES_DIR, SOURCES, Manifest, apply_patches, gather_patches  # noqa: E402
+from i18n_tools import bench  # noqa: E402
+from i18n_tools.artifacts import CATALOGS_NAME, emit_locales, print_sizes  # noqa: E402
+from i18n_tools.audit import audit_locales, available_locales, print_report  # noqa: E402
+from i18n_tools.bundles import BUNDLES_DIR, build_bundles  # noqa: E402
+from i18n_tools.catalog import CATALOG_SUFFIX, CATALOGS_DIR, compile_locales, print_compiled  # noqa: E402
+from i18n_tools.dedup import dedup_locales, print_dedup  # noqa: E402
+from i18n_tools.engine import report  # noqa: E402
+from i18n_tools.fallbacks import materialize_locales, print_fallbacks, write_fallback_report  # noqa: E402
+from i18n_tools.journal import COMMITTED, Journal  # noqa: E402
+from i18n_tools.locales import REFERENCE_LOCALE  # noqa: E402
+from i18n_tools.profiling import Profile, add_profile_arguments, finish_profile, profile_results  # noqa: E402
+from i18n_tools.store import STORE_PATH, LocaleStore  # noqa: E402
+from i18n_tools.translate import (  # noqa: E402
+    BACKENDS, TRANSLATION_CACHE_PATH, TranslationCache, fill_missing, print_fill, serve_stub,
+)
+from i18n_tools.usage import USAGE_CACHE_PATH, build_usage_index, prune_unused, usage_report  # noqa: E402
+from i18n_tools.validate import print_validation, validate_locales  # noqa: E402
+from i18n_tools.variants import (  # noqa: E402
+    DELTA, EMIT_MODES, EXPANDED, extract_variant, load_variants, print_variants, variant_sources,
+    variant_trees, write_variant_index,
+)
+from i18n_tools.watch import DEBOUNCE_SECONDS, WatchSession, watch  # noqa: E402
+
+
+def cmd_sync(args):
+    """Apply every pending patch with one read and one write per locale"""
+    if args.stream and args.dry_run:
+        print("❌ --dry-run precisa do idioma inteiro em memória; não combina com --stream")
+        return 2
+    print("🌐 Sincronizando chaves i18n...")
+    patches = gather_patches(args.source, args.locale, args.locales_dir)
+    manifest = None if args.no_manifest else Manifest.load()
+    # O journal guarda o conteúdo anterior de cada arquivo, o que o streaming evita carregar
+    journal = None if args.no_journal or args.dry_run or args.stream else Journal()
+    results = apply_patches(patches, args.locales_dir, args.jobs, manifest, args.dry_run, journal, args.stream)
+    ok = report(results, args.dry_run)
+    finish_profile(profile_results("sync", results), args.profile)
+    if args.dry_run:
+        print("\n📝 Dry run: nenhum arquivo foi gravado")
+    elif journal is not None and journal.last_batch:
+        print(f"\n🧾 Lote {journal.last_batch} registrado no journal")
+    print("\n✅ Sincronização completa!" if ok else "\n❌ Sincronização com erros (nenhum arquivo gravado)")
+    return 0 if ok else 1
+
+
+def cmd_journal(args):
+    """List, inspect, roll back or replay the recorded sync batches"""
+    journal = Journal()
+    if args.action == "list":
+        for batch_id in journal.batch_ids():
+            entry = journal.load(batch_id)
+            print(f"{batch_id}  {entry['status']:<12} {', '.join(entry['locales'])}")
+        return 0
+
+    batch_id = args.batch or journal.latest(COMMITTED)
+    if batch_id is None:
+        print("❌ Nenhum lote registrado no journal")
+        return 1
+
+    if args.action == "show":
+        entry = journal.load(batch_id)
+        print(f"🧾 Lote {batch_id} ({entry['status']}, {entry['created']})")
+        for locale_code, item in entry["locales"].items():
+            stats = item["stats"]
+            sources = ", ".join(p["source"] for p in item["patches"])
+            print(f"   {locale_code}: +{stats['added']} ~{stats['overwritten']} -{stats['removed']} ({sources})")
+        return 0
+
+    if args.action == "rollback":
+        outcome = journal.rollback(batch_id, args.force)
+        for locale_code, status in outcome.items():
+            icon = {"restored": "↩️ ", "unchanged": "✔️ ", "conflict": "⚠️ "}[status]
+            print(f"{icon} {locale_code}.json: {status}")
+        if "conflict" in outcome.values():
+            print("\n⚠️  Arquivos editados depois do lote não foram restaurados (use --force)")
+            return 1
+        print(f"\n↩️  Lote {batch_id} desfeito")
+        return 0
+
+    # replay: reaplica os patches registrados como um novo lote
+    results = apply_patches(journal.patches(batch_id), args.locales_dir, journal=journal)
+    ok = report(results)
+    if journal.last_batch:
+        print(f"\n🧾 Replay registrado como lote {journal.last_batch}")
+    return 0 if ok else 1
+
+
+def cmd_watch(args):
+    """Re-apply the affected patches whenever a source or locale file changes"""
+    session = WatchSession(args.source, args.locale, args.locales_dir)
+
+    def on_results(results, errors, seconds):
+        for name, error in errors.items():
+            print(f"❌ {name}: {error}")
+        if results:
+            report(results)
+            if seconds:
+                print(f"   ⏱️  {seconds * 1000:.0f} ms")
+
+    print("👀 Observando os scripts de patches e src/locales (Ctrl+C para sair)...")
+    try:
+        watch(session, on_results, args.poll, args.debounce / 1000)
+    except KeyboardInterrupt:
+        print("\n👋 Watch encerrado")
+    return 0
+
+
+def cmd_audit(args):
+    """Report missing, extra and orphaned keys for all locales in one pass"""
+    profile = Profile("audit") if args.profile else None
+    audit_report = audit_locales(args.locale, args.reference, args.locales_dir, profile)
+    if args.json:
+        print(json.dumps(audit_report.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        print_report(audit_report)
+    if profile is not None:
+        finish_profile(profile, args.profile, quiet=args.json)
+    return 0 if audit_report.ok else 1
+
+
+def cmd_validate(args):
+    """Check placeholders, plural forms and structure of every locale"""
+    validation = validate_locales(args.locale, args.reference, args.locales_dir)
+    if args.json:
+        print(json.dumps(validation.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        print_validation(validation)
+    failed = not validation.ok or (args.strict and validation.warnings)
+    return 1 if failed else 0
+
+
+def cmd_fill_missing(args):
+    """Machine-translate the keys the audit reports as missing and apply them as one batch"""
+    backend = BACKENDS[args.backend](args.url, args.api_key)
+    cache = TranslationCache(None if args.no_cache else args.cache)
+    fill = fill_missing(backend, args.locale, args.reference, args.locales_dir, cache, args.batch_size,
+                        args.concurrency, args.rate, args.retries, args.dry_run)
+    print_fill(fill, args.dry_run)
+    if args.dry_run or not fill.patches:
+        return 1 if fill.errors else 0
+    journal = Journal()
+    ok = report(apply_patches(fill.patches, args.locales_dir, journal=journal))
+    if journal.last_batch:
+        print(f"\n🧾 Lote {journal.last_batch} registrado no journal (desfaça com `journal rollback`)")
+    return 0 if ok and not fill.errors else 1
+
+
+def cmd_mt_stub(args):
+    """Serve the stub translation backend for local runs of fill-missing"""
+    print(f"🧪 Backend de tradução stub em http://127.0.0.1:{args.port}/ (Ctrl+C para sair)")
+    try:
+        serve_stub(args.port, args.latency / 1000)
+    except KeyboardInterrupt:
+        print("\n👋 Stub encerrado")
+    return 0
+
+
+def cmd_store(args):
+    """Query, snapshot or export the SQLite store (re-imports the changed files first)"""
+    with LocaleStore(args.db) as store:
+        imported = store.import_locales(args.locales_dir, force=args.action == "import" and args.force)
+        if args.action == "import":
+            print(f"🗄️  {len(imported.imported)} idiomas importados ({imported.rows} chaves), "
+                  f"{len(imported.unchanged)} sem mudança, {len(imported.removed)} removidos "
+                  f"em {imported.seconds * 1000:.0f} ms → {args.db}")
+            return 0
+        if args.action == "missing":
+            locales = args.locale or [l for l in store.locales() if l != args.reference]
+            for locale_code in locales:
+                keys = store.missing(locale_code, args.reference)
+                print(f"[{locale_code.upper()}] {len(keys)} chaves faltando")
+                for key in keys:
+                    print(f"  - {key}")
+            return 0
+        if args.action == "english":
+            rows = [r for l in (args.locale or [None]) for r in store.same_as(locale_code=l)]
+            for locale_code, path, value in rows:
+                print(f"{locale_code:<6} {path}: {value!r}")
+            print(f"\n{len(rows)} textos idênticos ao en")
+            return 0
+        if args.action == "snapshot":
+            print(f"📸 Snapshot {args.name!r}: {store.snapshot(args.name)} chaves")
+            return 0
+        if args.action == "diff":
+            rows = [r for l in (args.locale or [None]) for r in store.diff(args.name, l)]
+            icons = {"added": "+", "removed": "-", "changed": "~"}
+            for locale_code, path, kind in rows:
+                print(f"{icons[kind]} {locale_code:<6} {path}")
+            print(f"\n{len(rows)} mudanças desde {args.name!r}")
+            return 0
+        if args.action == "sql":
+            columns, rows = store.query(args.name)
+            if columns:
+                print("\t".join(columns))
+            for row in rows:
+                print("\t".join("" if v is None else str(v) for v in row))
+            return 0
+        # export
+        if args.check:
+            differs = store.check_export(args.locales_dir)
+            for locale_code in differs:
+                print(f"❌ {locale_code}.json difere da exportação")
+            if not differs:
+                print("✅ Exportação idêntica aos arquivos")
+            return 1 if differs else 0
+        out = args.out or args.locales_dir
+        for locale_code, changed in store.export_locales(out, args.locale).items():
+            print(f"{'💾' if changed else '✔️ '} {locale_code}.json{'' if changed else ' sem mudança'}")
+        return 0
+
+
+def cmd_bench(args):
+    """Time each phase of the pipeline on synthetic catalogs"""
+    previous = bench.load_results() if args.compare else []
+    records = []
+    for keys in args.keys:
+        record = bench.run_benchmark(keys, args.depth, args.ratio, args.repeat, memory=not args.no_memory)
+        baseline = bench.baseline_for(record, args.compare, previous) if args.compare else None
+        bench.print_record(record, baseline)
+        records.append(record)
+    if not args.no_save:
+        bench.save_results(records)
+        print(f"💾 Resultados salvos em {bench.RESULTS_PATH}")
+    return 0
+
+
+def _output_trees(args, write_reports=True):
+    """Locales and trees to emit: regional variants per --variants, then --fallbacks
+
+    Returns (locales, trees, variants); variants stored only as a delta are
+    expanded here since they have no file in src/locales. Without
+    write_reports nothing is written to --out (compile --check).
+    """
+    variants = load_variants(args.locales_dir)
+    locales = args.locale or sorted(set(available_locales(args.locales_dir)) | set(variants))
+    if args.fallbacks:
+        stored = {code: v.expanded for code, v in variants.items() if v.stored}
+        resolved = materialize_locales(locales, args.locales_dir, trees=stored)
+        print_fallbacks(resolved)
+        if write_reports:
+            write_fallback_report(resolved, args.out)
+        trees = {locale_code: m.tree for locale_code, m in resolved.items()}
+    else:
+        trees = variant_trees(variants, args.variants)
+    if args.variants == DELTA and write_reports:
+        write_variant_index({code: v for code, v in variants.items() if code in locales}, args.out)
+    return locales, trees, variants
+
+
+def _check_variant_mode(args):
+    if args.fallbacks and args.variants == DELTA:
+        print("❌ --fallbacks gera catálogos completos; não combina com --variants delta")
+        return False
+    return True
+
+
+def cmd_bundle(args):
+    """Split each locale into per-namespace files plus a manifest"""
+    if not _check_variant_mode(args):
+        return 2
+    print(f"📦 Gerando bundles por namespace em {args.out}...")
+    locales, trees, _ = _output_trees(args)
+    for bundle in build_bundles(locales, args.out, args.split or (), args.locales_dir, args.production, trees):
+        changed = sum(1 for f in bundle.files.values() if f.changed)
+        print(f"✅ {bundle.locale}: {len(bundle.files)} namespaces, {bundle.bytes / 1024:.1f} KB"
+              f" ({changed} atualizados)")
+    return 0
+
+
+def cmd_emit(args):
+    """Write minified, precompressed production catalogs"""
+    if not _check_variant_mode(args):
+        return 2
+    print(f"🗜️  Gerando catálogos de produção em {args.out}...\n")
+    locales, trees, variants = _output_trees(args)
+    if args.fallbacks:
+        print("")
+    sources = variant_sources(variants, args.locales_dir)
+    artifacts = emit_locales(locales, args.out, args.locales_dir, not args.no_compress, trees, sources,
+                             args.canonical, args.hashed)
+    print_sizes(artifacts)
+    if args.hashed:
+        print(f"\n🔖 {len(artifacts)} catálogos com hash no nome; mapa em {os.path.join(args.out, CATALOGS_NAME)}")
+    return 0
+
+
+def cmd_compile(args):
+    """Compile the locales into memory-mappable binary catalogs"""
+    locales, trees, variants = _output_trees(args, write_reports=not args.check)
+    sources = variant_sources(variants, args.locales_dir)
+    compiled = compile_locales(locales, args.out, args.locales_dir, trees, sources, args.check)
+    if args.check:
+        stale = [c.locale for c in compiled if c.changed]
+        for locale_code in stale:
+            print(f"❌ {locale_code}{CATALOG_SUFFIX} ausente ou desatualizado")
+        if not stale:
+            print(f"✅ {len(compiled)} catálogos compilados em dia")
+        return 1 if stale else 0
+    print(f"🧱 Compilando catálogos binários em {args.out}...\n")
+    print_compiled(compiled)
+    return 0
+
+
+def cmd_variant(args):
+    """List the regional variants or store a full locale as a delta over its base"""
+    if args.action == "extract":
+        if not args.code:
+            print("❌ Informe o idioma a extrair, ex.: variant extract pt-PT")
+            return 2
+        variant = extract_variant(args.code, args.locales_dir)
+        delta_bytes, expanded_bytes = variant.sizes()
+        print(f"✂️  {args.code} → variants/{args.code}.json: {variant.to_dict()['keys']} chaves diferem de "
+              f"{variant.base} ({delta_bytes / 1024:.1f} KB de {expanded_bytes / 1024:.1f} KB)")
+        print(f"   src/locales/{args.code}.json continua sendo a fonte (sync, watch, audit, usage e store só leem "
+              f"os arquivos completos); o delta é ignorado enquanto ele existir")
+        return 0
+    variants = load_variants(args.locales_dir)
+    if args.json:
+        print(json.dumps({c: v.to_dict() for c, v in variants.items()}, ensure_ascii=False, indent=2))
+    else:
+        print_variants(variants)
+    return 0
+
+
+def cmd_usage(args):
+    """Find translation keys that no component references"""
+    usage = build_usage_index(cache_path=None if args.no_cache else USAGE_CACHE_PATH, jobs=args.jobs)
+    usage_rep = usage_report(usage, args.reference, args.locales_dir)
+
+    if args.json:
+        print(json.dumps(usage_rep.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        print(f"🔎 {usage_rep.files} arquivos ({usage_rep.scanned} reescaneados), "
+              f"{len(usage.keys)} chaves e {len(usage.prefixes)} prefixos dinâmicos em uso\n")
+        print(f"Chaves de {usage_rep.reference.upper()} sem uso no código: "
+              f"{len(usage_rep.unused)} de {usage_rep.total_keys}")
+        for key in usage_rep.unused:
+            print(f"  - {key}")
+        if usage_rep.undefined:
+            print(f"\nChaves usadas no código que não existem em {usage_rep.reference.upper()}:")
+            for key in usage_rep.undefined:
+                print(f"  ? {key}")
+
+    if args.prune and usage_rep.unused:
+        journal = Journal()
+        try:
+            removed = prune_unused(usage_rep.unused, available_locales(args.locales_dir), args.locales_dir, journal)
+        except OSError as e:
+            print(f"❌ {e}")
+            return 1
+        for locale_code, count in removed.items():
+            print(f"🧹 {locale_code}.json: {count} chaves removidas")
+        if journal.last_batch:
+            print(f"\n🧾 Lote {journal.last_batch} registrado no journal (desfaça com `journal rollback`)")
+    return 0
+
+
+def cmd_dedup(args):
+    """Report duplicated values with suggested shared keys"""
+    dedup_rep = dedup_locales(args.locale, args.reference, args.locales_dir, args.min_length)
+    if args.json:
+        print(json.dumps(dedup_rep.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        print_dedup(dedup_rep, args.limit)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Ferramentas i18n do WebQuizMedicina")
+    parser.add_argument("--locales-dir", default=LOCALES_DIR, help="diretório dos arquivos de idioma")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync = subparsers.add_parser("sync", help="aplica os patches de tradução pendentes")
+    sync.add_argument("--source", action="append", choices=list(SOURCES),
+                      help="limita a um script de patches (pode repetir)")
+    sync.add_argument("--locale", action="append", help="limita a um idioma (pode repetir)")
+    sync.add_argument("--jobs", "-j", type=int, default=1,
+                      help="processos em paralelo, um idioma por vez em cada (0 = um por CPU)")
+    sync.add_argument("--no-manifest", action="store_true",
+                      help="reprocessa todos os idiomas, ignorando o manifesto de hashes")
+    sync.add_argument("--dry-run", action="store_true",
+                      help="mostra as mudanças chave a chave sem gravar nada")
+    sync.add_argument("--no-journal", action="store_true", help="não registra o lote no journal")
+    sync.add_argument("--stream", action="store_true",
+                      help="merge em streaming, com memória limitada para arquivos muito grandes (sem journal)")
+    add_profile_arguments(sync)
+    sync.set_defaults(func=cmd_sync)
+
+    journal_parser = subparsers.add_parser("journal", help="lista, desfaz ou reaplica lotes de sincronização")
+    journal_parser.add_argument("action", choices=["list", "show", "rollback", "replay"])
+    journal_parser.add_argument("batch", nargs="?", help="id do lote (padrão: o último gravado)")
+    journal_parser.add_argument("--force", action="store_true",
+                                help="no rollback, restaura mesmo arquivos editados depois do lote")
+    journal_parser.set_defaults(func=cmd_journal)
+
+    watch_parser = subparsers.add_parser("watch", help="reaplica os patches quando os arquivos mudam")
+    watch_parser.add_argument("--source", action="append", choices=list(SOURCES),
+                              help="limita a um script de patches (pode repetir)")
+    watch_parser.add_argument("--locale", action="append", help="limita a um idioma (pode repetir)")
+    watch_parser.add_argument("--poll", action="store_true", help="usa polling em vez de inotify")
+    watch_parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS * 1000,
+                              help="espera (ms) por mais eventos antes de aplicar")
+    watch_parser.set_defaults(func=cmd_watch)
+
+    audit = subparsers.add_parser("audit", help="audita chaves faltando, extras e órfãs")
+    audit.add_argument("--reference", default=REFERENCE_LOCALE, help="idioma de referência (padrão: pt)")
+    audit.add_argument("--locale", action="append", help="limita a um idioma (pode repetir)")
+    audit.add_argument("--json", action="store_true", help="saída em JSON")
+    add_profile_arguments(audit)
+    audit.set_defaults(func=cmd_audit)
+
+    validate = subparsers.add_parser("validate", help="valida placeholders, plurais (CLDR) e estrutura")
+    validate.add_argument("--reference", default=REFERENCE_LOCALE, help="idioma de referência (padrão: pt)")
+    validate.add_argument("--locale", action="append", help="limita a um idioma (pode repetir)")
+    validate.add_argument("--strict", action="store_true", help="avisos também falham")
+    validate.add_argument("--json", action="store_true", help="saída em JSON")
+    validate.set_defaults(func=cmd_validate)
+
+    fill = subparsers.add_parser("fill-missing", help="traduz automaticamente as chaves faltando")
+    fill.add_argument("--backend", choices=list(BACKENDS), default="http", help="backend de tradução")
+    fill.add_argument("--url", default=os.environ.get("I18N_MT_URL"),
+                      help="endpoint do backend http (padrão: $I18N_MT_URL)")
+    fill.add_argument("--api-key", default=os.environ.get("I18N_MT_KEY"),
+                      help="token Bearer do backend (padrão: $I18N_MT_KEY)")
+    fill.add_argument("--locale", action="append", help="limita a um idioma (pode repetir)")
+    fill.add_argument("--reference", default=REFERENCE_LOCALE, help="idioma de origem (padrão: pt)")
+    fill.add_argument("--batch-size", type=int, default=50, help="textos por requisição (padrão: 50)")
+    fill.add_argument("--concurrency", type=int, default=4, help="requisições simultâneas (padrão: 4)")
+    fill.add_argument("--rate", type=float, default=0, help="máximo de requisições por segundo (0 = sem limite)")
+    fill.add_argument("--retries", type=int, default=4, help="novas tentativas em 429/5xx e falhas de rede")
+    fill.add_argument("--cache", default=TRANSLATION_CACHE_PATH, help="arquivo do cache de traduções")
+    fill.add_argument("--no-cache", action="store_true", help="não lê nem grava o cache")
+    fill.add_argument("--dry-run", action="store_true", help="só conta o que seria traduzido")
+    fill.set_defaults(func=cmd_fill_missing)
+
+    stub = subparsers.add_parser("mt-stub", help="servidor local que imita o backend de tradução")
+    stub.add_argument("--port", type=int, default=8765, help="porta (padrão: 8765)")
+    stub.add_argument("--latency", type=float, default=0, help="atraso por requisição em ms")
+    stub.set_defaults(func=cmd_mt_stub)
+
+    store = subparsers.add_parser("store", help="banco SQLite dos idiomas: consultas, snapshots e exportação")
+    store.add_argument("action", choices=("import", "missing", "english", "snapshot", "diff", "sql", "export"))
+    store.add_argument("name", nargs="?", help="nome do snapshot (snapshot/diff) ou a consulta SQL (sql)")
+    store.add_argument("--db", default=STORE_PATH, help="arquivo do banco (padrão: .i18n-cache/locales.sqlite3)")
+    store.add_argument("--locale", action="append", help="limita a um idioma (pode repetir)")
+    store.add_argument("--reference", default=REFERENCE_LOCALE, help="idioma de referência (padrão: pt)")
+    store.add_argument("--force", action="store_true", help="reimporta todos os arquivos")
+    store.add_argument("--out", help="diretório da exportação (padrão: src/locales)")
+    store.add_argument("--check", action="store_true", help="só confere se a exportação é idêntica aos arquivos")
+    store.set_defaults(func=cmd_store)
+
+    bench_parser = subparsers.add_parser("bench", help="benchmark com catálogos sintéticos")
+    bench_parser.add_argument("--keys", type=int, nargs="+", default=[10_000, 100_000],
+                              help="quantidade de chaves de cada catálogo (padrão: 10000 100000)")
+    bench_parser.add_argument("--depth", type=int, default=4, help="profundidade do catálogo")
+    bench_parser.add_argument("--ratio", type=float, default=0.01,
+                              help="fração das chaves alteradas/adicionadas pelo patch")
+    bench_parser.add_argument("--repeat", type=int, default=3, help="execuções por tamanho (mediana)")
+    bench_parser.add_argument("--no-memory", action="store_true", help="não mede picos de memória")
+    bench_parser.add_argument("--compare", metavar="COMMIT", help="compara com resultados salvos de um commit")
+    bench_parser.add_argument("--no-save", action="store_true", help="não grava os resultados")
+    bench_parser.set_defaults(func=cmd_bench)
+
+    bundle = subparsers.add_parser("bundle", help="divide os idiomas em arquivos por namespace")
+    bundle.add_argument("--out", default=BUNDLES_DIR, help="diretório de saída (padrão: public/locales)")
+    bundle.add_argument("--split", action="append", metavar="PATH",
+                        help="extrai uma subárvore como namespace próprio, ex.: admin.usersDashboard")
+    bundle.add_argument("--locale", action="append", help="limita a um idioma (pode repetir)")
+    bundle.add_argument("--fallbacks", action="store_true",
+                        help="preenche as chaves ausentes pela cadeia de fallback (pt-PT → pt → en)")
+    bundle.add_argument("--production", action="store_true",
+                        help="JSON minificado com arquivos .gz/.br ao lado de cada namespace")
+    bundle.add_argument("--variants", choices=EMIT_MODES, default=EXPANDED,
+                        help="variantes regionais completas ou só o delta sobre a base (padrão: expanded)")
+    bundle.set_defaults(func=cmd_bundle)
+
+    emit = subparsers.add_parser("emit", help="gera catálogos de produção minificados e comprimidos")
+    emit.add_argument("--out", default=BUNDLES_DIR, help="diretório de saída (padrão: public/locales)")
+    emit.add_argument("--locale", action="append", help="limita a um idioma (pode repetir)")
+    emit.add_argument("--no-compress", action="store_true", help="não gera os arquivos .gz/.br")
+    emit.add_argument("--fallbacks", action="store_true",
+                      help="preenche as chaves ausentes pela cadeia de fallback (pt-PT → pt → en)")
+    emit.add_argument("--canonical", action="store_true",
+                      help="saída reprodutível: chaves ordenadas e textos em Unicode NFC")
+    emit.add_argument("--hashed", action="store_true",
+                      help="nomeia cada catálogo pelo hash do conteúdo (es.3f9a1c2b.json) e gera catalogs.json")
+    emit.add_argument("--variants", choices=EMIT_MODES, default=EXPANDED,
+                      help="variantes regionais completas ou só o delta sobre a base (padrão: expanded)")
+    emit.set_defaults(func=cmd_emit)
+
+    compile_parser = subparsers.add_parser("compile", help="compila os idiomas em catálogos binários (mmap)")
+    compile_parser.add_argument("--out", default=CATALOGS_DIR,
+                                help="diretório de saída (padrão: .i18n-cache/catalogs)")
+    compile_parser.add_argument("--locale", action="append", help="limita a um idioma (pode repetir)")
+    compile_parser.add_argument("--fallbacks", action="store_true",
+                                help="preenche as chaves ausentes pela cadeia de fallback (pt-PT → pt → en)")
+    compile_parser.add_argument("--check", action="store_true",
+                                help="não grava; falha se algum catálogo estiver ausente ou desatualizado")
+    compile_parser.set_defaults(func=cmd_compile, variants=EXPANDED)
+
+    variant = subparsers.add_parser("variant", help="variantes regionais guardadas como delta sobre a base")
+    variant.add_argument("action", choices=("list", "extract"), help="lista as variantes ou extrai um delta")
+    variant.add_argument("code", nargs="?", help="idioma completo a extrair, ex.: pt-PT")
+    variant.add_argument("--json", action="store_true", help="saída em JSON")
+    variant.set_defaults(func=cmd_variant)
+
+    usage = subparsers.add_parser("usage", help="encontra chaves sem uso no código (src/)")
+    usage.add_argument("--reference", default=REFERENCE_LOCALE, help="idioma de referência (padrão: pt)")
+    usage.add_argument("--jobs", "-j", type=int, default=0, help="processos do scanner (0 = um por CPU)")
+    usage.add_argument("--no-cache", action="store_true", help="reescaneia todos os arquivos")
+    usage.add_argument("--json", action="store_true", help="saída em JSON")
+    usage.add_argument("--prune", action="store_true", help="remove as chaves sem uso de todos os idiomas")
+    usage.set_defaults(func=cmd_usage)
+
+    dedup = subparsers.add_parser("dedup", help="textos duplicados entre chaves e idênticos ao en")
+    dedup.add_argument("--reference", default=REFERENCE_LOCALE, help="idioma de referência (padrão: pt)")
+    dedup.add_argument("--locale", action="append", help="limita a um idioma (pode repetir)")
+    dedup.add_argument("--min-length", type=int, default=3, help="ignora textos menores (padrão: 3)")
+    dedup.add_argument("--limit", type=int, default=20, help="grupos exibidos na saída em texto")
+    dedup.add_argument("--json", action="store_true", help="saída em JSON")
+    dedup.set_defaults(func=cmd_dedup)
+
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    sys.exit(args.func(args))
@@ -0,0 +1,31 @@
+"""
+Ferramentas Python para manutenção dos arquivos de idioma em src/locales.
+"""
+from .engine import LocaleResult, Patch, apply_patches, group_by_locale
+from .index import LocaleIndex
+from .locales import LOCALES_DIR, TARGET_LOCALES, locale_path
+from .manifest import Manifest
+from .merge import ADD_MISSING, ADD_SUBTREE, OVERWRITE, POLICIES, REPLACE_SUBTREE, Conflict, MergeStats, merge
+from .sources import SOURCES, gather_patches
+
+__all__ = [
+    "ADD_MISSING",
+    "ADD_SUBTREE",
+    "LOCALES_DIR",
+    "OVERWRITE",
+    "POLICIES",
+    "REPLACE_SUBTREE",
+    "SOURCES",
+    "TARGET_LOCALES",
+    "Conflict",
+    "LocaleIndex",
+    "LocaleResult",
+    "Manifest",
+    "MergeStats",
+    "Patch",
+    "apply_patches",
+    "gather_patches",
+    "group_by_locale",
+    "locale_path",
+    "merge",
+]
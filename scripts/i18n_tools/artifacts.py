@@ -0,0 +1,201 @@
+"""
+Artefatos de produção dos idiomas: JSON minificado (sem espaços) com
+irmãos pré-comprimidos ``.gz`` e ``.br`` ao lado de cada arquivo.
+
+No modo canônico a saída não depende da ordem em que os patches foram
+aplicados: chaves ordenadas e textos em Unicode NFC. Com nomes por hash
+(``es.3f9a1c2b.json``) um idioma que não mudou mantém a URL entre deploys,
+e o ``catalogs.json`` diz ao frontend qual arquivo carregar.
+
+Os arquivos de src/locales (editados à mão) nunca são tocados.
+"""
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Optional
+
+from .audit import available_locales
+from .locales import LOCALES_DIR, load_locale, locale_path, write_if_changed
+
+try:
+    import brotli
+except ImportError:  # dependência opcional: sem ela os .br não são gerados
+    brotli = None
+
+COMPRESSED_SUFFIXES = (".gz", ".br")
+CATALOGS_NAME = "catalogs.json"
+HASH_LENGTH = 8
+
+
+def canonical(value):
+    """Copy of a tree with sorted keys and every key and string in Unicode NFC"""
+    if isinstance(value, str):
+        return unicodedata.normalize("NFC", value)
+    if isinstance(value, list):
+        return [canonical(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    result = {}
+    for key, item in value.items():
+        key = unicodedata.normalize("NFC", key)
+        if key in result:
+            raise ValueError(f"keys collide after NFC normalization: {key!r}")
+        result[key] = canonical(item)
+    return dict(sorted(result.items()))
+
+
+def minify(value):
+    """Compact JSON with no whitespace"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def content_hash(payload):
+    return hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]
+
+
+def _hashed_pattern(locale_code):
+    return re.compile(rf"^{re.escape(locale_code)}\.[0-9a-f]{{{HASH_LENGTH}}}\.json(\.gz|\.br)?$")
+
+
+def gzip_bytes(payload):
+    # mtime=0 deixa a saída determinística (mesmo conteúdo, mesmos bytes)
+    return gzip.compress(payload, compresslevel=9, mtime=0)
+
+
+def brotli_bytes(payload):
+    return brotli.compress(payload, quality=11) if brotli is not None else None
+
+
+@dataclass
+class ArtifactSizes:
+    raw: int
+    gzip: Optional[int] = None
+    brotli: Optional[int] = None
+    changed: bool = False
+
+    def to_dict(self):
+        return {"raw": self.raw, "gzip": self.gzip, "brotli": self.brotli}
+
+
+def write_artifact(path, payload, compress=True):
+    """Write payload and its .gz/.br siblings, each only if its bytes changed
+
+    Without compress, leftover siblings from a previous run are removed so
+    they never go out of sync with the JSON.
+    """
+    sizes = ArtifactSizes(len(payload))
+    sizes.changed = write_if_changed(path, payload)
+    siblings = {}
+    if compress:
+        siblings[".gz"] = gzip_bytes(payload)
+        siblings[".br"] = brotli_bytes(payload)
+    for suffix in COMPRESSED_SUFFIXES:
+        sibling_path = path + suffix
+        data = siblings.get(suffix)
+        if data is None:
+            if os.path.exists(sibling_path):
+                os.unlink(sibling_path)
+            continue
+        write_if_changed(sibling_path, data)
+        setattr(sizes, "gzip" if suffix == ".gz" else "brotli", len(data))
+    return sizes
+
+
+@dataclass
+class LocaleArtifact:
+    locale: str
+    source_bytes: int
+    sizes: ArtifactSizes
+    file: str = ""
+
+    def to_dict(self):
+        return {"file": self.file, **self.sizes.to_dict()}
+
+
+def _prune_hashed(locale_code, out_dir, keep):
+    """Remove the hashed catalogs of a locale left by previous builds"""
+    pattern = _hashed_pattern(locale_code)
+    for path in glob.glob(os.path.join(out_dir, f"{glob.escape(locale_code)}.*.json*")):
+        name = os.path.basename(path)
+        if pattern.match(name) and not name.startswith(keep):
+            os.unlink(path)
+
+
+def emit_locale(locale_code, out_dir, locales_dir=LOCALES_DIR, compress=True, tree=None, source=None,
+                canonical_form=False, hashed=False):
+    """Emit the minified (and precompressed) catalog of one locale
+
+    tree replaces the locale file content (e.g. a materialized locale),
+    source the file it came from (e.g. a regional variant delta). hashed
+    names the file after its content and implies the canonical form.
+    """
+    source = source or locale_path(locale_code, locales_dir)
+    tree = load_locale(source) if tree is None else tree
+    payload = minify(canonical(tree) if canonical_form or hashed else tree)
+    name = f"{locale_code}.{content_hash(payload)}.json" if hashed else f"{locale_code}.json"
+    sizes = write_artifact(os.path.join(out_dir, name), payload, compress)
+    if hashed:
+        _prune_hashed(locale_code, out_dir, name)
+    return LocaleArtifact(locale_code, os.path.getsize(source), sizes, name)
+
+
+def write_catalog_manifest(artifacts, out_dir):
+    """catalogs.json: the hashed file of each locale, for the frontend loader
+
+    Entries of locales not emitted this time are kept while their file exists.
+    """
+    path = os.path.join(out_dir, CATALOGS_NAME)
+    locales = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            previous = json.load(f).get("locales", {})
+        locales = {l: e for l, e in previous.items() if os.path.exists(os.path.join(out_dir, e["file"]))}
+    locales.update((a.locale, a.to_dict()) for a in artifacts)
+    manifest = {"version": 1, "locales": dict(sorted(locales.items()))}
+    payload = json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+    write_if_changed(path, payload)
+
+
+def emit_locales(locales=None, out_dir=None, locales_dir=LOCALES_DIR, compress=True, trees=None, sources=None,
+                 canonical_form=False, hashed=False):
+    """Emit production catalogs for every locale (trees/sources: {locale: ...} overrides)
+
+    With hashed, catalogs.json maps each locale to its content-hashed file.
+    """
+    locales = locales or available_locales(locales_dir)
+    trees = trees or {}
+    sources = sources or {}
+    os.makedirs(out_dir, exist_ok=True)
+    artifacts = [
+        emit_locale(l, out_dir, locales_dir, compress, trees.get(l), sources.get(l), canonical_form, hashed)
+        for l in locales
+    ]
+    if hashed:
+        write_catalog_manifest(artifacts, out_dir)
+    return artifacts
+
+
+def _kb(size):
+    return f"{size / 1024:>8.1f}" if size is not None else f"{'-':>8}"
+
+
+def print_sizes(artifacts):
+    """Per-locale table of source, minified and compressed sizes (KB)"""
+    print(f"{'idioma':<8} {'fonte':>8} {'min':>8} {'gzip':>8} {'brotli':>8}")
+    totals = [0, 0, 0, 0]
+    for a in artifacts:
+        print(f"{a.locale:<8} {_kb(a.source_bytes)} {_kb(a.sizes.raw)} {_kb(a.sizes.gzip)} {_kb(a.sizes.brotli)}")
+        for i, size in enumerate((a.source_bytes, a.sizes.raw, a.sizes.gzip, a.sizes.brotli)):
+            totals[i] += size or 0
+    print(f"{'total':<8} {_kb(totals[0])} {_kb(totals[1])} "
+          f"{_kb(totals[2] or None)} {_kb(totals[3] or None)}")
+    if totals[0]:
+        best = totals[3] or totals[2] or totals[1]
+        print(f"\n📉 Redução: {100 * (1 - best / totals[0]):.0f}% em relação aos arquivos fonte")
+    if brotli is None and any(a.sizes.gzip is not None for a in artifacts):
+        print("⚠️  Módulo 'brotli' não instalado: arquivos .br não foram gerados (pip install brotli)")
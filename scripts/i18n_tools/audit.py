@@ -0,0 +1,159 @@
+"""
+Auditoria de chaves entre todos os idiomas em uma única passada.
+
+Cada chave recebe um bitset com um bit por idioma (matriz de presença);
+faltantes, extras e órfãs saem de operações sobre esses inteiros, sem
+comparar cada idioma contra a referência com filtros O(n·m).
+"""
+import glob
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from .index import load_index
+from .locales import LOCALES_DIR, REFERENCE_LOCALE, locale_path
+
+# Idioma de fallback do app (src/lib/i18n.ts)
+FALLBACK_LOCALE = "en"
+
+
+def available_locales(locales_dir=LOCALES_DIR):
+    """Locale codes of every JSON file in the locales directory"""
+    return sorted(
+        os.path.splitext(os.path.basename(p))[0]
+        for p in glob.glob(os.path.join(locales_dir, "*.json"))
+    )
+
+
+def presence_matrix(indexes):
+    """Map each key to a bitset of the locales that define it
+
+    Bit i corresponds to the i-th locale of ``indexes`` (a dict locale -> LocaleIndex).
+    """
+    matrix = {}
+    for bit, index in enumerate(indexes.values()):
+        mask = 1 << bit
+        for path in index.keys():
+            matrix[path] = matrix.get(path, 0) | mask
+    return matrix
+
+
+def locales_in(mask, locales):
+    """Decode a bitset back into locale codes"""
+    return [locale for bit, locale in enumerate(locales) if mask >> bit & 1]
+
+
+@dataclass
+class AuditReport:
+    reference: str
+    locales: List[str]
+    total_keys: int
+    reference_keys: int
+    missing: Dict[str, List[str]] = field(default_factory=dict)
+    extra: Dict[str, List[str]] = field(default_factory=dict)
+    orphaned: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def ok(self):
+        return not any(self.missing.values())
+
+    def to_dict(self):
+        return {
+            "reference": self.reference,
+            "locales": self.locales,
+            "totalKeys": self.total_keys,
+            "referenceKeys": self.reference_keys,
+            "missing": self.missing,
+            "extra": self.extra,
+            "orphaned": self.orphaned,
+        }
+
+
+def audit(indexes, reference=REFERENCE_LOCALE, fallback=FALLBACK_LOCALE):
+    """Report missing, extra and orphaned keys for every locale at once
+
+    - missing: keys of the reference locale absent from a locale
+    - extra: keys of a locale absent from the reference locale
+    - orphaned: keys defined by neither the reference nor the fallback locale
+    """
+    locales = list(indexes)
+    if reference not in indexes:
+        raise ValueError(f"reference locale {reference!r} not loaded")
+    matrix = presence_matrix(indexes)
+    full = (1 << len(locales)) - 1
+    ref_bit = 1 << locales.index(reference)
+    source_bits = ref_bit | (1 << locales.index(fallback) if fallback in indexes else 0)
+
+    report = AuditReport(reference, locales, len(matrix), len(indexes[reference]))
+    missing = {locale: [] for locale in locales}
+    extra = {locale: [] for locale in locales}
+
+    for path, mask in matrix.items():
+        if mask == full:
+            continue
+        if mask & ref_bit:
+            for locale in locales_in(full & ~mask, locales):
+                missing[locale].append(path)
+        else:
+            for locale in locales_in(mask, locales):
+                extra[locale].append(path)
+            if not mask & source_bits:
+                report.orphaned[path] = locales_in(mask, locales)
+
+    report.missing = {l: keys for l, keys in missing.items() if l != reference}
+    report.extra = {l: keys for l, keys in extra.items() if l != reference}
+    return report
+
+
+def audit_locales(locales=None, reference=REFERENCE_LOCALE, locales_dir=LOCALES_DIR, profile=None):
+    """Load every locale into an index and audit them together
+
+    With a profile, the load of each locale and the audit pass are timed.
+    """
+    locales = locales or available_locales(locales_dir)
+    ordered = [reference] + [l for l in locales if l != reference]
+    if profile is None:
+        indexes = {l: load_index(locale_path(l, locales_dir)) for l in ordered}
+        return audit(indexes, reference)
+    indexes = {}
+    for l in ordered:
+        timer = profile.locale(l)
+        indexes[l] = load_index(locale_path(l, locales_dir), timer)
+        timer.finish()
+    timer = profile.locale("*")
+    with timer.phase("audit"):
+        report = audit(indexes, reference)
+    timer.finish()
+    return report
+
+
+def print_report(report):
+    """Print the audit in the same layout as check-i18n-keys.js"""
+    print('=== AUDITORIA DE CHAVES i18n ===\n')
+    print(f"Total de chaves em {report.reference.upper()}: {report.reference_keys}")
+    print(f"Total de chaves distintas: {report.total_keys}\n")
+
+    print('=== CHAVES FALTANDO POR IDIOMA ===\n')
+    for locale, keys in report.missing.items():
+        print(f"[{locale.upper()}] {len(keys)} chaves faltando:")
+        if keys:
+            for key in keys:
+                print(f"  - {key}")
+        else:
+            print('  ✓ Completo')
+        print('')
+
+    extras = {l: keys for l, keys in report.extra.items() if keys}
+    if extras:
+        print(f"=== CHAVES EXTRAS (não existem em {report.reference.upper()}) ===\n")
+        for locale, keys in extras.items():
+            print(f"[{locale.upper()}] {len(keys)} chaves extras:")
+            for key in keys:
+                print(f"  + {key}")
+            print('')
+
+    if report.orphaned:
+        print('=== CHAVES ÓRFÃS (sem texto de origem) ===\n')
+        for key, locales in report.orphaned.items():
+            print(f"  ? {key} ({', '.join(locales)})")
+        print('')
@@ -0,0 +1,201 @@
+"""
+Benchmark do pipeline de idiomas com catálogos sintéticos (10k a 1M chaves).
+
+Gera um idioma com profundidade e quantidade de chaves configuráveis e um
+patch no formato de scripts/i18n_patches, mede cada fase (leitura,
+parse, índice, merge, serialização, escrita) e o pico de memória, e grava
+os resultados em JSON lines para comparar execuções entre commits.
+"""
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from .index import LocaleIndex
+from .locales import REPO_ROOT, atomic_write, dump_locale, parse_locale, read_bytes
+from .manifest import CACHE_DIR
+from .merge import merge
+from .patcher import patch_index
+
+RESULTS_PATH = os.path.join(CACHE_DIR, "bench-results.jsonl")
+PHASES = ["read", "parse", "index", "merge", "rebuild", "serialize", "patch", "write"]
+
+_WORDS = (
+    "quiz flashcard summary source project topic question answer admin user "
+    "dashboard settings profile theme language help tutorial bug report status "
+    "severity title subtitle description button error empty loading upload chat"
+).split()
+_SENTENCES = [
+    "Total de {{count}} reportes",
+    "Gerencie e visualize todos os usuários da plataforma",
+    "Nenhum resultado encontrado",
+    "Clique em 'Nova Matéria' para começar",
+    "Há {{count}} minutos",
+    "Erro ao carregar os dados",
+    "Привет, {{name}}!",
+    "通知なし",
+]
+
+
+def _name(rng, i):
+    word = rng.choice(_WORDS)
+    return f"{word}{word[0].upper()}{i}" if i else word
+
+
+def synthetic_locale(keys, depth=4, seed=0):
+    """Build a nested locale with about ``keys`` leaves and the given depth"""
+    rng = random.Random(seed)
+    branching = max(2, math.ceil(keys ** (1 / max(1, depth))))
+    items = []
+    for n in range(keys):
+        digits = []
+        for _ in range(depth):
+            n, digit = divmod(n, branching)
+            digits.append(digit)
+        path = ".".join(f"{_WORDS[d % len(_WORDS)]}{d}" for d in reversed(digits))
+        items.append((path, rng.choice(_SENTENCES)))
+    return LocaleIndex(items).to_tree()
+
+
+def synthetic_patch(locale, ratio=0.01, seed=1):
+    """Build a patch shaped like the i18n_patches files: overwrite ~ratio of the leaves and add as many new ones"""
+    rng = random.Random(seed)
+    index = LocaleIndex.from_tree(locale)
+    count = max(1, int(len(index) * ratio))
+    items = [(path, f"{index[path]} (atualizado)") for path in rng.sample(index.paths, count)]
+    namespace = f"benchNamespace{seed}"
+    items.extend((f"{namespace}.{_name(rng, i // 50)}.{_name(rng, i)}", rng.choice(_SENTENCES)) for i in range(count))
+    return LocaleIndex(items).to_tree()
+
+
+def _run_once(patch, tmp_path):
+    """Run every phase once and return {phase: seconds}"""
+    timings = {}
+
+    def timed(phase, fn, *args):
+        start = time.perf_counter()
+        value = fn(*args)
+        timings[phase] = time.perf_counter() - start
+        return value
+
+    raw = timed("read", read_bytes, tmp_path)
+    data = timed("parse", parse_locale, raw)
+    index = timed("index", LocaleIndex.from_tree, data)
+    timed("merge", merge, index, patch)
+    tree = timed("rebuild", index.to_tree)
+    payload = timed("serialize", lambda: dump_locale(tree).encode("utf-8"))
+    timed("patch", patch_index, raw.decode("utf-8"), index)
+    timed("write", atomic_write, tmp_path, payload)
+    return timings
+
+
+def _peaks(patch, tmp_path):
+    """Peak traced memory (bytes) of each phase, from a separate traced run"""
+    peaks = {}
+    state = {}
+    steps = [
+        ("read", lambda: state.update(raw=read_bytes(tmp_path))),
+        ("parse", lambda: state.update(data=parse_locale(state["raw"]))),
+        ("index", lambda: state.update(index=LocaleIndex.from_tree(state["data"]))),
+        ("merge", lambda: merge(state["index"], patch)),
+        ("rebuild", lambda: state.update(tree=state["index"].to_tree())),
+        ("serialize", lambda: state.update(payload=dump_locale(state["tree"]).encode("utf-8"))),
+        ("patch", lambda: patch_index(state["raw"].decode("utf-8"), state["index"])),
+        ("write", lambda: atomic_write(tmp_path, state["payload"])),
+    ]
+    tracemalloc.start()
+    try:
+        for phase, step in steps:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            step()
+            peaks[phase] = tracemalloc.get_traced_memory()[1] - before
+        peaks["total"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(keys, depth=4, ratio=0.01, repeat=3, seed=0, memory=True):
+    """Benchmark one catalog size; returns a result record"""
+    locale = synthetic_locale(keys, depth, seed)
+    patch = synthetic_patch(locale, ratio, seed + 1)
+    with tempfile.TemporaryDirectory(prefix="i18n-bench-") as tmp:
+        tmp_path = os.path.join(tmp, "bench.json")
+        source = dump_locale(locale).encode("utf-8")
+        runs = []
+        for _ in range(repeat):
+            atomic_write(tmp_path, source)
+            runs.append(_run_once(patch, tmp_path))
+        atomic_write(tmp_path, source)
+        peaks = _peaks(patch, tmp_path) if memory else {}
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "keys": keys,
+        "depth": depth,
+        "patchRatio": ratio,
+        "repeat": repeat,
+        "bytes": len(source),
+        "seconds": {phase: statistics.median(r[phase] for r in runs) for phase in PHASES},
+        "peakBytes": peaks,
+    }
+
+
+def save_results(records, path=RESULTS_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def load_results(path=RESULTS_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline_for(record, commit, results):
+    """Latest stored result of ``commit`` with the same catalog shape"""
+    matches = [
+        r for r in results
+        if r.get("commit") and r["commit"].startswith(commit)
+        and (r["keys"], r["depth"], r["patchRatio"]) == (record["keys"], record["depth"], record["patchRatio"])
+    ]
+    return matches[-1] if matches else None
+
+
+def print_record(record, baseline=None):
+    print(f"📊 {record['keys']:,} chaves, profundidade {record['depth']} "
+          f"({record['bytes'] / 1024:,.0f} KB, commit {record['commit'] or '?'})")
+    for phase in PHASES:
+        seconds = record["seconds"][phase]
+        line = f"   {phase:<10} {seconds * 1000:>10.2f} ms"
+        if phase in record["peakBytes"]:
+            line += f"   pico {record['peakBytes'][phase] / 1024 / 1024:>8.2f} MB"
+        if baseline:
+            before = baseline["seconds"][phase]
+            line += f"   {seconds / before:>5.2f}x vs {baseline['commit']}" if before else ""
+        print(line)
+    if "total" in record["peakBytes"]:
+        print(f"   pico total {record['peakBytes']['total'] / 1024 / 1024:.2f} MB")
+    print("")
@@ -0,0 +1,142 @@
+"""
+Etapa de build que divide cada idioma em arquivos por namespace
+(``tutorial``, ``help``, ``admin``, ``notifications``...) para carregamento
+sob demanda no app, e gera um manifesto com nomes e tamanhos dos arquivos.
+"""
+import glob
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from .artifacts import COMPRESSED_SUFFIXES, minify, write_artifact
+from .audit import available_locales
+from .locales import LOCALES_DIR, REPO_ROOT, atomic_write, dump_locale, load_locale, locale_path, write_if_changed
+
+BUNDLES_DIR = os.path.join(REPO_ROOT, "public", "locales")
+MANIFEST_NAME = "manifest.json"
+
+
+def split_namespaces(tree, split_paths=()):
+    """Split a locale into {namespace: subtree}
+
+    Namespaces are the top-level keys; each dotted path in ``split_paths``
+    (e.g. ``admin.usersDashboard``) is moved out of its parent into a
+    namespace of its own.
+    """
+    namespaces = dict(tree)
+    for path in split_paths:
+        top, _, rest = path.partition(".")
+        if top not in namespaces or not rest:
+            continue
+        # Copia só o caminho até o nó extraído; o resto da árvore é compartilhado
+        parent = namespaces[top] = dict(namespaces[top])
+        *parents, leaf = rest.split(".")
+        for key in parents:
+            if not isinstance(parent.get(key), dict):
+                break
+            parent[key] = dict(parent[key])
+            parent = parent[key]
+        else:
+            if leaf in parent:
+                namespaces[path] = parent.pop(leaf)
+    return namespaces
+
+
+@dataclass
+class BundleFile:
+    file: str
+    bytes: int
+    changed: bool = False
+    gzip: Optional[int] = None
+    brotli: Optional[int] = None
+
+    def to_dict(self):
+        entry = {"file": self.file, "bytes": self.bytes}
+        if self.gzip is not None:
+            entry["gzip"] = self.gzip
+        if self.brotli is not None:
+            entry["brotli"] = self.brotli
+        return entry
+
+
+@dataclass
+class LocaleBundles:
+    locale: str
+    files: Dict[str, BundleFile] = field(default_factory=dict)
+
+    @property
+    def bytes(self):
+        return sum(f.bytes for f in self.files.values())
+
+
+def serialize_bundle(value):
+    """Serialize one namespace file"""
+    return dump_locale(value).encode("utf-8")
+
+
+def build_locale(locale_code, out_dir, split_paths=(), locales_dir=LOCALES_DIR, production=False, tree=None):
+    """Write the namespace files of one locale and remove stale ones
+
+    In production mode the files are minified and get .gz/.br siblings.
+    tree replaces the locale file content (e.g. a materialized locale).
+    """
+    if tree is None:
+        tree = load_locale(locale_path(locale_code, locales_dir))
+    target = os.path.join(out_dir, locale_code)
+    os.makedirs(target, exist_ok=True)
+
+    result = LocaleBundles(locale_code)
+    for namespace, value in split_namespaces(tree, split_paths).items():
+        name = f"{namespace}.json"
+        file_path = os.path.join(target, name)
+        if production:
+            sizes = write_artifact(file_path, minify(value))
+            bundle = BundleFile(f"{locale_code}/{name}", sizes.raw, sizes.changed, sizes.gzip, sizes.brotli)
+        else:
+            payload = serialize_bundle(value)
+            bundle = BundleFile(f"{locale_code}/{name}", len(payload), write_if_changed(file_path, payload))
+            for suffix in COMPRESSED_SUFFIXES:
+                if os.path.exists(file_path + suffix):
+                    os.unlink(file_path + suffix)
+        result.files[namespace] = bundle
+
+    expected = {os.path.basename(f.file) for f in result.files.values()}
+    for stale in glob.glob(os.path.join(target, "*.json*")):
+        name = os.path.basename(stale)
+        for suffix in COMPRESSED_SUFFIXES:
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+        if name not in expected:
+            os.unlink(stale)
+    return result
+
+
+def build_manifest(bundles):
+    """Manifest the app reads to know which files exist and how big they are"""
+    return {
+        "version": 1,
+        "locales": {
+            b.locale: {
+                "bytes": b.bytes,
+                "namespaces": {ns: f.to_dict() for ns, f in b.files.items()},
+            }
+            for b in bundles
+        },
+    }
+
+
+def write_manifest(manifest, out_dir):
+    payload = json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+    os.makedirs(out_dir, exist_ok=True)
+    atomic_write(os.path.join(out_dir, MANIFEST_NAME), payload)
+
+
+def build_bundles(locales=None, out_dir=BUNDLES_DIR, split_paths=(), locales_dir=LOCALES_DIR, production=False,
+                  trees=None):
+    """Split every locale into namespace files and write the manifest (trees: {locale: tree} overrides)"""
+    locales = locales or available_locales(locales_dir)
+    trees = trees or {}
+    bundles = [build_locale(l, out_dir, split_paths, locales_dir, production, trees.get(l)) for l in locales]
+    write_manifest(build_manifest(bundles), out_dir)
+    return bundles
@@ -0,0 +1,363 @@
+"""
+Catálogos binários compilados dos idiomas (parecidos com os ``.mo`` do gettext).
+
+Cada idioma vira um arquivo ``<idioma>.cat`` com as folhas achatadas
+(``admin.usersDashboard.title``), uma tabela de strings internadas (textos e
+segmentos de chave repetidos aparecem uma vez só) e um índice hash sobre as
+chaves. O leitor mapeia o arquivo na memória (mmap): abrir não lê nada além
+do cabeçalho e cada consulta é uma busca O(1) na tabela hash, sem parse de
+JSON. Serve para ferramentas de análise e para a renderização no servidor
+(e-mails, notificações), que não precisam do catálogo inteiro em memória.
+
+As chaves não são guardadas por extenso: cada prefixo (``admin``,
+``admin.usersDashboard``...) é um nó com o índice do nó pai e o seu segmento,
+como numa trie, e uma entrada aponta para o nó da folha. Os campos têm 16
+bits quando todas as contagens e offsets cabem neles (o caso dos idiomas do
+app) e 32 bits senão; a largura fica no cabeçalho.
+
+Layout (little-endian)::
+
+    cabeçalho   magic, versão, largura, entradas, buckets, nós, strings,
+                idioma e offsets das seções
+    tabela      buckets: índice da entrada + 1 (0 = vazio), sondagem linear, carga <= 0,75
+    nós         (nó pai + 1, segmento), 0 = filho da raiz
+    entradas    (nó da folha, valor << 1 | tipo), na ordem do arquivo
+    offsets     início de cada string nos dados, mais o fim da última
+    dados       strings UTF-8 internadas, concatenadas
+
+Textos são guardados como string; os outros valores (listas, números,
+objetos vazios) como o seu JSON. As entradas seguem a ordem do arquivo de
+origem, então iterar um catálogo devolve as chaves na ordem original.
+"""
+import json
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+
+from .audit import FALLBACK_LOCALE, available_locales
+from .fallbacks import fallback_chain
+from .index import SEPARATOR, flatten
+from .locales import LOCALES_DIR, load_locale, locale_path, read_bytes, write_if_changed
+from .manifest import CACHE_DIR
+
+CATALOGS_DIR = os.path.join(CACHE_DIR, "catalogs")
+CATALOG_SUFFIX = ".cat"
+MAGIC = b"I18NCAT\0"
+VERSION = 2
+LOAD_FACTOR = 0.75
+
+# magic, versão, largura, entradas, buckets, nós, strings, idioma,
+# offsets da tabela/nós/entradas/offsets das strings/dados
+_HEADER = struct.Struct("<8s12I")
+_FORMATS = {2: "H", 4: "I"}
+
+KIND_STR = 0
+KIND_JSON = 1
+
+
+def key_hash(key_bytes):
+    return zlib.crc32(key_bytes)
+
+
+def catalog_path(locale_code, out_dir=CATALOGS_DIR):
+    return os.path.join(out_dir, f"{locale_code}{CATALOG_SUFFIX}")
+
+
+def _bucket_count(entries):
+    """Smallest table keeping the load factor at or below LOAD_FACTOR (at least one empty slot)"""
+    return int(entries / LOAD_FACTOR) + 1
+
+
+def compile_tree(locale_code, tree):
+    """The binary catalog of a parsed locale, as bytes (deterministic)"""
+    strings = {}
+    offsets = []
+    data = bytearray()
+
+    def intern(text):
+        """Index of a string in the data block, stored once"""
+        if text not in strings:
+            strings[text] = len(offsets)
+            offsets.append(len(data))
+            data.extend(text.encode("utf-8"))
+        return strings[text]
+
+    locale_ref = intern(locale_code)
+    nodes = {}
+    node_rows = []
+    entries = []
+    hashes = []
+    for path, value in flatten(tree):
+        # Um nó por prefixo: os segmentos comuns das chaves ficam uma vez só
+        parent = 0
+        prefix = None
+        for segment in path.split(SEPARATOR):
+            prefix = segment if prefix is None else f"{prefix}{SEPARATOR}{segment}"
+            if prefix not in nodes:
+                nodes[prefix] = len(node_rows)
+                node_rows.append((parent, intern(segment)))
+            parent = nodes[prefix] + 1
+        if isinstance(value, str):
+            kind, text = KIND_STR, value
+        else:
+            kind, text = KIND_JSON, json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        entries.append((parent - 1, intern(text) << 1 | kind))
+        hashes.append(key_hash(path.encode("utf-8")))
+    offsets.append(len(data))
+
+    bucket_count = _bucket_count(len(entries))
+    table = [0] * bucket_count
+    for number, hashed in enumerate(hashes):
+        bucket = hashed % bucket_count
+        while table[bucket]:
+            bucket = (bucket + 1) % bucket_count
+        table[bucket] = number + 1
+
+    largest = max(len(entries), len(node_rows), len(offsets) << 1 | 1, len(data))
+    width = 2 if largest <= 0xFFFF else 4
+    code = _FORMATS[width]
+    nodes_flat = [field for row in node_rows for field in row]
+    entries_flat = [field for entry in entries for field in entry]
+
+    table_offset = _HEADER.size
+    nodes_offset = table_offset + width * bucket_count
+    entries_offset = nodes_offset + width * len(nodes_flat)
+    strings_offset = entries_offset + width * len(entries_flat)
+    data_offset = strings_offset + width * len(offsets)
+    header = _HEADER.pack(MAGIC, VERSION, width, len(entries), bucket_count, len(node_rows), len(strings),
+                          locale_ref, table_offset, nodes_offset, entries_offset, strings_offset, data_offset)
+    return b"".join([
+        header,
+        struct.pack(f"<{bucket_count}{code}", *table),
+        struct.pack(f"<{len(nodes_flat)}{code}", *nodes_flat),
+        struct.pack(f"<{len(entries_flat)}{code}", *entries_flat),
+        struct.pack(f"<{len(offsets)}{code}", *offsets),
+        bytes(data),
+    ])
+
+
+class Catalog:
+    """Read-only, memory-mapped view of a compiled catalog
+
+    Lookups hash the key, probe the table in place and check a candidate by
+    walking its nodes up to the root; only the strings of the entries
+    visited are decoded.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, width, self._entries, self._buckets, _, self._strings, locale_ref,
+             self._table, self._nodes, self._entries_offset, self._offsets, self._data) = _HEADER.unpack_from(self._map)
+        except struct.error:
+            self._map.close()
+            raise ValueError(f"{path}: not a compiled catalog")
+        if magic != MAGIC or version != VERSION or width not in _FORMATS:
+            self._map.close()
+            raise ValueError(f"{path}: not a version {VERSION} compiled catalog")
+        self._width = width
+        self._one = struct.Struct(f"<{_FORMATS[width]}")
+        self._pair = struct.Struct(f"<2{_FORMATS[width]}")
+        self._paths = {}
+        self.locale = self._string(locale_ref)
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _bytes(self, number):
+        start, end = self._pair.unpack_from(self._map, self._offsets + self._width * number)
+        return self._map[self._data + start:self._data + end]
+
+    def _string(self, number):
+        return self._bytes(number).decode("utf-8")
+
+    def _node(self, number):
+        """(parent + 1, segment string) of a node"""
+        return self._pair.unpack_from(self._map, self._nodes + self._pair.size * number)
+
+    def _entry(self, number):
+        """(leaf node, value string << 1 | kind) of an entry"""
+        return self._pair.unpack_from(self._map, self._entries_offset + self._pair.size * number)
+
+    def _value(self, entry):
+        text = self._string(entry[1] >> 1)
+        return json.loads(text) if (entry[1] & 1) == KIND_JSON else text
+
+    def _path(self, node, cache=False):
+        """Dotted path of a node; the prefixes above it are cached, so iteration splits nothing twice"""
+        path = self._paths.get(node)
+        if path is None:
+            parent, segment = self._node(node)
+            path = self._string(segment)
+            if parent:
+                path = f"{self._path(parent - 1, cache=True)}{SEPARATOR}{path}"
+            if cache:
+                self._paths[node] = path
+        return path
+
+    def _key(self, entry):
+        return self._path(entry[0])
+
+    def _matches(self, node, segments):
+        """True if the path of node is made of segments (compared leaf first)"""
+        for depth in range(len(segments) - 1, -1, -1):
+            parent, string = self._node(node)
+            if self._bytes(string) != segments[depth]:
+                return False
+            if not parent:
+                return depth == 0
+            node = parent - 1
+        return False
+
+    def _find(self, key):
+        """Entry (leaf node, value string << 1 | kind) of a key, or None"""
+        key_bytes = key.encode("utf-8")
+        segments = key_bytes.split(SEPARATOR.encode())
+        bucket = key_hash(key_bytes) % self._buckets
+        while True:
+            slot, = self._one.unpack_from(self._map, self._table + self._width * bucket)
+            if not slot:
+                return None
+            entry = self._entry(slot - 1)
+            if self._matches(entry[0], segments):
+                return entry
+            bucket = (bucket + 1) % self._buckets
+
+    def get(self, key, default=None):
+        entry = self._find(key)
+        return default if entry is None else self._value(entry)
+
+    def __getitem__(self, key):
+        entry = self._find(key)
+        if entry is None:
+            raise KeyError(key)
+        return self._value(entry)
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __len__(self):
+        return self._entries
+
+    def _iter_entries(self):
+        for number in range(self._entries):
+            yield self._entry(number)
+
+    def __iter__(self):
+        """Keys in the order of the source file"""
+        return (self._key(entry) for entry in self._iter_entries())
+
+    def items(self):
+        return ((self._key(entry), self._value(entry)) for entry in self._iter_entries())
+
+
+class Catalogs:
+    """Compiled catalogs of a directory, opened on first use, with fallback lookups
+
+    ``get("pt-PT", key)`` tries pt-PT, then pt, then en, like the frontend.
+    Locales with no compiled catalog (``es-MX``, ``xx``) are skipped in the
+    chain, so they resolve through their base language or the fallback.
+    """
+
+    def __init__(self, out_dir=CATALOGS_DIR, fallback=FALLBACK_LOCALE):
+        self.out_dir = out_dir
+        self.fallback = fallback
+        self.available = sorted(
+            name[:-len(CATALOG_SUFFIX)] for name in os.listdir(out_dir) if name.endswith(CATALOG_SUFFIX)
+        )
+        self._open = {}
+
+    def catalog(self, locale_code):
+        if locale_code not in self._open:
+            self._open[locale_code] = Catalog(catalog_path(locale_code, self.out_dir))
+        return self._open[locale_code]
+
+    def get(self, locale_code, key, default=None):
+        for candidate in fallback_chain(locale_code, self.available, self.fallback):
+            if candidate not in self.available:
+                continue
+            entry = self.catalog(candidate)._find(key)
+            if entry is not None:
+                return self.catalog(candidate)._value(entry)
+        return default
+
+    def close(self):
+        for catalog in self._open.values():
+            catalog.close()
+        self._open.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@dataclass
+class CompiledCatalog:
+    locale: str
+    file: str
+    source_bytes: int
+    bytes: int
+    keys: int
+    strings: int
+    changed: bool = False
+
+    def to_dict(self):
+        return {
+            "file": self.file,
+            "sourceBytes": self.source_bytes,
+            "bytes": self.bytes,
+            "keys": self.keys,
+            "strings": self.strings,
+        }
+
+
+def _summary(locale_code, payload, source, out_dir, changed=False):
+    _, _, _, entries, _, _, strings, *_ = _HEADER.unpack_from(payload)
+    return CompiledCatalog(locale_code, os.path.basename(catalog_path(locale_code, out_dir)),
+                           os.path.getsize(source), len(payload), entries, strings, changed)
+
+
+def compile_locales(locales=None, out_dir=CATALOGS_DIR, locales_dir=LOCALES_DIR, trees=None, sources=None,
+                    check=False):
+    """Compile every locale (trees/sources: {locale: ...} overrides, as in emit_locales)
+
+    Only catalogs whose bytes change are rewritten. With check nothing is
+    written; ``changed`` then marks the catalogs that are missing or stale.
+    """
+    locales = locales or available_locales(locales_dir)
+    trees = trees or {}
+    sources = sources or {}
+    if not check:
+        os.makedirs(out_dir, exist_ok=True)
+    compiled = []
+    for locale_code in locales:
+        source = sources.get(locale_code) or locale_path(locale_code, locales_dir)
+        tree = trees.get(locale_code)
+        payload = compile_tree(locale_code, load_locale(source) if tree is None else tree)
+        path = catalog_path(locale_code, out_dir)
+        if check:
+            changed = not os.path.exists(path) or read_bytes(path) != payload
+        else:
+            changed = write_if_changed(path, payload)
+        compiled.append(_summary(locale_code, payload, source, out_dir, changed))
+    return compiled
+
+
+def print_compiled(compiled):
+    """Per-locale table of JSON and catalog sizes (KB), keys and interned strings"""
+    print(f"{'idioma':<8} {'json':>8} {'catálogo':>9} {'chaves':>7} {'strings':>8}")
+    for c in compiled:
+        mark = " (atualizado)" if c.changed else ""
+        print(f"{c.locale:<8} {c.source_bytes / 1024:>8.1f} {c.bytes / 1024:>9.1f} {c.keys:>7} {c.strings:>8}{mark}")
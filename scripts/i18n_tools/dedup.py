@@ -0,0 +1,212 @@
+"""
+Relatório de textos duplicados nos idiomas, com sugestões de chaves compartilhadas.
+
+Duas análises sobre os índices achatados, agrupando as folhas pelo valor:
+
+- dentro de um idioma: o mesmo texto em várias chaves (``navbar.usersDashboard``
+  e ``admin.usersDashboard.title``), candidato a uma chave única reaproveitada;
+- entre idiomas: textos idênticos ao ``en``, que o fallback do i18next já
+  entrega (ou que ainda não foram traduzidos).
+
+As economias são estimadas em bytes do JSON minificado.
+"""
+import hashlib
+import json
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from .audit import FALLBACK_LOCALE, available_locales
+from .index import load_index
+from .locales import LOCALES_DIR, REFERENCE_LOCALE, locale_path
+from .usage import PLURAL_SUFFIXES
+
+SHARED_NAMESPACE = "common"
+_WORD = re.compile(r"[^\W\d_]+|\d+")
+_PLURAL_SUFFIX = re.compile(r"_(?:%s)$" % "|".join(PLURAL_SUFFIXES))
+
+
+def value_bytes(value):
+    """Size of a value in the minified catalog"""
+    return len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+
+def entry_bytes(path, value):
+    """Size of a '"key":value,' member in the minified catalog"""
+    return value_bytes(path.rsplit(".", 1)[-1]) + value_bytes(value) + 2
+
+
+def value_digest(value):
+    return hashlib.blake2b(json.dumps(value, ensure_ascii=False).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def group_values(index, min_length=1):
+    """Map each string value of an index to the paths that hold it, in document order"""
+    groups = defaultdict(list)
+    for path, value in index.items():
+        if isinstance(value, str) and len(value.strip()) >= min_length:
+            groups[value].append(path)
+    return groups
+
+
+def _plural_forms_only(paths):
+    """Plural forms of one key (count_one, count_other) legitimately repeat a text"""
+    return len({_PLURAL_SUFFIX.sub("", path) for path in paths}) == 1
+
+
+def _common_parent(paths):
+    parts = [p.split(".")[:-1] for p in paths]
+    common = []
+    for segment in zip(*parts):
+        if len(set(segment)) != 1:
+            break
+        common.append(segment[0])
+    return ".".join(common)
+
+
+def suggest_key(paths, label):
+    """Shared key for a group: its common parent, else common.<camelCase label>"""
+    parent = _common_parent(paths)
+    leaf = paths[0].rsplit(".", 1)[-1]
+    if parent:
+        return f"{parent}.{leaf}"
+    words = _WORD.findall(label.lower())[:4] if label.isascii() else []
+    if not words:
+        return f"{SHARED_NAMESPACE}.{leaf}"
+    return f"{SHARED_NAMESPACE}." + words[0] + "".join(w.capitalize() for w in words[1:])
+
+
+@dataclass
+class DuplicateGroup:
+    """One value repeated under several keys of a locale"""
+    value: str
+    paths: List[str]
+    locales: List[str]
+    suggested_key: str
+    savings: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self):
+        return {
+            "value": self.value,
+            "hash": value_digest(self.value),
+            "paths": self.paths,
+            "locales": self.locales,
+            "suggestedKey": self.suggested_key,
+            "savings": self.savings,
+        }
+
+
+@dataclass
+class SameAsFallback:
+    """One locale's keys whose text is identical to the fallback locale"""
+    locale: str
+    paths: List[str]
+    bytes: int
+
+    def to_dict(self):
+        return {"locale": self.locale, "keys": len(self.paths), "bytes": self.bytes, "paths": self.paths}
+
+
+@dataclass
+class DedupReport:
+    reference: str
+    fallback: str
+    locales: List[str]
+    duplicates: List[DuplicateGroup] = field(default_factory=list)
+    same_as_fallback: List[SameAsFallback] = field(default_factory=list)
+
+    @property
+    def duplicate_savings(self):
+        return sum(sum(g.savings.values()) for g in self.duplicates)
+
+    @property
+    def fallback_savings(self):
+        return sum(s.bytes for s in self.same_as_fallback)
+
+    def to_dict(self):
+        return {
+            "reference": self.reference,
+            "fallback": self.fallback,
+            "locales": self.locales,
+            "duplicateSavings": self.duplicate_savings,
+            "fallbackSavings": self.fallback_savings,
+            "duplicates": [g.to_dict() for g in self.duplicates],
+            "sameAsFallback": [s.to_dict() for s in self.same_as_fallback],
+        }
+
+
+def dedup(indexes, reference=REFERENCE_LOCALE, fallback=FALLBACK_LOCALE, min_length=3):
+    """Find duplicated values within each locale and values identical to the fallback
+
+    Duplicate groups are keyed by their set of paths, so a group lists every
+    locale where those keys share one text; only such groups can become an
+    alias safely. Savings assume each extra copy is dropped in favour of the
+    shared key.
+    """
+    locales = list(indexes)
+    by_paths = {}
+    for locale in locales:
+        for value, paths in group_values(indexes[locale], min_length).items():
+            if len(paths) < 2 or _plural_forms_only(paths):
+                continue
+            key = tuple(paths)
+            if key not in by_paths:
+                by_paths[key] = {"values": {}, "savings": {}}
+            by_paths[key]["values"][locale] = value
+            by_paths[key]["savings"][locale] = (len(paths) - 1) * value_bytes(value)
+
+    report = DedupReport(reference, fallback, locales)
+    fallback_index = indexes.get(fallback)
+    for paths, found in by_paths.items():
+        value = found["values"].get(reference) or next(iter(found["values"].values()))
+        label = fallback_index.get(paths[0], value) if fallback_index else value
+        report.duplicates.append(DuplicateGroup(
+            value, list(paths), list(found["values"]), suggest_key(list(paths), label), found["savings"],
+        ))
+    report.duplicates.sort(key=lambda g: (-len(g.locales), -sum(g.savings.values()), g.paths))
+
+    if fallback_index is not None:
+        for locale in locales:
+            if locale == fallback:
+                continue
+            same = [
+                path for path, value in indexes[locale].items()
+                if isinstance(value, str) and len(value.strip()) >= min_length and fallback_index.get(path) == value
+            ]
+            size = sum(entry_bytes(path, indexes[locale][path]) for path in same)
+            report.same_as_fallback.append(SameAsFallback(locale, same, size))
+    return report
+
+
+def dedup_locales(locales=None, reference=REFERENCE_LOCALE, locales_dir=LOCALES_DIR, min_length=3):
+    """Load every locale into an index and analyse the duplicates"""
+    locales = locales or available_locales(locales_dir)
+    ordered = [reference] + [l for l in locales if l != reference]
+    indexes = {l: load_index(locale_path(l, locales_dir)) for l in ordered}
+    return dedup(indexes, reference, min_length=min_length)
+
+
+def print_dedup(report, limit=20):
+    """Print the largest groups and the per-locale totals"""
+    print(f"=== TEXTOS DUPLICADOS ({len(report.duplicates)} grupos, "
+          f"~{report.duplicate_savings / 1024:.1f} KB) ===\n")
+    for group in report.duplicates[:limit]:
+        print(f"\"{group.value}\" → {group.suggested_key}")
+        for path in group.paths:
+            print(f"  = {path}")
+        print(f"  {len(group.locales)}/{len(report.locales)} idiomas, "
+              f"~{sum(group.savings.values())} bytes ({', '.join(group.locales)})\n")
+    if len(report.duplicates) > limit:
+        print(f"... e mais {len(report.duplicates) - limit} grupos (use --json para a lista completa)\n")
+
+    if report.same_as_fallback:
+        print(f"=== TEXTOS IDÊNTICOS A {report.fallback.upper()} "
+              f"(~{report.fallback_savings / 1024:.1f} KB) ===\n")
+        for same in report.same_as_fallback:
+            print(f"[{same.locale.upper()}] {len(same.paths)} chaves, ~{same.bytes} bytes")
+            for path in same.paths[:limit]:
+                print(f"  ~ {path}")
+            if len(same.paths) > limit:
+                print(f"  ... e mais {len(same.paths) - limit}")
+            print('')
@@ -0,0 +1,357 @@
+"""
+Motor de aplicação de patches: agrupa todos os patches pendentes por idioma
+e aplica tudo em memória, com uma leitura e uma escrita por arquivo.
+
+A aplicação é transacional: todos os idiomas são preparados em memória e o
+lote só é gravado se nenhum falhar; se uma gravação falhar no meio, os
+arquivos já gravados voltam ao conteúdo anterior.
+
+No modo streaming (stream.py) cada idioma é preparado em um arquivo
+temporário, sem carregar a árvore em memória, e o lote é gravado com renames.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import List, Optional
+
+from .index import LocaleIndex
+from .locales import LOCALES_DIR, atomic_write, locale_path, parse_locale, read_bytes
+from .merge import OVERWRITE, KeyChange, MergeStats, diff_changes, merge
+from .patcher import patch_index
+from .profiling import PhaseTimer
+from .stream import stream_patches
+
+
+@dataclass
+class Patch:
+    """A translation patch for one locale"""
+    source: str
+    locale: str
+    data: dict
+    policy: str = OVERWRITE
+
+
+@dataclass
+class LocaleResult:
+    """Outcome of applying every patch of one locale"""
+    locale: str
+    path: str
+    sources: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    skipped: bool = False
+    changed: bool = False
+    aborted: bool = False
+    stats: MergeStats = field(default_factory=MergeStats)
+    changes: List[KeyChange] = field(default_factory=list)
+    # Conteúdo do arquivo antes e depois do lote (staged é None se nada muda)
+    original: Optional[bytes] = field(default=None, repr=False)
+    staged: Optional[bytes] = field(default=None, repr=False)
+    # Modo streaming: arquivo temporário com o resultado, no lugar de staged
+    staged_path: Optional[str] = field(default=None, repr=False)
+    # Tempo e bytes por fase (--profile); None para idiomas pulados
+    timer: Optional[PhaseTimer] = field(default=None, repr=False)
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def group_by_locale(patches):
+    """Group patches by locale, keeping the order they were gathered in"""
+    grouped = {}
+    for patch in patches:
+        grouped.setdefault(patch.locale, []).append(patch)
+    return grouped
+
+
+def stage_locale(locale_code, patches, locales_dir=LOCALES_DIR, diff=False):
+    """Apply all patches of a locale in memory; the new bytes go to result.staged
+
+    With diff, result.changes lists every leaf the patches change.
+    """
+    file_path = locale_path(locale_code, locales_dir)
+    result = LocaleResult(locale_code, file_path, [p.source for p in patches])
+
+    if not os.path.exists(file_path):
+        result.error = "file not found"
+        return result
+
+    timer = result.timer = PhaseTimer(locale_code)
+    try:
+        with timer.phase("read") as phase:
+            raw = result.original = read_bytes(file_path)
+            phase["bytes"] = len(raw)
+        with timer.phase("parse") as phase:
+            data = parse_locale(raw)
+            phase["bytes"] = len(raw)
+        with timer.phase("index"):
+            index = LocaleIndex.from_tree(data)
+        with timer.phase("merge"):
+            for patch in patches:
+                result.stats.update(merge(index, patch.data, patch.policy, patch.source))
+        if index.changed:
+            # Reescreve só os trechos das chaves alteradas, preservando o resto do arquivo
+            with timer.phase("serialize") as phase:
+                payload = patch_index(raw.decode('utf-8'), index).encode('utf-8')
+                phase["bytes"] = len(payload)
+            if payload != raw:
+                result.staged = payload
+                result.changed = True
+            if diff:
+                result.changes = diff_changes(LocaleIndex.from_tree(data), index, index.changed)
+    except Exception as e:
+        result.error = str(e)
+    stats = result.stats
+    timer.finish(stats.added + stats.overwritten + stats.removed)
+    return result
+
+
+def stream_locale(locale_code, patches, locales_dir=LOCALES_DIR):
+    """Apply all patches of a locale in streaming passes; the result goes to result.staged_path"""
+    file_path = locale_path(locale_code, locales_dir)
+    result = LocaleResult(locale_code, file_path, [p.source for p in patches])
+
+    if not os.path.exists(file_path):
+        result.error = "file not found"
+        return result
+
+    timer = result.timer = PhaseTimer(locale_code)
+    try:
+        with timer.phase("merge") as phase:
+            phase["bytes"] = os.path.getsize(file_path)
+            result.staged_path, stats = stream_patches(file_path, patches)
+        result.stats.update(stats)
+        result.changed = result.staged_path is not None
+    except Exception as e:
+        result.error = str(e)
+    stats = result.stats
+    timer.finish(stats.added + stats.overwritten + stats.removed)
+    return result
+
+
+def apply_locale(locale_code, patches, locales_dir=LOCALES_DIR):
+    """Apply all patches of a locale with a single read and at most one write"""
+    result = stage_locale(locale_code, patches, locales_dir)
+    if result.staged is not None:
+        try:
+            _write(result)
+        except OSError as e:
+            result.error = str(e)
+            result.changed = False
+    return result
+
+
+def resolve_jobs(jobs):
+    """Number of worker processes (0 or None means one per CPU)"""
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(1, jobs)
+
+
+def _run_pending(grouped, locales_dir, jobs, diff=False, stream=False):
+    """Stage the grouped patches, in-process or across worker processes"""
+    jobs = min(resolve_jobs(jobs), len(grouped))
+    stage = partial(stream_locale, locales_dir=locales_dir) if stream else \
+        partial(stage_locale, locales_dir=locales_dir, diff=diff)
+    if jobs <= 1:
+        return [stage(locale_code, locale_patches) for locale_code, locale_patches in grouped.items()]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            (locale_code, executor.submit(stage, locale_code, locale_patches))
+            for locale_code, locale_patches in grouped.items()
+        ]
+        results = []
+        for locale_code, future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # Falha do próprio worker (ex.: patch não serializável)
+                results.append(LocaleResult(
+                    locale_code, locale_path(locale_code, locales_dir),
+                    [p.source for p in grouped[locale_code]], error=str(e),
+                ))
+        return results
+
+
+def _write(result):
+    with result.timer.phase("write") as phase:
+        atomic_write(result.path, result.staged)
+        phase["bytes"] = len(result.staged)
+
+
+def _commit(results, grouped, journal=None):
+    """Write every staged locale, or none: a failed write restores the ones already written"""
+    staged = [r for r in results if r.staged is not None]
+    if not staged:
+        return True
+    batch_id = journal.begin(staged, grouped) if journal is not None else None
+    written = []
+    try:
+        for result in staged:
+            _write(result)
+            written.append(result)
+    except OSError as e:
+        # Se a restauração também falhar, o lote fica "pending" no journal
+        # e pode ser desfeito depois com `i18n_tool.py journal rollback`
+        for result in written:
+            atomic_write(result.path, result.original)
+        for result in staged:
+            result.changed = False
+            if result is staged[len(written)]:
+                result.error = str(e)
+            else:
+                result.aborted = True
+        if batch_id is not None:
+            journal.abort(batch_id)
+        return False
+    if batch_id is not None:
+        journal.commit(batch_id)
+    return True
+
+
+def commit_staged(results, journal=None, grouped=None):
+    """Write LocaleResults staged outside apply_patches as one batch (e.g. usage --prune)
+
+    Same guarantees as a sync: all or nothing, recorded in the journal when
+    one is given. grouped holds the patches of each locale, if any, for a
+    later replay. Returns True when the batch was written.
+    """
+    grouped = grouped or {}
+    return _commit(results, {r.locale: grouped.get(r.locale, []) for r in results}, journal)
+
+
+def _discard_streams(results):
+    for result in results:
+        if result.staged_path is not None and os.path.exists(result.staged_path):
+            os.unlink(result.staged_path)
+        result.staged_path = None
+
+
+def _commit_streams(results):
+    """Rename every streamed result over its locale, or none
+
+    The originals are kept aside until the whole batch is in place, so a
+    failed rename puts back the ones already swapped.
+    """
+    staged = [r for r in results if r.staged_path is not None]
+    swapped = []
+    try:
+        for result in staged:
+            with result.timer.phase("write") as phase:
+                phase["bytes"] = os.path.getsize(result.staged_path)
+                backup = result.staged_path + ".orig"
+                os.replace(result.path, backup)
+                swapped.append((result, backup))
+                os.replace(result.staged_path, result.path)
+    except OSError as e:
+        failed = result
+        for result, backup in swapped:
+            os.replace(backup, result.path)
+        _discard_streams(staged)
+        for result in staged:
+            result.changed = False
+            if result is failed:
+                result.error = str(e)
+            else:
+                result.aborted = True
+        return False
+    for result, backup in swapped:
+        os.unlink(backup)
+        result.staged_path = None
+    return True
+
+
+def apply_patches(patches, locales_dir=LOCALES_DIR, jobs=1, manifest=None, dry_run=False, journal=None,
+                  stream=False):
+    """Apply every pending patch as one batch, one pass per locale
+
+    All locales are staged in memory first; nothing is written unless every
+    locale succeeds (the others come back with ``aborted`` set). With a
+    journal, the batch is recorded before writing so it can be rolled back
+    or replayed. dry_run stops after staging and fills ``changes``.
+
+    With jobs > 1 the locales are spread across worker processes; results
+    (and errors) are returned in the same order as the locales were gathered.
+    With a manifest, locales whose file and patch set are unchanged since the
+    last run are skipped without being parsed.
+
+    stream merges each locale as an event stream into a temporary file
+    (memory bound by nesting depth plus patch size); it cannot show a
+    dry run or keep a journal, which both need the whole file in memory.
+    """
+    if stream and (dry_run or journal is not None):
+        raise ValueError("streaming merge does not support dry_run or a journal")
+    grouped = group_by_locale(patches)
+    results = {}
+
+    if manifest is not None and not dry_run:
+        for locale_code, locale_patches in grouped.items():
+            file_path = locale_path(locale_code, locales_dir)
+            if manifest.is_fresh(locale_code, file_path, locale_patches):
+                results[locale_code] = LocaleResult(
+                    locale_code, file_path, [p.source for p in locale_patches], skipped=True,
+                )
+
+    pending = {l: p for l, p in grouped.items() if l not in results}
+    for result in _run_pending(pending, locales_dir, jobs, diff=dry_run, stream=stream):
+        results[result.locale] = result
+    ordered = [results[locale_code] for locale_code in grouped]
+
+    if dry_run:
+        return ordered
+    if not all(r.ok for r in ordered):
+        _discard_streams(ordered)
+        for result in ordered:
+            if result.ok and result.changed:
+                result.changed = False
+                result.aborted = True
+        return ordered
+
+    committed = _commit_streams(ordered) if stream else _commit(ordered, grouped, journal)
+    if committed and manifest is not None:
+        for result in ordered:
+            if not result.skipped:
+                manifest.record(result.locale, result.path, grouped[result.locale])
+        manifest.save()
+
+    return ordered
+
+
+def _print_changes(changes):
+    for change in changes:
+        if change.kind == "added":
+            print(f"   + {change.path}: {change.incoming!r}")
+        elif change.kind == "removed":
+            print(f"   - {change.path}: {change.current!r}")
+        else:
+            print(f"   ~ {change.path}: {change.current!r} → {change.incoming!r}")
+
+
+def report(results, dry_run=False):
+    """Print the per-locale outcome and return True if all succeeded"""
+    for result in results:
+        name = os.path.basename(result.path)
+        if dry_run and result.ok:
+            if result.changed:
+                print(f"📝 {name} would change ({len(result.changes)} keys):")
+                _print_changes(result.changes)
+            else:
+                print(f"✔️  {name} already up to date")
+        elif result.aborted:
+            print(f"⛔ {name} not written: batch aborted")
+        elif result.skipped:
+            print(f"⏭️  {name} unchanged, skipped")
+        elif result.ok and result.changed:
+            stats = result.stats
+            print(f"✅ Synchronized {name} ({', '.join(result.sources)}): "
+                  f"+{stats.added} ~{stats.overwritten} -{stats.removed}")
+        elif result.ok:
+            print(f"✔️  {name} already up to date")
+        else:
+            print(f"❌ Error processing {name}: {result.error}")
+        for conflict in result.stats.conflicts:
+            print(f"   ⚠️  {conflict.kind} conflict at {conflict.path} ({conflict.source}): "
+                  f"{conflict.current!r} vs {conflict.incoming!r}")
+    return all(r.ok for r in results)
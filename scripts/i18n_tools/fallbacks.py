@@ -0,0 +1,128 @@
+"""
+Resolução antecipada das cadeias de fallback do i18next.
+
+Em tempo de execução o i18next procura uma chave ausente em ``pt-PT``, depois
+em ``pt`` e por fim no ``fallbackLng`` (``en``). Esta etapa faz essa busca no
+build e gera catálogos completos por idioma, com o relatório das chaves que
+vieram de outro idioma.
+
+As subárvores que faltam inteiras são compartilhadas (mesmo objeto) com o
+idioma de fallback em vez de copiadas; só os objetos no caminho de uma chave
+preenchida são novos.
+"""
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from .audit import FALLBACK_LOCALE, available_locales
+from .index import flatten
+from .locales import LOCALES_DIR, atomic_write, load_locale, locale_path
+
+REPORT_NAME = "fallbacks.json"
+
+
+def fallback_chain(locale_code, locales, fallback=FALLBACK_LOCALE):
+    """Lookup order of a locale, like i18next: pt-PT -> pt -> en"""
+    chain = [locale_code]
+    language = locale_code.split("-")[0]
+    if language != locale_code and language in locales:
+        chain.append(language)
+    if fallback in locales and fallback not in chain:
+        chain.append(fallback)
+    return chain
+
+
+def _fill(primary, fallback, prefix, source, filled):
+    """Return primary with the keys missing from fallback added
+
+    primary itself is returned when nothing is missing, and missing
+    subtrees are taken from fallback as-is (structural sharing).
+    """
+    result = None
+    for key, value in fallback.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if key not in primary:
+            if result is None:
+                result = dict(primary)
+            result[key] = value
+            if isinstance(value, dict) and value:
+                filled.update((p, source) for p, _ in flatten(value, path))
+            else:
+                filled[path] = source
+        elif isinstance(primary[key], dict) and isinstance(value, dict):
+            merged = _fill(primary[key], value, path, source, filled)
+            if merged is not primary[key]:
+                if result is None:
+                    result = dict(primary)
+                result[key] = merged
+    return primary if result is None else result
+
+
+def materialize(tree, fallbacks):
+    """Resolve a locale against its fallbacks [(locale, tree), ...] in order
+
+    Returns (tree, {path: locale that provided it}).
+    """
+    filled = {}
+    for source, fallback_tree in fallbacks:
+        tree = _fill(tree, fallback_tree, "", source, filled)
+    return tree, filled
+
+
+@dataclass
+class MaterializedLocale:
+    locale: str
+    chain: List[str]
+    tree: dict = field(repr=False)
+    filled: Dict[str, str] = field(default_factory=dict)
+
+    def counts(self):
+        """Number of filled keys per fallback locale"""
+        counts = {locale: 0 for locale in self.chain[1:]}
+        for source in self.filled.values():
+            counts[source] += 1
+        return counts
+
+    def to_dict(self):
+        return {"chain": self.chain, "filled": self.counts(), "keys": self.filled}
+
+
+def materialize_locales(locales=None, locales_dir=LOCALES_DIR, fallback=FALLBACK_LOCALE, trees=None):
+    """Materialize every locale; each file is parsed once and shared by all chains
+
+    trees holds locales that have no file of their own (expanded variants).
+    """
+    trees = dict(trees or {})
+    available = sorted(set(available_locales(locales_dir)) | set(trees))
+    locales = locales or available
+
+    def tree_of(locale_code):
+        if locale_code not in trees:
+            trees[locale_code] = load_locale(locale_path(locale_code, locales_dir))
+        return trees[locale_code]
+
+    resolved = {}
+    for locale_code in locales:
+        chain = fallback_chain(locale_code, available, fallback)
+        tree, filled = materialize(tree_of(locale_code), [(l, tree_of(l)) for l in chain[1:]])
+        resolved[locale_code] = MaterializedLocale(locale_code, chain, tree, filled)
+    return resolved
+
+
+def fallback_report(resolved):
+    """JSON report of the keys each locale took from its fallbacks"""
+    return {"version": 1, "locales": {l: m.to_dict() for l, m in resolved.items()}}
+
+
+def write_fallback_report(resolved, out_dir):
+    payload = json.dumps(fallback_report(resolved), ensure_ascii=False, indent=2).encode("utf-8")
+    os.makedirs(out_dir, exist_ok=True)
+    atomic_write(os.path.join(out_dir, REPORT_NAME), payload)
+
+
+def print_fallbacks(resolved):
+    for m in resolved.values():
+        detail = ", ".join(f"{n} de {l}" for l, n in m.counts().items() if n)
+        print(f"🔗 {m.locale} ({' → '.join(m.chain)}): "
+              f"{len(m.filled)} chaves preenchidas{f' ({detail})' if detail else ''}")
@@ -0,0 +1,283 @@
+"""
+Índice achatado de um idioma: cada folha vira um caminho pontuado internado
+(``admin.usersDashboard.columns.projects``) apontando para um slot de valor.
+
+O índice é construído uma única vez por arquivo e serve tanto para o merge
+dos patches quanto para as auditorias (álgebra de conjuntos entre idiomas),
+sem percorrer a árvore aninhada de novo a cada operação.
+"""
+import copy
+import sys
+
+from .locales import load_locale, parse_locale, read_bytes
+
+SEPARATOR = "."
+
+
+class _Unchanged:
+    """Placeholder for a member with no change below it in a partial tree (touched_tree)"""
+
+    def __repr__(self):
+        return "UNCHANGED"
+
+
+UNCHANGED = _Unchanged()
+
+
+def flatten(tree, prefix=""):
+    """Yield (dotted path, leaf value) pairs in document order, iteratively
+
+    Empty objects are kept as leaves so that rebuilding round-trips.
+    """
+    stack = [(prefix, iter(tree.items()))]
+    while stack:
+        base, items = stack[-1]
+        for key, value in items:
+            if SEPARATOR in key:
+                raise ValueError(f"invalid key {key!r} under {base or '<root>'}: contains '{SEPARATOR}'")
+            path = sys.intern(f"{base}{SEPARATOR}{key}" if base else key)
+            if isinstance(value, dict) and value:
+                stack.append((path, iter(value.items())))
+                break
+            yield path, value
+        else:
+            stack.pop()
+
+
+def ancestors(path):
+    """Yield the interior prefixes of a dotted path, outermost first"""
+    end = path.find(SEPARATOR)
+    while end != -1:
+        yield path[:end]
+        end = path.find(SEPARATOR, end + 1)
+
+
+def load_index(path, timer=None):
+    """Read a locale file straight into a LocaleIndex (timing each phase on timer)"""
+    if timer is None:
+        return LocaleIndex.from_tree(load_locale(path))
+    with timer.phase("read") as phase:
+        raw = read_bytes(path)
+        phase["bytes"] = len(raw)
+    with timer.phase("parse") as phase:
+        data = parse_locale(raw)
+        phase["bytes"] = len(raw)
+    with timer.phase("index"):
+        return LocaleIndex.from_tree(data)
+
+
+def _under(path, prefix):
+    return path == prefix or path.startswith(prefix + SEPARATOR)
+
+
+class LocaleIndex:
+    """Flat, ordered view of a locale: dotted path -> value slot
+
+    Paths keep document order, so rebuilding the nested JSON preserves the
+    key order of the original file (new keys go to the end of their parent,
+    like a dict assignment would).
+    """
+
+    __slots__ = ("paths", "values", "changed", "_slots", "_interior")
+
+    def __init__(self, items=()):
+        self.paths = []
+        self.values = []
+        # Caminhos alterados desde a construção (usados pelo patcher de spans)
+        self.changed = set()
+        self._slots = {}
+        self._interior = set()
+        for path, value in items:
+            self._append(path, value)
+
+    @classmethod
+    def from_tree(cls, tree):
+        """Flatten a parsed locale"""
+        return cls(flatten(tree))
+
+    def to_tree(self):
+        """Rebuild the nested JSON object"""
+        tree = {}
+        for path, value in zip(self.paths, self.values):
+            node = tree
+            *parents, leaf = path.split(SEPARATOR)
+            for key in parents:
+                node = node.setdefault(key, {})
+            node[leaf] = value if isinstance(value, str) else copy.deepcopy(value)
+        return tree
+
+    def subtree(self, prefix):
+        """Nested value at prefix (the whole tree for ""), rebuilt from its leaves only"""
+        if not prefix:
+            return self.to_tree()
+        slot = self._slots.get(prefix)
+        if slot is not None:
+            value = self.values[slot]
+            return value if isinstance(value, str) else copy.deepcopy(value)
+        tree = {}
+        start = len(prefix) + len(SEPARATOR)
+        for path in self.subtree_paths(prefix):
+            node = tree
+            *parents, leaf = path[start:].split(SEPARATOR)
+            for key in parents:
+                node = node.setdefault(key, {})
+            value = self.values[self._slots[path]]
+            node[leaf] = value if isinstance(value, str) else copy.deepcopy(value)
+        return tree
+
+    def touched_tree(self, changed):
+        """Partial tree covering only the changed paths
+
+        Changed subtrees come out in full. Every object above a change keeps
+        all of its keys, in order, but members with no change below them hold
+        UNCHANGED instead of their value; ``subtree`` resolves one when needed.
+        Leaves under untouched top-level keys are skipped without being split.
+        """
+        touched = set(changed)
+        for path in changed:
+            touched.update(ancestors(path))
+        tops = {path.split(SEPARATOR, 1)[0] for path in touched}
+        tree = {}
+        # Folhas de um mesmo membro sem mudança costumam ser vizinhas: pula a sequência toda
+        skip = None
+        for path, value in zip(self.paths, self.values):
+            if skip is not None and path.startswith(skip):
+                continue
+            end = path.find(SEPARATOR)
+            top = path if end == -1 else path[:end]
+            if top not in tops:
+                # A raiz sempre é tocada: as outras chaves de topo entram só pela ordem
+                tree.setdefault(top, UNCHANGED)
+                skip = top + SEPARATOR
+                continue
+            parts = path.split(SEPARATOR)
+            node = tree
+            prefix = None
+            for i, key in enumerate(parts):
+                prefix = key if prefix is None else f"{prefix}{SEPARATOR}{key}"
+                if prefix in changed:
+                    for inner in parts[i:-1]:
+                        node = node.setdefault(inner, {})
+                    node[parts[-1]] = value if isinstance(value, str) else copy.deepcopy(value)
+                    break
+                if prefix not in touched:
+                    node.setdefault(key, UNCHANGED)
+                    skip = prefix + SEPARATOR
+                    break
+                if i == len(parts) - 1:
+                    node[key] = value if isinstance(value, str) else copy.deepcopy(value)
+                    break
+                node = node.setdefault(key, {})
+        return tree
+
+    # --- consulta -------------------------------------------------------
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, path):
+        return path in self._slots
+
+    def __getitem__(self, path):
+        return self.values[self._slots[path]]
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def get(self, path, default=None):
+        slot = self._slots.get(path)
+        return default if slot is None else self.values[slot]
+
+    def items(self):
+        return zip(self.paths, self.values)
+
+    def keys(self):
+        """Set-like view of the leaf paths (supports &, |, - and ^)"""
+        return self._slots.keys()
+
+    def is_object(self, path):
+        """True if path is an interior object (has leaves below it)"""
+        return path in self._interior
+
+    def subtree_paths(self, prefix):
+        """Leaf paths equal to or below prefix, in document order"""
+        if prefix in self._slots:
+            return [prefix]
+        if prefix not in self._interior:
+            return []
+        return [p for p in self.paths if _under(p, prefix)]
+
+    # --- escrita ---------------------------------------------------------
+
+    def set(self, path, value):
+        """Set a leaf with overwrite-merge semantics
+
+        A leaf ancestor is replaced by an object and an object at path is
+        replaced by the leaf, both keeping their position. An empty object
+        written over an existing object is a no-op.
+        """
+        self.changed.add(path)
+        if path in self._interior:
+            if isinstance(value, dict) and not value:
+                return
+            self.replace(path, value)
+            return
+        slot = self._slots.get(path)
+        if slot is not None:
+            self.values[slot] = value
+            return
+        for prefix in ancestors(path):
+            if prefix in self._slots:
+                self._splice(prefix, [(path, value)])
+                return
+        self._append(path, value)
+
+    def replace(self, prefix, value):
+        """Replace the whole subtree (or leaf) at prefix, keeping its position"""
+        self.changed.add(prefix)
+        if isinstance(value, dict) and value:
+            items = list(flatten(value, prefix))
+        else:
+            items = [(sys.intern(prefix), value)]
+        self._splice(prefix, items)
+
+    def delete(self, prefix):
+        """Remove the subtree (or leaf) at prefix"""
+        self.changed.add(prefix)
+        self._splice(prefix, [])
+
+    def delete_many(self, prefixes):
+        """Remove several subtrees (or leaves) with a single rebuild"""
+        prefixes = set(prefixes)
+        self.changed.update(prefixes)
+        kept = [
+            (path, value) for path, value in zip(self.paths, self.values)
+            if path not in prefixes and not any(a in prefixes for a in ancestors(path))
+        ]
+        self.paths, self.values, self._slots, self._interior = [], [], {}, set()
+        for path, value in kept:
+            self._append(path, value)
+
+    def _append(self, path, value):
+        self._slots[path] = len(self.paths)
+        self.paths.append(path)
+        self.values.append(value)
+        self._interior.update(ancestors(path))
+
+    def _splice(self, prefix, items):
+        """Swap the leaves under prefix for items, at the first leaf's position"""
+        removed = [i for i, p in enumerate(self.paths) if _under(p, prefix)]
+        for prefix_of_prefix in ancestors(prefix):
+            if prefix_of_prefix in self._slots:
+                removed.append(self._slots[prefix_of_prefix])
+        if not removed:
+            for path, value in items:
+                self._append(path, value)
+            return
+        removed = set(removed)
+        at = min(removed)
+        kept = [(p, v) for i, (p, v) in enumerate(zip(self.paths, self.values)) if i not in removed]
+        merged = kept[:at] + list(items) + kept[at:]
+        self.paths, self.values, self._slots, self._interior = [], [], {}, set()
+        for path, value in merged:
+            self._append(path, value)
@@ -0,0 +1,146 @@
+"""
+Journal dos lotes de sincronização (.i18n-cache/journal).
+
+Antes de gravar um lote, o motor registra para cada idioma o conteúdo
+anterior do arquivo, os hashes antes/depois e os patches aplicados. Com
+isso um lote pode ser desfeito (rollback) ou reaplicado (replay), e um
+lote interrompido no meio da gravação fica marcado como ``pending``.
+"""
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+from .engine import Patch
+from .locales import atomic_write, read_bytes
+from .manifest import CACHE_DIR
+
+JOURNAL_DIR = os.path.join(CACHE_DIR, "journal")
+JOURNAL_VERSION = 1
+MAX_BATCHES = 50
+
+PENDING = "pending"
+COMMITTED = "committed"
+ROLLED_BACK = "rolled-back"
+
+
+def _sha256(payload):
+    return hashlib.sha256(payload).hexdigest()
+
+
+class Journal:
+    """One gzipped JSON file per batch, newest last"""
+
+    def __init__(self, directory=JOURNAL_DIR):
+        self.directory = directory
+        self.last_batch = None
+
+    def _path(self, batch_id):
+        return os.path.join(self.directory, f"{batch_id}.json.gz")
+
+    def _write(self, entry):
+        os.makedirs(self.directory, exist_ok=True)
+        payload = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        atomic_write(self._path(entry["id"]), gzip.compress(payload, mtime=0))
+
+    def load(self, batch_id):
+        with open(self._path(batch_id), "rb") as f:
+            entry = json.loads(gzip.decompress(f.read()).decode("utf-8"))
+        if entry.get("version") != JOURNAL_VERSION:
+            raise ValueError(f"unsupported journal version in batch {batch_id}")
+        return entry
+
+    def batch_ids(self):
+        """Ids of the stored batches, oldest first (ids sort by creation time)"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-len(".json.gz")] for name in os.listdir(self.directory) if name.endswith(".json.gz"))
+
+    def latest(self, status=COMMITTED):
+        for batch_id in reversed(self.batch_ids()):
+            if self.load(batch_id)["status"] == status:
+                return batch_id
+        return None
+
+    def begin(self, results, grouped):
+        """Record a batch about to be written; returns its id
+
+        results are the staged LocaleResults (original and staged bytes),
+        grouped the patches of each locale.
+        """
+        now = datetime.now(timezone.utc)
+        batch_id = f"{now:%Y%m%d-%H%M%S-%f}"
+        self._write({
+            "version": JOURNAL_VERSION,
+            "id": batch_id,
+            "created": now.isoformat(timespec="seconds"),
+            "status": PENDING,
+            "locales": {
+                r.locale: {
+                    "path": r.path,
+                    "before": r.original.decode("utf-8"),
+                    "beforeHash": _sha256(r.original),
+                    "afterHash": _sha256(r.staged),
+                    "stats": r.stats.to_dict(),
+                    "patches": [
+                        {"source": p.source, "policy": p.policy, "data": p.data}
+                        for p in grouped[r.locale]
+                    ],
+                }
+                for r in results
+            },
+        })
+        self.last_batch = batch_id
+        self._prune()
+        return batch_id
+
+    def finish(self, batch_id, status):
+        entry = self.load(batch_id)
+        entry["status"] = status
+        self._write(entry)
+
+    def commit(self, batch_id):
+        """Every file of the batch was written"""
+        self.finish(batch_id, COMMITTED)
+
+    def abort(self, batch_id):
+        """A write failed and the files already written were restored"""
+        self.finish(batch_id, ROLLED_BACK)
+
+    def _prune(self):
+        for batch_id in self.batch_ids()[:-MAX_BATCHES]:
+            os.unlink(self._path(batch_id))
+
+    def rollback(self, batch_id, force=False):
+        """Restore the files of a batch to their previous content
+
+        A file edited after the batch (hash differs from the batch result)
+        is left alone unless force is set. Returns {locale: outcome}.
+        """
+        entry = self.load(batch_id)
+        if entry["status"] == ROLLED_BACK:
+            raise ValueError(f"batch {batch_id} was already rolled back")
+        outcome = {}
+        for locale_code, item in entry["locales"].items():
+            current = read_bytes(item["path"]) if os.path.exists(item["path"]) else None
+            current_hash = _sha256(current) if current is not None else None
+            if current_hash == item["beforeHash"]:
+                outcome[locale_code] = "unchanged"
+            elif current_hash == item["afterHash"] or force:
+                atomic_write(item["path"], item["before"].encode("utf-8"))
+                outcome[locale_code] = "restored"
+            else:
+                outcome[locale_code] = "conflict"
+        if "conflict" not in outcome.values():
+            self.finish(batch_id, ROLLED_BACK)
+        return outcome
+
+    def patches(self, batch_id):
+        """The patches of a batch, in their original order, for a replay"""
+        entry = self.load(batch_id)
+        return [
+            Patch(p["source"], locale_code, p["data"], p["policy"])
+            for locale_code, item in entry["locales"].items()
+            for p in item["patches"]
+        ]
@@ -0,0 +1,80 @@
+"""
+Localização e (de)serialização dos arquivos de idioma.
+"""
+import json
+import os
+import tempfile
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+LOCALES_DIR = os.path.join(REPO_ROOT, "src", "locales")
+
+# Idioma de referência (chaves completas) e idiomas mantidos pelos scripts de patch
+REFERENCE_LOCALE = "pt"
+TARGET_LOCALES = ["es", "fr", "de", "it", "pt-PT", "ru", "ar", "ja", "zh"]
+
+
+def locale_path(locale_code, locales_dir=LOCALES_DIR):
+    """Return the path of a locale file"""
+    return os.path.join(locales_dir, f"{locale_code}.json")
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def parse_locale(raw):
+    """Parse the raw bytes of a locale file"""
+    return json.loads(raw.decode('utf-8'))
+
+
+def load_locale(path):
+    """Read and parse a locale file"""
+    return parse_locale(read_bytes(path))
+
+
+def dump_locale(data):
+    """Serialize a locale the same way the JSON files are stored"""
+    return json.dumps(data, ensure_ascii=False, indent=4)
+
+
+def atomic_write(path, payload):
+    """Write bytes to a temp file next to path and rename it over path
+
+    A crash midway leaves either the old or the new file, never a truncated one.
+    """
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        else:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_if_changed(path, payload, current=None):
+    """Write bytes atomically only if they differ from the file content
+
+    current is the file content already in memory, if the caller has it.
+    Returns True when the file was rewritten.
+    """
+    if current is None and os.path.exists(path):
+        current = read_bytes(path)
+    if payload == current:
+        return False
+    atomic_write(path, payload)
+    return True
+
+
+def write_locale(path, data, current=None):
+    """Serialize a whole locale and write it only if the bytes differ"""
+    return write_if_changed(path, dump_locale(data).encode('utf-8'), current)
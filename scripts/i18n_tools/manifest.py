@@ -0,0 +1,86 @@
+"""
+Manifesto de hashes das sincronizações: guarda o hash de cada arquivo de
+idioma e dos conjuntos de patches já aplicados a ele, para que execuções
+repetidas pulem os idiomas que não mudaram sem precisar fazer o parse do JSON.
+
+Cada ferramenta (sync_i18n.py, sync_i18n_projects.py, i18n_tool.py sync...)
+aplica um conjunto diferente de patches aos mesmos idiomas. O manifesto
+guarda todos os conjuntos aplicados ao conteúdo atual do arquivo, então
+rodar as ferramentas alternadamente não invalida as entradas umas das outras.
+"""
+import hashlib
+import json
+import os
+
+from .locales import REPO_ROOT, atomic_write
+
+CACHE_DIR = os.path.join(REPO_ROOT, ".i18n-cache")
+MANIFEST_PATH = os.path.join(CACHE_DIR, "sync-manifest.json")
+MANIFEST_VERSION = 2
+
+
+def file_hash(path):
+    """SHA-256 of the raw bytes of a file"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def patch_hash(patch):
+    """SHA-256 of a patch: its source, merge policy and data"""
+    payload = json.dumps(
+        {"source": patch.source, "policy": patch.policy, "data": patch.data},
+        ensure_ascii=False, sort_keys=True, separators=(',', ':'),
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def patch_set_hash(patches):
+    """SHA-256 of an ordered patch set (the order matters for overwrites)"""
+    return hashlib.sha256("".join(patch_hash(p) for p in patches).encode('utf-8')).hexdigest()
+
+
+class Manifest:
+    """Per-locale record of the file hash and every patch set already applied to that content"""
+
+    def __init__(self, path=MANIFEST_PATH, entries=None):
+        self.path = path
+        self.entries = entries or {}
+
+    @classmethod
+    def load(cls, path=MANIFEST_PATH):
+        """Load the manifest, starting empty if it is missing or outdated"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        if data.get("version") != MANIFEST_VERSION:
+            return cls(path)
+        return cls(path, data.get("locales", {}))
+
+    def is_fresh(self, locale_code, file_path, patches):
+        """True if this patch set was already applied to the current file content"""
+        entry = self.entries.get(locale_code)
+        if not entry or not os.path.exists(file_path):
+            return False
+        return (patch_set_hash(patches) in entry["patchSets"]
+                and entry["file"] == file_hash(file_path))
+
+    def record(self, locale_code, file_path, patches):
+        """Remember the state of a locale after its patches were applied
+
+        While the file content stays the same the patch sets accumulate;
+        once it changes, the sets recorded for the old content are dropped.
+        """
+        current = file_hash(file_path)
+        entry = self.entries.get(locale_code)
+        patch_sets = entry["patchSets"] if entry and entry["file"] == current else []
+        set_hash = patch_set_hash(patches)
+        if set_hash not in patch_sets:
+            patch_sets = patch_sets + [set_hash]
+        self.entries[locale_code] = {"file": current, "patchSets": patch_sets}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        payload = json.dumps({"version": MANIFEST_VERSION, "locales": self.entries}, indent=2, sort_keys=True)
+        atomic_write(self.path, payload.encode('utf-8'))
@@ -0,0 +1,248 @@
+"""
+Motor de merge dos patches de tradução, com políticas explícitas.
+
+Todas as políticas operam sobre o LocaleIndex do idioma (caminhos achatados,
+sem recursão) e devolvem estatísticas de folhas adicionadas, sobrescritas,
+puladas e removidas, além da lista de conflitos encontrados.
+
+- overwrite: sobrescreve folhas (antigo deep_update de sync_i18n.py)
+- add-missing: só adiciona chaves ausentes (patches do translate)
+- replace-subtree: troca subárvores inteiras de primeiro nível (add_translations.py)
+- add-subtree: adiciona subárvores de primeiro nível só quando ausentes, e grupos
+  de folhas só dentro de objetos existentes (add_bugreports_translations.py)
+"""
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+from .index import ancestors, flatten
+
+OVERWRITE = "overwrite"
+ADD_MISSING = "add-missing"
+REPLACE_SUBTREE = "replace-subtree"
+ADD_SUBTREE = "add-subtree"
+POLICIES = (OVERWRITE, ADD_MISSING, REPLACE_SUBTREE, ADD_SUBTREE)
+
+
+class _Missing:
+    """Marks the absent side of a KeyChange (pickled as the singleton)"""
+
+    def __repr__(self):
+        return "<missing>"
+
+    def __reduce__(self):
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+
+@dataclass
+class Conflict:
+    """A patch leaf that collided with the current locale content
+
+    kind is "type" (leaf vs object) or "value" (add-missing kept a different value).
+    """
+    path: str
+    kind: str
+    current: Any
+    incoming: Any
+    source: Optional[str] = None
+
+
+@dataclass
+class KeyChange:
+    """One leaf changed by a batch; current/incoming is MISSING when absent"""
+    path: str
+    current: Any
+    incoming: Any
+
+    @property
+    def kind(self):
+        if self.current is MISSING:
+            return "added"
+        if self.incoming is MISSING:
+            return "removed"
+        return "changed"
+
+    def to_dict(self):
+        entry = {"path": self.path, "kind": self.kind}
+        if self.current is not MISSING:
+            entry["current"] = self.current
+        if self.incoming is not MISSING:
+            entry["incoming"] = self.incoming
+        return entry
+
+
+@dataclass
+class MergeStats:
+    added: int = 0
+    overwritten: int = 0
+    skipped: int = 0
+    removed: int = 0
+    conflicts: List[Conflict] = field(default_factory=list)
+
+    def update(self, other):
+        """Accumulate the stats of another merge"""
+        self.added += other.added
+        self.overwritten += other.overwritten
+        self.skipped += other.skipped
+        self.removed += other.removed
+        self.conflicts.extend(other.conflicts)
+        return self
+
+    def to_dict(self):
+        return {
+            "added": self.added,
+            "overwritten": self.overwritten,
+            "skipped": self.skipped,
+            "removed": self.removed,
+            "conflicts": len(self.conflicts),
+        }
+
+
+def _leaf_ancestor(index, path):
+    """First ancestor of path stored as a leaf (an empty object counts), if any"""
+    for prefix in ancestors(path):
+        if prefix in index:
+            return prefix
+    return None
+
+
+def _is_empty_object(value):
+    return isinstance(value, dict) and not value
+
+
+def _overwrite(index, src, stats, source):
+    for path, value in flatten(src):
+        if index.is_object(path):
+            if _is_empty_object(value):
+                stats.skipped += 1
+                continue
+            stats.conflicts.append(Conflict(path, "type", "<object>", value, source))
+            stats.removed += len(index.subtree_paths(path))
+            stats.added += 1
+        elif path in index:
+            if index[path] == value:
+                stats.skipped += 1
+                continue
+            stats.overwritten += 1
+        else:
+            blocker = _leaf_ancestor(index, path)
+            if blocker is not None:
+                if not _is_empty_object(index[blocker]):
+                    stats.conflicts.append(Conflict(blocker, "type", index[blocker], "<object>", source))
+                stats.removed += 1
+            stats.added += 1
+        index.set(path, value)
+
+
+def _add_missing(index, src, stats, source):
+    for path, value in flatten(src):
+        if path in index:
+            stats.skipped += 1
+            if index[path] != value:
+                stats.conflicts.append(Conflict(path, "value", index[path], value, source))
+            continue
+        if index.is_object(path):
+            stats.skipped += 1
+            if not _is_empty_object(value):
+                stats.conflicts.append(Conflict(path, "type", "<object>", value, source))
+            continue
+        # Uma folha no caminho bloqueia o patch, exceto um objeto vazio
+        blocker = _leaf_ancestor(index, path)
+        if blocker is not None and not _is_empty_object(index[blocker]):
+            stats.skipped += 1
+            stats.conflicts.append(Conflict(blocker, "type", index[blocker], "<object>", source))
+            continue
+        if blocker is not None:
+            stats.removed += 1
+        stats.added += 1
+        index.set(path, value)
+
+
+def _replace_subtree(index, src, stats, source):
+    for key, value in src.items():
+        old = [(path, index[path]) for path in index.subtree_paths(key)]
+        new = list(flatten(value, key)) if isinstance(value, dict) and value else [(key, value)]
+        if old == new:
+            stats.skipped += len(new)
+            continue
+        old_values = dict(old)
+        for path, leaf in new:
+            if path not in old_values:
+                stats.added += 1
+            elif old_values[path] != leaf:
+                stats.overwritten += 1
+            else:
+                stats.skipped += 1
+        new_paths = {path for path, _ in new}
+        stats.removed += sum(1 for path in old_values if path not in new_paths)
+        index.replace(key, value)
+
+
+def is_leaf_group(value):
+    """True for a patch object holding only leaves (keys to attach into an existing object)"""
+    return (isinstance(value, dict) and bool(value)
+            and not any(isinstance(v, dict) and v for v in value.values()))
+
+
+def _add_subtree(index, src, stats, source):
+    for key, value in src.items():
+        if is_leaf_group(value):
+            # Grupo de folhas (navbar.bugReports): só entra num objeto que já existe
+            if key in index or index.is_object(key):
+                _add_missing(index, {key: value}, stats, source)
+            else:
+                stats.skipped += len(value)
+        elif isinstance(value, dict) and value:
+            # Subárvore (bugReports): entra inteira se ausente, senão fica como está
+            leaves = sum(1 for _ in flatten(value, key))
+            if key not in index and not index.is_object(key):
+                stats.added += leaves
+                index.replace(key, value)
+                continue
+            stats.skipped += leaves
+            if key in index and not isinstance(index[key], dict):
+                stats.conflicts.append(Conflict(key, "type", index[key], "<object>", source))
+        else:
+            _add_missing(index, {key: value}, stats, source)
+
+
+_POLICY_STEPS = {
+    OVERWRITE: _overwrite,
+    ADD_MISSING: _add_missing,
+    REPLACE_SUBTREE: _replace_subtree,
+    ADD_SUBTREE: _add_subtree,
+}
+
+
+def merge(index, src, policy=OVERWRITE, source=None):
+    """Merge a nested patch into a LocaleIndex with the given policy"""
+    try:
+        step = _POLICY_STEPS[policy]
+    except KeyError:
+        raise ValueError(f"unknown merge policy {policy!r} (expected one of {', '.join(POLICIES)})")
+    stats = MergeStats()
+    step(index, src, stats, source)
+    return stats
+
+
+def diff_changes(before, after, prefixes):
+    """Per-leaf changes between two indexes, limited to the changed prefixes
+
+    prefixes is ``LocaleIndex.changed`` of ``after``; leaves are listed in
+    the document order of ``after``, followed by the removed ones.
+    """
+    candidates = set()
+    for prefix in prefixes:
+        candidates.update(before.subtree_paths(prefix))
+        candidates.update(after.subtree_paths(prefix))
+        candidates.update(a for a in ancestors(prefix) if a in before or a in after)
+    ordered = [p for p in after.paths if p in candidates]
+    ordered += [p for p in before.paths if p in candidates and p not in after]
+    changes = []
+    for path in ordered:
+        current, incoming = before.get(path, MISSING), after.get(path, MISSING)
+        if current != incoming:
+            changes.append(KeyChange(path, current, incoming))
+    return changes
@@ -0,0 +1,262 @@
+"""
+Patcher de JSON que preserva a formatação: localiza no texto original os
+trechos (spans) das chaves alteradas e substitui apenas esses bytes.
+
+A ordem das chaves e a formatação do restante do arquivo ficam intactas, e
+o diff gerado no git tem o tamanho da mudança, não do arquivo.
+
+``patch_index`` olha só os caminhos alterados: o scanner pula (em C, com o
+decoder do json) os valores fora deles, e a árvore nova é montada apenas
+para os prefixos tocados.
+"""
+import json
+import re
+
+from .index import SEPARATOR, ancestors
+
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\],:]', re.S)
+_WHITESPACE = " \t\r\n"
+_DECODER = json.JSONDecoder()
+
+
+class ObjectSpan:
+    """Position of a JSON object in the text and of each of its members"""
+
+    __slots__ = ("start", "end", "members")
+
+    def __init__(self, start):
+        self.start = start
+        self.end = None
+        self.members = {}
+
+
+class Member:
+    """A ``"key": value`` pair: where the key starts and the value spans"""
+
+    __slots__ = ("key", "start", "value_start", "value_end", "child")
+
+    def __init__(self, key, start):
+        self.key = key
+        self.start = start
+        self.value_start = None
+        self.value_end = None
+        self.child = None
+
+
+def _decode_key(token):
+    return token[1:-1] if "\\" not in token else json.loads(token)
+
+
+def scan(text, touched=None, changed=None):
+    """Tokenize a JSON document and return the span tree of its root object
+
+    Arrays are treated as opaque values. The input is assumed to be valid JSON.
+    With touched (changed paths plus their ancestors) the values of members
+    outside it and not below a changed path are skipped: they get their
+    span but no child spans.
+    """
+    root = None
+    stack = []          # (ObjectSpan, member of the parent holding it, dotted path, below a change)
+    member = None
+    path = ""
+    below = False
+    state = "value"     # key | colon | value | after
+    value_pos = 0
+    array_depth = 0
+    pos = 0
+
+    while True:
+        match = _TOKEN.search(text, pos)
+        if match is None:
+            break
+        pos = match.end()
+        token = match.group()
+        first = token[0]
+
+        if array_depth:
+            if first in "[{":
+                array_depth += 1
+            elif first in "]}":
+                array_depth -= 1
+                if not array_depth:
+                    member.value_end = match.end()
+                    state = "after"
+            continue
+
+        if state == "value" and first in ",}":
+            # Valor escalar (número, true/false/null): entre o ':' e este token
+            start, end = value_pos, match.start()
+            while text[start] in _WHITESPACE:
+                start += 1
+            while text[end - 1] in _WHITESPACE:
+                end -= 1
+            member.value_start, member.value_end = start, end
+            state = "after"
+
+        if first == "{":
+            obj = ObjectSpan(match.start())
+            if root is None:
+                root = obj
+            else:
+                member.value_start = match.start()
+                member.child = obj
+            stack.append((obj, member, path, below))
+            state = "key"
+        elif first == "}":
+            obj, member, _, _ = stack.pop()
+            obj.end = match.end()
+            if member is not None:
+                member.value_end = match.end()
+            state = "after"
+        elif first == "[":
+            member.value_start = match.start()
+            array_depth = 1
+        elif first == '"':
+            if state == "key":
+                member = Member(_decode_key(token), match.start())
+                obj, _, base, parent_below = stack[-1]
+                obj.members[member.key] = member
+                path = f"{base}{SEPARATOR}{member.key}" if base else member.key
+                below = parent_below or (changed is not None and path in changed)
+                state = "colon"
+            else:
+                member.value_start, member.value_end = match.start(), match.end()
+                state = "after"
+        elif first == ":":
+            state = "value"
+            value_pos = match.end()
+            if touched is not None and not below and path not in touched:
+                start = value_pos
+                while text[start] in _WHITESPACE:
+                    start += 1
+                _, pos = _DECODER.raw_decode(text, start)
+                member.value_start, member.value_end = start, pos
+                state = "after"
+        elif first == ",":
+            member = None
+            state = "key"
+
+    if root is None or root.end is None:
+        raise ValueError("expected a JSON object")
+    return root
+
+
+def _line_indent(text, pos):
+    """Whitespace between the start of the line and pos"""
+    line_start = text.rfind("\n", 0, pos) + 1
+    return text[line_start:pos] if not text[line_start:pos].strip() else ""
+
+
+class _Layout:
+    """Formatting conventions detected from the original text"""
+
+    def __init__(self, text, root):
+        first = next(iter(root.members.values()), None)
+        if first is None:
+            # Sem membros não há o que detectar: usa o padrão dos arquivos (indent=4)
+            self.multiline, self.unit = True, " " * 4
+            return
+        self.multiline = "\n" in text[root.start:first.start]
+        self.unit = _line_indent(text, first.start) if self.multiline else ""
+
+    def dumps(self, value, indent):
+        """Serialize a value as it would appear nested at the given indent"""
+        if not self.multiline:
+            return json.dumps(value, ensure_ascii=False)
+        out = json.dumps(value, ensure_ascii=False, indent=self.unit)
+        return out.replace("\n", "\n" + indent)
+
+    def member(self, key, value, indent):
+        return f'{json.dumps(key, ensure_ascii=False)}: {self.dumps(value, indent)}'
+
+
+def _touched(changed):
+    """Changed paths plus all of their ancestors"""
+    touched = set()
+    for path in changed:
+        touched.add(path)
+        touched.update(ancestors(path))
+    return touched
+
+
+def diff_edits(text, root, new_tree, changed=None, resolve=None):
+    """Compute the (start, end, replacement) edits turning text into new_tree
+
+    ``changed`` restricts the walk to these dotted paths (and what is below
+    them); without it every member is compared. Objects whose key order no
+    longer matches, or that lost keys, are re-serialized as a whole, with
+    ``resolve(path)`` supplying their full value when new_tree is partial.
+    """
+    layout = _Layout(text, root)
+    touched = _touched(changed) if changed is not None else None
+    edits = []
+    stack = [("", root, new_tree, _line_indent(text, root.start), False)]
+
+    while stack:
+        base, obj, new, indent, parent_below = stack.pop()
+        old_keys = list(obj.members)
+        new_keys = list(new)
+        kept = [k for k in new_keys if k in obj.members]
+
+        if kept != old_keys or kept != new_keys[:len(kept)] or (not old_keys and new_keys):
+            # Chaves removidas/reordenadas (ou objeto vazio): reescreve o objeto
+            full = resolve(base) if resolve is not None else new
+            edits.append((obj.start, obj.end, layout.dumps(full, indent)))
+            continue
+
+        member_indent = indent + layout.unit
+        for key in kept:
+            path = f"{base}{SEPARATOR}{key}" if base else key
+            below = parent_below or (changed is not None and path in changed)
+            if touched is not None and not below and path not in touched:
+                continue
+            member = obj.members[key]
+            value = new[key]
+            if member.child is not None and isinstance(value, dict):
+                stack.append((path, member.child, value, member_indent, below))
+                continue
+            serialized = layout.dumps(value, member_indent)
+            current = text[member.value_start:member.value_end]
+            if current != serialized and json.loads(current) != value:
+                edits.append((member.value_start, member.value_end, serialized))
+
+        added = new_keys[len(kept):]
+        if added:
+            last = obj.members[old_keys[-1]]
+            sep = f",\n{member_indent}" if layout.multiline else ", "
+            chunk = "".join(sep + layout.member(key, new[key], member_indent) for key in added)
+            edits.append((last.value_end, last.value_end, chunk))
+
+    return edits
+
+
+def apply_edits(text, edits):
+    """Splice the edits into text (edits must not overlap)"""
+    parts = []
+    pos = 0
+    for start, end, replacement in sorted(edits, key=lambda e: (e[0], e[1])):
+        parts.append(text[pos:start])
+        parts.append(replacement)
+        pos = end
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def patch_text(text, new_tree, changed=None):
+    """Return text with only the spans that differ from new_tree rewritten"""
+    root = scan(text)
+    return apply_edits(text, diff_edits(text, root, new_tree, changed))
+
+
+def patch_index(text, index):
+    """Return text patched to the content of a LocaleIndex, looking only at index.changed
+
+    Same output as ``patch_text(text, index.to_tree(), index.changed)``, but
+    neither the scan nor the rebuild goes through the untouched parts of
+    the tree, so the cost follows the size of the change.
+    """
+    changed = index.changed
+    if not changed:
+        return text
+    root = scan(text, _touched(changed), changed)
+    return apply_edits(text, diff_edits(text, root, index.touched_tree(changed), changed, index.subtree))
@@ -0,0 +1,108 @@
+"""
+Patches de tradução em arquivos de dados (scripts/i18n_patches).
+
+O ``manifest.json`` lista, para cada script de patches, a política de
+merge, os idiomas alvo, o arquivo JSON de cada idioma e o fallback dos
+idiomas sem arquivo próprio. Os arquivos só são lidos para os idiomas
+processados, e o conteúdo já parseado fica em cache (marshal) em
+.i18n-cache/patches, indexado pelo hash do arquivo.
+"""
+import hashlib
+import json
+import marshal
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .engine import Patch
+from .locales import LOCALES_DIR, REPO_ROOT, atomic_write, load_locale, locale_path, read_bytes
+from .manifest import CACHE_DIR
+from .merge import OVERWRITE, POLICIES
+
+PATCHES_DIR = os.path.join(REPO_ROOT, "scripts", "i18n_patches")
+PATCH_MANIFEST = "manifest.json"
+PATCH_CACHE_DIR = os.path.join(CACHE_DIR, "patches")
+PATCH_MANIFEST_VERSION = 1
+
+
+@dataclass
+class PatchSource:
+    """Manifest entry of one patch source
+
+    fallback is {"file": path} (a patch file) or {"locale": code} (the
+    ``keys`` of an existing locale file), used for locales without a file.
+    """
+    name: str
+    policy: str = OVERWRITE
+    locales: List[str] = field(default_factory=list)
+    files: Dict[str, str] = field(default_factory=dict)
+    keys: Optional[List[str]] = None
+    fallback: Optional[Dict[str, str]] = None
+
+    def paths(self, patches_dir=PATCHES_DIR):
+        """Every data file of this source, fallback included"""
+        paths = [os.path.join(patches_dir, f) for f in self.files.values()]
+        if self.fallback and "file" in self.fallback:
+            paths.append(os.path.join(patches_dir, self.fallback["file"]))
+        return paths
+
+
+def load_patch_manifest(patches_dir=PATCHES_DIR):
+    """Read the manifest into {name: PatchSource}, in application order"""
+    with open(os.path.join(patches_dir, PATCH_MANIFEST), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != PATCH_MANIFEST_VERSION:
+        raise ValueError(f"unsupported patch manifest version {data.get('version')!r}")
+    sources = {}
+    for name, entry in data["sources"].items():
+        source = sources[name] = PatchSource(name, **entry)
+        if source.policy not in POLICIES:
+            raise ValueError(f"{name}: unknown merge policy {source.policy!r}")
+    return sources
+
+
+def load_patch_data(path, cache_dir=PATCH_CACHE_DIR):
+    """Parse a patch file, reusing the pre-parsed copy cached under its hash"""
+    raw = read_bytes(path)
+    if cache_dir is None:
+        return json.loads(raw.decode("utf-8"))
+    cached = os.path.join(cache_dir, hashlib.blake2b(raw, digest_size=16).hexdigest() + ".marshal")
+    try:
+        with open(cached, "rb") as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    data = json.loads(raw.decode("utf-8"))
+    os.makedirs(cache_dir, exist_ok=True)
+    atomic_write(cached, marshal.dumps(data))
+    return data
+
+
+def _select(data, keys):
+    return {k: data[k] for k in keys} if keys else data
+
+
+def build_source_patches(name, locales_dir=LOCALES_DIR, locales=None, patches_dir=PATCHES_DIR,
+                         cache_dir=PATCH_CACHE_DIR):
+    """Build the patches of one source, loading only the files of ``locales``"""
+    source = load_patch_manifest(patches_dir)[name]
+    fallback = None
+    patches = []
+    for locale_code in source.locales:
+        if locales and locale_code not in locales:
+            continue
+        if locale_code in source.files:
+            data = load_patch_data(os.path.join(patches_dir, source.files[locale_code]), cache_dir)
+        elif source.fallback:
+            if "locale" in source.fallback:
+                print(f"⚠️  No custom translation for {locale_code}, using {source.fallback['locale']}")
+            if fallback is None:
+                if "file" in source.fallback:
+                    fallback = load_patch_data(os.path.join(patches_dir, source.fallback["file"]), cache_dir)
+                else:
+                    fallback = load_locale(locale_path(source.fallback["locale"], locales_dir))
+            data = fallback
+        else:
+            continue
+        patches.append(Patch(name, locale_code, _select(data, source.keys), source.policy))
+    return patches
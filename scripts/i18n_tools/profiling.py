@@ -0,0 +1,168 @@
+"""
+Perfil por fase das ferramentas de idioma (``--profile``).
+
+Cada idioma processado guarda o tempo de parede e os bytes de cada fase
+(leitura, parse, merge, serialização, escrita), o pico de memória do
+processo que o tratou e o número de chaves alteradas. A saída é JSON lines
+(um idioma por linha) ou um trace do Chrome (``chrome://tracing``/Perfetto),
+escolhido pela extensão do arquivo.
+"""
+import json
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from .locales import atomic_write
+
+JSONL = "jsonl"
+CHROME = "chrome"
+PHASES = ["read", "parse", "index", "merge", "serialize", "write", "audit"]
+
+
+def peak_rss():
+    """Peak resident memory of this process in bytes (ru_maxrss is KB on Linux)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class PhaseTimer:
+    """Timings of one locale; plain data, so it comes back from worker processes"""
+    locale: str
+    phases: Dict[str, dict] = field(default_factory=dict)
+    changed_keys: int = 0
+    peak_rss: int = 0
+    pid: int = field(default_factory=os.getpid)
+
+    @contextmanager
+    def phase(self, name):
+        """Time a phase; the yielded dict takes its ``bytes``"""
+        entry = {"start": time.time(), "seconds": 0.0, "bytes": None}
+        started = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry["seconds"] = time.perf_counter() - started
+            self.phases[name] = entry
+
+    def finish(self, changed_keys=0):
+        self.changed_keys = changed_keys
+        self.peak_rss = peak_rss()
+        return self
+
+    @property
+    def seconds(self):
+        return sum(p["seconds"] for p in self.phases.values())
+
+    def to_dict(self):
+        return {
+            "locale": self.locale,
+            "ms": round(self.seconds * 1000, 3),
+            "phases": {
+                name: {"ms": round(p["seconds"] * 1000, 3), "bytes": p["bytes"]}
+                for name, p in self.phases.items()
+            },
+            "changedKeys": self.changed_keys,
+            "peakRss": self.peak_rss,
+            "pid": self.pid,
+        }
+
+
+class Profile:
+    """Locale timings of one tool run, written as JSON lines or a Chrome trace"""
+
+    def __init__(self, tool):
+        self.tool = tool
+        self.timers = []
+        self.started = time.time()
+
+    def add(self, timer):
+        if timer is not None:
+            self.timers.append(timer)
+        return timer
+
+    def locale(self, locale_code):
+        """New timer for a locale processed in this process"""
+        return self.add(PhaseTimer(locale_code))
+
+    def jsonl(self):
+        lines = [{"tool": self.tool, **t.to_dict()} for t in self.timers]
+        return "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines)
+
+    def chrome_trace(self):
+        """Complete ("X") events, one thread per locale within each process"""
+        starts = [p["start"] for t in self.timers for p in t.phases.values()]
+        origin = min(starts, default=self.started)
+
+        def us(seconds):
+            return round(seconds * 1e6, 1)
+
+        events = [
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"{self.tool} ({pid})"}}
+            for pid in sorted({t.pid for t in self.timers})
+        ]
+        for tid, timer in enumerate(self.timers, 1):
+            events.append({"name": "thread_name", "ph": "M", "pid": timer.pid, "tid": tid,
+                           "args": {"name": timer.locale}})
+            for name, p in timer.phases.items():
+                events.append({
+                    "name": name, "cat": self.tool, "ph": "X", "pid": timer.pid, "tid": tid,
+                    "ts": us(p["start"] - origin), "dur": us(p["seconds"]), "args": {"bytes": p["bytes"]},
+                })
+            end = max((p["start"] + p["seconds"] for p in timer.phases.values()), default=origin)
+            events.append({"name": "peakRss", "ph": "C", "pid": timer.pid, "ts": us(end - origin),
+                           "args": {"bytes": timer.peak_rss}})
+        return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, ensure_ascii=False)
+
+    def write(self, path, fmt=None):
+        """Write the profile; the format follows the extension (.json = Chrome trace)"""
+        fmt = fmt or (CHROME if path.endswith(".json") else JSONL)
+        payload = self.chrome_trace() if fmt == CHROME else self.jsonl()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        atomic_write(path, payload.encode("utf-8"))
+        return fmt
+
+
+def print_profile(profile):
+    """Per-locale table of phase times (ms), bytes read and changed keys"""
+    phases = [p for p in PHASES if any(p in t.phases for t in profile.timers)]
+    print(f"\n⏱️  Perfil ({profile.tool})")
+    print(f"{'idioma':<8} " + " ".join(f"{p:>9}" for p in phases) + f" {'total':>9} {'KB':>7} {'chaves':>6}")
+    for t in profile.timers:
+        cells = " ".join(
+            f"{t.phases[p]['seconds'] * 1000:>9.2f}" if p in t.phases else f"{'-':>9}" for p in phases
+        )
+        read = t.phases.get("read", {}).get("bytes") or 0
+        print(f"{t.locale:<8} {cells} {t.seconds * 1000:>9.2f} {read / 1024:>7.1f} {t.changed_keys:>6}")
+    if profile.timers:
+        print(f"Pico de memória: {max(t.peak_rss for t in profile.timers) / 1024 / 1024:.1f} MB")
+
+
+def profile_results(tool, results):
+    """Profile of a sync from the timers its LocaleResults carry back"""
+    profile = Profile(tool)
+    for result in results:
+        profile.add(result.timer)
+    return profile
+
+
+def add_profile_arguments(parser):
+    parser.add_argument("--profile", metavar="PATH",
+                        help="grava o perfil por fase (.json = trace do Chrome, outro = JSON lines)")
+
+
+def finish_profile(profile, path: Optional[str], quiet=False):
+    """Write the profile when --profile was given and print its table (unless quiet)"""
+    if not path:
+        return
+    fmt = profile.write(path)
+    if quiet:
+        return
+    print_profile(profile)
+    print(f"💾 Perfil ({'trace do Chrome' if fmt == CHROME else 'JSON lines'}) salvo em {path}")
@@ -0,0 +1,71 @@
+"""
+Registro dos scripts que fornecem patches de tradução.
+
+Cada script expõe ``build_patches(locales_dir, locales)``, que lê só os
+arquivos de dados (scripts/i18n_patches) dos idiomas pedidos; este módulo
+os reúne para uma única passada e fornece o ``main`` comum dos scripts
+(``run_source``).
+"""
+import argparse
+import importlib.util
+import os
+
+from .engine import apply_patches, report
+from .locales import LOCALES_DIR, REPO_ROOT
+from .manifest import Manifest
+from .patchfiles import PATCH_MANIFEST, PATCHES_DIR, build_source_patches, load_patch_manifest
+from .profiling import add_profile_arguments, finish_profile, profile_results
+
+# Ordem de aplicação dos patches (mesma ordem em que os scripts eram rodados)
+SOURCES = {
+    "add_translations": os.path.join(REPO_ROOT, "add_translations.py"),
+    "add_bugreports_translations": os.path.join(REPO_ROOT, "add_bugreports_translations.py"),
+    "sync_i18n": os.path.join(REPO_ROOT, "scripts", "sync_i18n.py"),
+    "sync_i18n_projects": os.path.join(REPO_ROOT, "scripts", "sync_i18n_projects.py"),
+}
+
+
+def load_source(name):
+    """Import a patch source script by name"""
+    spec = importlib.util.spec_from_file_location(f"i18n_source_{name}", SOURCES[name])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def source_paths(name, patches_dir=PATCHES_DIR):
+    """Files whose edits change the patches of a source: script, manifest and data files"""
+    entry = load_patch_manifest(patches_dir).get(name)
+    data_files = entry.paths(patches_dir) if entry else []
+    return [SOURCES[name], os.path.join(patches_dir, PATCH_MANIFEST)] + data_files
+
+
+def gather_patches(names=None, locales=None, locales_dir=LOCALES_DIR):
+    """Collect the patches of the given sources (all by default)
+
+    Only the patch files of ``locales`` are read when it is given.
+    """
+    patches = []
+    for name in names or SOURCES:
+        patches.extend(load_source(name).build_patches(locales_dir, locales))
+    return patches
+
+
+def run_source(name, description, banner, done, failed=None):
+    """Command-line entry point of a patch source script; returns the exit status
+
+    Applies the source's patches as one batch and prints the report; done
+    (or failed, when given and a locale fails) is printed at the end.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    print(banner)
+    # Com --profile todos os idiomas são processados, sem pular os que não mudaram
+    results = apply_patches(build_source_patches(name), manifest=None if args.profile else Manifest.load())
+    ok = report(results)
+    finish_profile(profile_results(name, results), args.profile)
+
+    print(done if ok or failed is None else failed)
+    return 0 if ok else 1
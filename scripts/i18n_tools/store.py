@@ -0,0 +1,279 @@
+"""
+Armazenamento opcional dos idiomas em SQLite (.i18n-cache/locales.sqlite3).
+
+Cada folha de cada idioma vira uma linha ``(idioma, caminho)`` com a
+posição no arquivo, o valor e o hash do valor. As perguntas do dia a dia
+viram consultas indexadas em vez de reler todos os JSON:
+
+- o que falta em ``ja``: anti-join com o idioma de referência;
+- quem ainda usa o texto em inglês: join pelo hash do valor;
+- o que mudou desde a última versão: diff contra um snapshot nomeado.
+
+A importação é incremental: só os arquivos cujo tamanho/mtime e hash
+mudaram são relidos. A exportação reconstrói a árvore na ordem original e
+grava no formato de ``dump_locale``, byte a byte igual ao arquivo de origem
+quando ele já está nesse formato. Edições em lote podem ser feitas em SQL
+e exportadas de volta para src/locales.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+from .audit import FALLBACK_LOCALE, available_locales
+from .index import LocaleIndex, flatten
+from .locales import LOCALES_DIR, REFERENCE_LOCALE, dump_locale, locale_path, parse_locale, read_bytes, write_if_changed
+from .manifest import CACHE_DIR
+
+STORE_PATH = os.path.join(CACHE_DIR, "locales.sqlite3")
+SCHEMA_VERSION = 1
+
+# Textos ficam como TEXT para consultas diretas (LIKE, =); o resto como JSON
+STR = "str"
+JSON = "json"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    locale TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    canonical INTEGER NOT NULL,
+    imported_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    locale TEXT NOT NULL,
+    path TEXT NOT NULL,
+    pos INTEGER,
+    kind TEXT NOT NULL DEFAULT 'str',
+    value,
+    hash TEXT,
+    PRIMARY KEY (locale, path)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_hash ON entries (hash);
+CREATE INDEX IF NOT EXISTS entries_pos ON entries (locale, pos);
+CREATE TABLE IF NOT EXISTS snapshots (
+    name TEXT NOT NULL,
+    locale TEXT NOT NULL,
+    path TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (name, locale, path)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshot_info (
+    name TEXT PRIMARY KEY,
+    created TEXT NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS entries_rehash AFTER UPDATE OF kind, value ON entries
+BEGIN
+    UPDATE entries SET hash = value_hash(NEW.kind, NEW.value)
+    WHERE locale = NEW.locale AND path = NEW.path;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries
+WHEN NEW.hash IS NULL OR NEW.pos IS NULL
+BEGIN
+    UPDATE entries SET
+        hash = value_hash(NEW.kind, NEW.value),
+        pos = COALESCE(NEW.pos, (SELECT COALESCE(MAX(pos), -1) + 1 FROM entries WHERE locale = NEW.locale))
+    WHERE locale = NEW.locale AND path = NEW.path;
+END;
+"""
+
+
+def encode_value(value):
+    """(kind, column value) of a leaf"""
+    if isinstance(value, str):
+        return STR, value
+    return JSON, json.dumps(value, ensure_ascii=False)
+
+
+def decode_value(kind, value):
+    return value if kind == STR else json.loads(value)
+
+
+def value_hash(kind, value):
+    payload = value if kind == STR else "\0" + str(value)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class ImportResult:
+    imported: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    rows: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self):
+        return {
+            "imported": self.imported,
+            "unchanged": self.unchanged,
+            "removed": self.removed,
+            "rows": self.rows,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+class LocaleStore:
+    """SQLite store of the flattened locales"""
+
+    def __init__(self, path=STORE_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.create_function("value_hash", 2, value_hash, deterministic=True)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            raise ValueError(f"unsupported store schema version {version} in {path}")
+        self.db.executescript(_SCHEMA)
+        self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Importação
+
+    def import_locales(self, locales_dir=LOCALES_DIR, force=False):
+        """Re-import the locale files that changed since the last import (all with force)"""
+        started = time.perf_counter()
+        result = ImportResult()
+        known = {row[0]: row[1:] for row in self.db.execute("SELECT locale, size, mtime_ns, sha256 FROM files")}
+        locales = available_locales(locales_dir)
+        with self.db:
+            for locale_code in locales:
+                path = locale_path(locale_code, locales_dir)
+                stat = os.stat(path)
+                previous = known.get(locale_code)
+                if not force and previous and previous[:2] == (stat.st_size, stat.st_mtime_ns):
+                    result.unchanged.append(locale_code)
+                    continue
+                raw = read_bytes(path)
+                digest = hashlib.sha256(raw).hexdigest()
+                if not force and previous and previous[2] == digest:
+                    self.db.execute("UPDATE files SET mtime_ns = ? WHERE locale = ?", (stat.st_mtime_ns, locale_code))
+                    result.unchanged.append(locale_code)
+                    continue
+                result.rows += self._import_file(locale_code, path, raw, digest, stat)
+                result.imported.append(locale_code)
+            for locale_code in set(known) - set(locales):
+                self.db.execute("DELETE FROM entries WHERE locale = ?", (locale_code,))
+                self.db.execute("DELETE FROM files WHERE locale = ?", (locale_code,))
+                result.removed.append(locale_code)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def _import_file(self, locale_code, path, raw, digest, stat):
+        tree = parse_locale(raw)
+        canonical = dump_locale(tree).encode("utf-8") == raw
+        rows = []
+        for pos, (key_path, value) in enumerate(flatten(tree)):
+            kind, column = encode_value(value)
+            rows.append((locale_code, key_path, pos, kind, column, value_hash(kind, column)))
+        self.db.execute("DELETE FROM entries WHERE locale = ?", (locale_code,))
+        self.db.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self.db.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, datetime('now'))",
+            (locale_code, path, stat.st_size, stat.st_mtime_ns, digest, int(canonical)),
+        )
+        return len(rows)
+
+    # Consultas
+
+    def locales(self):
+        return [row[0] for row in self.db.execute("SELECT locale FROM files ORDER BY locale")]
+
+    def missing(self, locale_code, reference=REFERENCE_LOCALE):
+        """Paths of the reference missing from a locale, in reference order"""
+        return [row[0] for row in self.db.execute(
+            """SELECT r.path FROM entries r
+               WHERE r.locale = ? AND NOT EXISTS (
+                   SELECT 1 FROM entries e WHERE e.locale = ? AND e.path = r.path)
+               ORDER BY r.pos""",
+            (reference, locale_code),
+        )]
+
+    def same_as(self, fallback=FALLBACK_LOCALE, locale_code=None, kind=STR):
+        """(locale, path, value) of leaves identical to the fallback locale (English by default)"""
+        sql = """SELECT e.locale, e.path, e.value FROM entries e
+                 JOIN entries f ON f.locale = ? AND f.path = e.path AND f.hash = e.hash
+                 WHERE e.locale != ? AND e.kind = ?"""
+        params = [fallback, fallback, kind]
+        if locale_code:
+            sql += " AND e.locale = ?"
+            params.append(locale_code)
+        return list(self.db.execute(sql + " ORDER BY e.locale, e.pos", params))
+
+    def snapshot(self, name):
+        """Record the current hash of every leaf under a name (e.g. a release tag)"""
+        with self.db:
+            self.db.execute("DELETE FROM snapshots WHERE name = ?", (name,))
+            self.db.execute("INSERT INTO snapshots SELECT ?, locale, path, hash FROM entries", (name,))
+            self.db.execute("INSERT OR REPLACE INTO snapshot_info VALUES (?, datetime('now'))", (name,))
+        return self.db.execute("SELECT COUNT(*) FROM snapshots WHERE name = ?", (name,)).fetchone()[0]
+
+    def snapshots(self):
+        return list(self.db.execute("SELECT name, created FROM snapshot_info ORDER BY created"))
+
+    def diff(self, name, locale_code=None):
+        """(locale, path, kind) of leaves added, removed or changed since a snapshot"""
+        if not self.db.execute("SELECT 1 FROM snapshot_info WHERE name = ?", (name,)).fetchone():
+            raise ValueError(f"unknown snapshot {name!r}")
+        where = "AND e.locale = :locale" if locale_code else ""
+        where_s = "AND s.locale = :locale" if locale_code else ""
+        return list(self.db.execute(
+            f"""SELECT e.locale, e.path, CASE WHEN s.hash IS NULL THEN 'added' ELSE 'changed' END
+                FROM entries e LEFT JOIN snapshots s
+                    ON s.name = :name AND s.locale = e.locale AND s.path = e.path
+                WHERE (s.hash IS NULL OR s.hash != e.hash) {where}
+                UNION ALL
+                SELECT s.locale, s.path, 'removed' FROM snapshots s
+                WHERE s.name = :name {where_s} AND NOT EXISTS (
+                    SELECT 1 FROM entries e WHERE e.locale = s.locale AND e.path = s.path)
+                ORDER BY 1, 2""",
+            {"name": name, "locale": locale_code},
+        ))
+
+    def query(self, sql, params=()):
+        """Run raw SQL (bulk edits included); returns (column names, rows)"""
+        with self.db:
+            cursor = self.db.execute(sql, params)
+            rows = cursor.fetchall()
+        return [c[0] for c in cursor.description or ()], rows
+
+    # Exportação
+
+    def tree(self, locale_code):
+        rows = self.db.execute(
+            "SELECT path, kind, value FROM entries WHERE locale = ? ORDER BY pos, path", (locale_code,)
+        )
+        return LocaleIndex((path, decode_value(kind, value)) for path, kind, value in rows).to_tree()
+
+    def export(self, locale_code):
+        """The locale file as dump_locale bytes, rebuilt from the store"""
+        return dump_locale(self.tree(locale_code)).encode("utf-8")
+
+    def export_locales(self, out_dir, locales=None):
+        """Write every locale to out_dir, only the files whose bytes change; returns {locale: changed}"""
+        os.makedirs(out_dir, exist_ok=True)
+        return {
+            locale_code: write_if_changed(locale_path(locale_code, out_dir), self.export(locale_code))
+            for locale_code in locales or self.locales()
+        }
+
+    def check_export(self, locales_dir=LOCALES_DIR):
+        """Locales whose export differs from the file on disk"""
+        return [
+            locale_code for locale_code in self.locales()
+            if self.export(locale_code) != read_bytes(locale_path(locale_code, locales_dir))
+        ]
@@ -0,0 +1,504 @@
+"""
+Merge em streaming para arquivos de idioma muito grandes.
+
+O arquivo é lido em blocos como uma sequência de eventos (início de
+objeto, chave, valor, fim de objeto) e a saída é gravada à medida que os
+eventos passam: as subárvores do patch entram no lugar certo sem que a
+árvore do idioma seja montada em memória. O consumo fica proporcional à
+profundidade do JSON mais o tamanho do patch, não ao tamanho do arquivo.
+
+As políticas e as estatísticas são as mesmas do merge em memória
+(merge.py), e a saída tem o formato de ``dump_locale`` (indentação de 4).
+Listas são lidas inteiras, como valores.
+"""
+import json
+import os
+import re
+import tempfile
+from json.decoder import scanstring
+
+from .merge import (ADD_MISSING, ADD_SUBTREE, OVERWRITE, POLICIES, REPLACE_SUBTREE, Conflict, MergeStats,
+                    is_leaf_group)
+
+CHUNK_SIZE = 64 * 1024
+INDENT = " " * 4
+
+START_MAP = "start_map"
+KEY = "key"
+VALUE = "value"
+END_MAP = "end_map"
+
+_WHITESPACE = " \t\r\n"
+_SCALAR = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?|true|false|null")
+_DECODER = json.JSONDecoder()
+_NUMBER_START = "-0123456789"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class _Lexer:
+    """Character-level reader over a text file, refilling its buffer as needed"""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character (not consumed), '' at the end of the file"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def take(self, expected=None):
+        char = self.peek()
+        if expected is not None and char != expected:
+            raise ValueError(f"invalid JSON: expected {expected!r}, found {char or 'end of file'!r}")
+        self.pos += 1
+        return char
+
+    def _complete(self, parse):
+        """Run parse(buf, pos) -> (value, end), reading more while the token is cut off"""
+        while True:
+            try:
+                value, end = parse(self.buf, self.pos)
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except ValueError:
+                if self.eof:
+                    raise
+            if not self._fill():
+                value, self.pos = parse(self.buf, self.pos)
+                return value
+
+    def string(self):
+        self.take('"')
+        self.pos -= 1
+        return self._complete(lambda buf, pos: scanstring(buf, pos + 1))
+
+    def scalar(self):
+        """A string, number, literal or whole list"""
+        char = self.peek()
+        if char == '"':
+            return self.string()
+        if char == "[":
+            return self._complete(_DECODER.raw_decode)
+
+        def parse(buf, pos):
+            match = _SCALAR.match(buf, pos)
+            if match is None:
+                raise ValueError(f"invalid JSON value at {buf[pos:pos + 20]!r}")
+            end = match.end()
+            # Um número no fim do bloco pode continuar no próximo ("2." + "5", "1e" + "3")
+            if not self.eof and buf[pos] in _NUMBER_START and (end == len(buf) or buf[end] in _NUMBER_CHARS):
+                raise ValueError("number cut off at the end of the chunk")
+            return json.loads(match.group()), end
+        return self._complete(parse)
+
+
+def _value_events(lexer):
+    if lexer.peek() != "{":
+        yield VALUE, lexer.scalar()
+        return
+    lexer.take("{")
+    yield START_MAP, None
+    if lexer.peek() == "}":
+        lexer.take()
+    else:
+        while True:
+            key = lexer.string()
+            lexer.take(":")
+            yield KEY, key
+            yield from _value_events(lexer)
+            if lexer.take() == "}":
+                break
+            lexer.pos -= 1
+            lexer.take(",")
+    yield END_MAP, None
+
+
+def iter_events(f, chunk_size=CHUNK_SIZE):
+    """Events of a JSON document read in chunks: (kind, key or value)"""
+    lexer = _Lexer(f, chunk_size)
+    yield from _value_events(lexer)
+    if lexer.peek():
+        raise ValueError("invalid JSON: extra data after the document")
+
+
+class _Events:
+    """Event iterator with one event of lookahead"""
+
+    def __init__(self, events):
+        self.events = events
+        self.peeked = None
+
+    def next(self):
+        if self.peeked is not None:
+            event, self.peeked = self.peeked, None
+            return event
+        return next(self.events)
+
+    def peek(self):
+        if self.peeked is None:
+            self.peeked = next(self.events)
+        return self.peeked
+
+
+class Writer:
+    """Incremental writer with the exact output of json.dumps(indent=4, ensure_ascii=False)"""
+
+    def __init__(self, f):
+        self.f = f
+        self.counts = []
+
+    def _indent(self):
+        return INDENT * len(self.counts)
+
+    def key(self, key):
+        if self.counts[-1]:
+            self.f.write(",")
+        self.counts[-1] += 1
+        self.f.write("\n" + self._indent() + json.dumps(key, ensure_ascii=False) + ": ")
+
+    def begin_object(self):
+        self.f.write("{")
+        self.counts.append(0)
+
+    def end_object(self):
+        count = self.counts.pop()
+        self.f.write("\n" + self._indent() + "}" if count else "}")
+
+    def value(self, value):
+        text = json.dumps(value, ensure_ascii=False, indent=4)
+        self.f.write(text.replace("\n", "\n" + self._indent()) if self.counts else text)
+
+
+def _join(prefix, key):
+    return f"{prefix}.{key}" if prefix else key
+
+
+def _leaves(value, prefix):
+    """(path, leaf) pairs of a patch value, empty objects as leaves"""
+    if isinstance(value, dict) and value:
+        for key, item in value.items():
+            yield from _leaves(item, _join(prefix, key))
+    else:
+        yield prefix, value
+
+
+def _copy(events, writer):
+    """Copy one value from the input to the output"""
+    depth = 0
+    while True:
+        kind, data = events.next()
+        if kind == START_MAP:
+            writer.begin_object()
+            depth += 1
+        elif kind == END_MAP:
+            writer.end_object()
+            depth -= 1
+        elif kind == KEY:
+            writer.key(data)
+        else:
+            writer.value(data)
+        if depth == 0:
+            return
+
+
+def _drain(events, prefix):
+    """Consume one value, yielding its (path, leaf) pairs"""
+    kind, data = events.next()
+    if kind == VALUE:
+        yield prefix, data
+        return
+    if events.peek()[0] == END_MAP:
+        events.next()
+        yield prefix, {}
+        return
+    while True:
+        kind, key = events.next()
+        if kind == END_MAP:
+            return
+        yield from _drain(events, _join(prefix, key))
+
+
+def _read_leaf(events):
+    """The file value at this point if it is a leaf (an empty object counts), else None
+
+    Returns (is_leaf, value); for an object, its START_MAP stays consumed.
+    """
+    kind, data = events.peek()
+    if kind == VALUE:
+        events.next()
+        return True, data
+    events.next()
+    if events.peek()[0] == END_MAP:
+        events.next()
+        return True, {}
+    return False, None
+
+
+def _append_missing(patch, seen, writer, stats):
+    for key, value in patch.items():
+        if key not in seen:
+            writer.key(key)
+            writer.value(value)
+            stats.added += sum(1 for _ in _leaves(value, key))
+
+
+def _overwrite(events, writer, patch, prefix, stats, source):
+    """Members of one object under the overwrite policy (START_MAP already consumed)"""
+    seen = set()
+    while True:
+        kind, key = events.next()
+        if kind == END_MAP:
+            break
+        writer.key(key)
+        if key not in patch:
+            _copy(events, writer)
+            continue
+        seen.add(key)
+        path, value = _join(prefix, key), patch[key]
+        is_leaf, current = _read_leaf(events)
+        if not is_leaf:
+            if isinstance(value, dict) and value:
+                writer.begin_object()
+                _overwrite(events, writer, value, path, stats, source)
+                writer.end_object()
+            elif isinstance(value, dict):
+                stats.skipped += 1
+                writer.begin_object()
+                _members(events, writer)
+                writer.end_object()
+            else:
+                stats.conflicts.append(Conflict(path, "type", "<object>", value, source))
+                stats.removed += sum(1 for _ in _members_drain(events, path))
+                stats.added += 1
+                writer.value(value)
+        elif isinstance(value, dict) and value:
+            # Uma folha no caminho do patch vira o objeto do patch
+            if not (isinstance(current, dict) and not current):
+                stats.conflicts.append(Conflict(path, "type", current, "<object>", source))
+            stats.removed += 1
+            stats.added += sum(1 for _ in _leaves(value, path))
+            writer.value(value)
+        elif current == value:
+            stats.skipped += 1
+            writer.value(current)
+        else:
+            stats.overwritten += 1
+            writer.value(value)
+    _append_missing(patch, seen, writer, stats)
+
+
+def _add_missing(events, writer, patch, prefix, stats, source):
+    """Members of one object under the add-missing policy (START_MAP already consumed)"""
+    seen = set()
+    while True:
+        kind, key = events.next()
+        if kind == END_MAP:
+            break
+        writer.key(key)
+        if key not in patch:
+            _copy(events, writer)
+            continue
+        seen.add(key)
+        _add_missing_member(events, writer, _join(prefix, key), patch[key], stats, source)
+    _append_missing(patch, seen, writer, stats)
+
+
+def _add_missing_member(events, writer, path, value, stats, source):
+    """The value of one existing member under the add-missing policy (its key already written)"""
+    is_leaf, current = _read_leaf(events)
+    if not is_leaf:
+        if isinstance(value, dict) and value:
+            writer.begin_object()
+            _add_missing(events, writer, value, path, stats, source)
+            writer.end_object()
+        else:
+            stats.skipped += 1
+            if not isinstance(value, dict):
+                stats.conflicts.append(Conflict(path, "type", "<object>", value, source))
+            writer.begin_object()
+            _members(events, writer)
+            writer.end_object()
+    elif isinstance(value, dict) and value:
+        if isinstance(current, dict):
+            # Um objeto vazio dá lugar às chaves do patch
+            stats.removed += 1
+            stats.added += sum(1 for _ in _leaves(value, path))
+            writer.value(value)
+        else:
+            for _ in _leaves(value, path):
+                stats.skipped += 1
+                stats.conflicts.append(Conflict(path, "type", current, "<object>", source))
+            writer.value(current)
+    else:
+        stats.skipped += 1
+        if current != value:
+            stats.conflicts.append(Conflict(path, "value", current, value, source))
+        writer.value(current)
+
+
+def _replace_subtree(events, writer, patch, prefix, stats, source):
+    """Top-level members under the replace-subtree policy (START_MAP already consumed)"""
+    seen = set()
+    while True:
+        kind, key = events.next()
+        if kind == END_MAP:
+            break
+        writer.key(key)
+        if key not in patch:
+            _copy(events, writer)
+            continue
+        seen.add(key)
+        value = patch[key]
+        # Compara as folhas antigas com as do patch enquanto pula a subárvore
+        new = dict(_leaves(value, key))
+        kept = 0
+        for path, leaf in _drain(events, key):
+            if path not in new:
+                stats.removed += 1
+                continue
+            kept += 1
+            if new[path] != leaf:
+                stats.overwritten += 1
+            else:
+                stats.skipped += 1
+        stats.added += len(new) - kept
+        writer.value(value)
+    _append_missing(patch, seen, writer, stats)
+
+
+def _add_subtree(events, writer, patch, prefix, stats, source):
+    """Top-level members under the add-subtree policy (START_MAP already consumed)"""
+    seen = set()
+    while True:
+        kind, key = events.next()
+        if kind == END_MAP:
+            break
+        writer.key(key)
+        if key not in patch:
+            _copy(events, writer)
+            continue
+        seen.add(key)
+        value = patch[key]
+        if is_leaf_group(value) or not (isinstance(value, dict) and value):
+            # Folhas e grupos de folhas seguem o add-missing dentro do objeto existente
+            _add_missing_member(events, writer, key, value, stats, source)
+            continue
+        is_leaf, current = _read_leaf(events)
+        stats.skipped += sum(1 for _ in _leaves(value, key))
+        if is_leaf:
+            if not isinstance(current, dict):
+                stats.conflicts.append(Conflict(key, "type", current, "<object>", source))
+            writer.value(current)
+        else:
+            writer.begin_object()
+            _members(events, writer)
+            writer.end_object()
+    for key, value in patch.items():
+        if key in seen:
+            continue
+        if is_leaf_group(value):
+            stats.skipped += len(value)
+            continue
+        writer.key(key)
+        writer.value(value)
+        stats.added += sum(1 for _ in _leaves(value, key))
+
+
+def _members(events, writer):
+    """Copy the remaining members of an object whose START_MAP was consumed"""
+    while True:
+        kind, key = events.next()
+        if kind == END_MAP:
+            return
+        writer.key(key)
+        _copy(events, writer)
+
+
+def _members_drain(events, prefix):
+    while True:
+        kind, key = events.next()
+        if kind == END_MAP:
+            return
+        yield from _drain(events, _join(prefix, key))
+
+
+_POLICY_STEPS = {
+    OVERWRITE: _overwrite,
+    ADD_MISSING: _add_missing,
+    REPLACE_SUBTREE: _replace_subtree,
+    ADD_SUBTREE: _add_subtree,
+}
+
+
+def stream_merge(src, dst, patch, policy=OVERWRITE, source=None, chunk_size=CHUNK_SIZE):
+    """Merge patch into the JSON read from src while writing the result to dst
+
+    src and dst are text files; returns the MergeStats.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown merge policy {policy!r} (expected one of {', '.join(POLICIES)})")
+    events = _Events(iter_events(src, chunk_size))
+    if events.next()[0] != START_MAP:
+        raise ValueError("locale file must contain a JSON object")
+    writer = Writer(dst)
+    stats = MergeStats()
+    writer.begin_object()
+    _POLICY_STEPS[policy](events, writer, patch, "", stats, source)
+    writer.end_object()
+    try:
+        events.next()
+    except StopIteration:
+        return stats
+    raise ValueError("invalid JSON: extra data after the document")
+
+
+def stream_patches(path, patches, chunk_size=CHUNK_SIZE):
+    """Apply patches to a locale file one streaming pass each
+
+    Each pass writes a temporary file next to path; returns (temporary
+    path of the result, or None if nothing changed, MergeStats).
+    """
+    directory = os.path.dirname(path) or "."
+    stats = MergeStats()
+    current = path
+    for patch in patches:
+        fd, out = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".stream")
+        try:
+            with open(current, "r", encoding="utf-8", newline="") as src, \
+                    os.fdopen(fd, "w", encoding="utf-8", newline="") as dst:
+                stats.update(stream_merge(src, dst, patch.data, patch.policy, patch.source, chunk_size))
+                dst.flush()
+                os.fsync(dst.fileno())
+        except BaseException:
+            os.unlink(out)
+            raise
+        finally:
+            if current != path:
+                os.unlink(current)
+        current = out
+    if current == path:
+        return None, stats
+    if not (stats.added or stats.overwritten or stats.removed):
+        os.unlink(current)
+        return None, stats
+    os.chmod(current, os.stat(path).st_mode & 0o777)
+    return current, stats
@@ -0,0 +1,330 @@
+"""
+Preenchimento das chaves faltando por tradução automática.
+
+Os pares (chave, idioma) faltando saem da auditoria; o texto de origem é o
+do idioma de referência. Textos repetidos são traduzidos uma vez por
+idioma, em lotes enviados em paralelo (asyncio, com limite de concorrência
+e de requisições por segundo) para um backend plugável.
+
+Cada lote traduzido vai para o cache em disco
+(``.i18n-cache/translations.jsonl``), indexado pelo hash do texto de origem
+e pelo idioma alvo, assim que chega. Uma execução interrompida recomeça de
+onde parou, e um texto nunca é traduzido duas vezes. Traduções que perdem
+ou inventam placeholders são descartadas antes de entrar no cache (e as
+que já estiverem nele contam como ausentes), então a próxima execução pede
+o texto de novo.
+
+O backend HTTP fala um protocolo JSON simples; ``serve_stub`` sobe um
+servidor local com o mesmo protocolo para testes.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+from .audit import audit_locales
+from .engine import Patch
+from .index import LocaleIndex, load_index
+from .locales import LOCALES_DIR, REFERENCE_LOCALE, locale_path
+from .manifest import CACHE_DIR
+from .merge import ADD_MISSING
+from .validate import placeholders
+
+TRANSLATION_CACHE_PATH = os.path.join(CACHE_DIR, "translations.jsonl")
+PATCH_SOURCE = "fill-missing"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def is_valid_translation(text, translation):
+    """A translation keeps exactly the placeholders of its source text"""
+    return isinstance(translation, str) and placeholders(translation) == placeholders(text)
+
+
+class TranslationCache:
+    """Append-only JSON lines of {target, hash, source, text}; the last line for a key wins"""
+
+    def __init__(self, path=TRANSLATION_CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # linha cortada por uma execução interrompida
+                    self.entries[(entry["target"], entry["hash"])] = entry["text"]
+
+    def get(self, target, text):
+        """Cached translation of a text, None if missing or invalid (e.g. from an older run)"""
+        translation = self.entries.get((target, text_hash(text)))
+        return translation if is_valid_translation(text, translation) else None
+
+    def put_many(self, target, pairs, source_locale):
+        """Store [(source text, translation), ...] and flush them to disk"""
+        lines = []
+        for text, translation in pairs:
+            key = (target, text_hash(text))
+            self.entries[key] = translation
+            lines.append(json.dumps({"target": target, "hash": key[1], "source": source_locale,
+                                     "text": translation}, ensure_ascii=False))
+        if self.path and lines:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+
+@dataclass
+class MissingKey:
+    locale: str
+    path: str
+    text: str
+
+
+def collect_missing(locales=None, reference=REFERENCE_LOCALE, locales_dir=LOCALES_DIR):
+    """Every (locale, key) missing per the audit, with the reference text
+
+    Non-string and empty reference values are left out: there is nothing to translate.
+    """
+    report = audit_locales(locales, reference, locales_dir)
+    source = load_index(locale_path(reference, locales_dir))
+    missing = []
+    for locale_code, keys in report.missing.items():
+        for path in keys:
+            text = source.get(path)
+            if isinstance(text, str) and text.strip():
+                missing.append(MissingKey(locale_code, path, text))
+    return missing
+
+
+class HttpBackend:
+    """POST {"source", "target", "texts"} as JSON, expect {"translations": [...]} in the same order"""
+
+    name = "http"
+
+    def __init__(self, url, api_key=None, timeout=30):
+        if not url:
+            raise ValueError("the http backend needs a URL (--url or I18N_MT_URL)")
+        self.url = url
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def _post(self, payload):
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        request = urllib.request.Request(self.url, json.dumps(payload).encode("utf-8"), headers)
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    async def translate(self, texts, source, target):
+        data = await asyncio.to_thread(self._post, {"source": source, "target": target, "texts": texts})
+        translations = data.get("translations")
+        if not isinstance(translations, list) or len(translations) != len(texts):
+            raise ValueError(f"backend returned {len(translations or [])} translations for {len(texts)} texts")
+        return translations
+
+
+BACKENDS = {HttpBackend.name: HttpBackend}
+
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart (rate 0 = unlimited)"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _retry_delay(error, attempt):
+    if isinstance(error, urllib.error.HTTPError):
+        if error.code not in RETRY_STATUSES:
+            return None
+        retry_after = error.headers.get("Retry-After") if error.headers else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+    elif not isinstance(error, (urllib.error.URLError, TimeoutError, ConnectionError)):
+        return None
+    return min(30.0, 0.5 * 2 ** attempt)
+
+
+@dataclass
+class FillReport:
+    missing: int = 0
+    unique: int = 0
+    cached: int = 0
+    translated: int = 0
+    requests: int = 0
+    rejected: List[MissingKey] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    patches: List[Patch] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def to_dict(self):
+        return {
+            "missing": self.missing,
+            "unique": self.unique,
+            "cached": self.cached,
+            "translated": self.translated,
+            "requests": self.requests,
+            "rejected": [{"locale": m.locale, "path": m.path} for m in self.rejected],
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+async def translate_texts(pending, backend, cache, source_locale, report, batch_size=50, concurrency=4,
+                          rate=0, retries=4):
+    """Translate {target: [unique texts]} in batches, caching each batch as it completes
+
+    Translations whose placeholders differ from the source are not cached;
+    returns their (target, text) pairs.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate)
+    rejected = set()
+
+    async def run(target, texts):
+        async with semaphore:
+            for attempt in range(retries + 1):
+                await limiter.wait()
+                report.requests += 1
+                try:
+                    translations = await backend.translate(texts, source_locale, target)
+                    break
+                except Exception as e:
+                    delay = _retry_delay(e, attempt)
+                    if delay is None or attempt == retries:
+                        report.errors[target] = str(e)
+                        return
+                    await asyncio.sleep(delay)
+        valid = []
+        for text, translation in zip(texts, translations):
+            if is_valid_translation(text, translation):
+                valid.append((text, translation))
+            else:
+                rejected.add((target, text))
+        cache.put_many(target, valid, source_locale)
+        report.translated += len(valid)
+
+    await asyncio.gather(*(
+        run(target, texts[i:i + batch_size])
+        for target, texts in pending.items()
+        for i in range(0, len(texts), batch_size)
+    ))
+    return rejected
+
+
+def fill_missing(backend, locales=None, reference=REFERENCE_LOCALE, locales_dir=LOCALES_DIR, cache=None,
+                 batch_size=50, concurrency=4, rate=0, retries=4, dry_run=False):
+    """Translate every missing key and return the report with one add-missing patch per locale
+
+    With dry_run nothing is sent; the report only counts what would be.
+    """
+    started = time.perf_counter()
+    cache = cache if cache is not None else TranslationCache()
+    missing = collect_missing(locales, reference, locales_dir)
+    report = FillReport(missing=len(missing))
+
+    pending = {}
+    for item in missing:
+        texts = pending.setdefault(item.locale, {})
+        if item.text not in texts:
+            texts[item.text] = None
+            if cache.get(item.locale, item.text) is not None:
+                report.cached += 1
+    report.unique = sum(len(texts) for texts in pending.values())
+    to_send = {
+        target: [t for t in texts if cache.get(target, t) is None]
+        for target, texts in pending.items()
+    }
+    to_send = {target: texts for target, texts in to_send.items() if texts}
+
+    rejected = set()
+    if not dry_run and to_send:
+        rejected = asyncio.run(translate_texts(to_send, backend, cache, reference, report, batch_size,
+                                               concurrency, rate, retries))
+    if not dry_run:
+        leaves = {}
+        for item in missing:
+            translation = cache.get(item.locale, item.text)
+            if translation is None:
+                if (item.locale, item.text) in rejected:
+                    report.rejected.append(item)
+                continue
+            leaves.setdefault(item.locale, []).append((item.path, translation))
+        report.patches = [
+            Patch(PATCH_SOURCE, locale_code, LocaleIndex(items).to_tree(), ADD_MISSING)
+            for locale_code, items in leaves.items()
+        ]
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def print_fill(report, dry_run=False):
+    print(f"🔎 {report.missing} chaves faltando, {report.unique} textos únicos por idioma "
+          f"({report.cached} já no cache)")
+    if dry_run:
+        print(f"📝 Dry run: {report.unique - report.cached} textos seriam enviados ao backend")
+        return
+    print(f"🌍 {report.translated} textos traduzidos em {report.requests} requisições "
+          f"({report.seconds:.1f} s)")
+    for item in report.rejected:
+        print(f"   ⚠️  {item.locale}: {item.path} descartada (placeholders diferentes do original; será pedida de novo)")
+    for target, error in report.errors.items():
+        print(f"   ❌ {target}: {error} (o que já foi traduzido ficou no cache; rode de novo para continuar)")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Answers the http backend protocol with "[target] text", placeholders untouched"""
+
+    latency = 0.0
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8"))
+        if self.latency:
+            time.sleep(self.latency)
+        body = json.dumps({
+            "translations": [f"[{payload['target']}] {text}" for text in payload["texts"]],
+        }, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def serve_stub(port=8765, latency=0.0):
+    """Run the local stub translation server until interrupted"""
+    handler = type("StubHandler", (_StubHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
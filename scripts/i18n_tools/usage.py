@@ -0,0 +1,201 @@
+"""
+Scanner de uso das chaves de tradução no código do frontend (src/**/*.tsx).
+
+Extrai chamadas ``t('...')``, ``i18n.t('...')``, ``i18nKey`` e propriedades
+``*Key: '...'`` de cada arquivo em paralelo, guarda o resultado por arquivo
+(cache por mtime/tamanho) e cruza com o idioma de referência para achar as
+chaves que nenhum componente usa.
+"""
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List
+
+from .engine import LocaleResult, commit_staged, resolve_jobs
+from .index import LocaleIndex, ancestors, load_index
+from .locales import LOCALES_DIR, REFERENCE_LOCALE, REPO_ROOT, atomic_write, locale_path, parse_locale, read_bytes
+from .manifest import CACHE_DIR
+from .patcher import patch_index
+from .profiling import PhaseTimer
+
+SRC_DIR = os.path.join(REPO_ROOT, "src")
+USAGE_CACHE_PATH = os.path.join(CACHE_DIR, "usage-cache.json")
+SOURCE_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx")
+CACHE_VERSION = 1
+
+# t('a.b'), i18n.t("a.b") e t(`a.${x}`)
+_T_CALL = re.compile(r"""(?:\bi18n\.|(?<![\w$.]))t\(\s*(?:(['"])((?:(?!\1)[^\\\n])+)\1|`([^`]*)`)""")
+# <Trans i18nKey="a.b" /> e i18nKey={'a.b'}
+_I18N_KEY = re.compile(r"""\bi18nKey=\{?\s*(['"])([\w.\-]+)\1""")
+# titleKey: 'study.teste' (chaves guardadas em objetos de configuração)
+_KEY_PROPERTY = re.compile(r"""\b\w*Key\s*:\s*(['"])([\w\-]+(?:\.[\w\-]+)+)\1""")
+# Sufixos de plural do i18next (v3 e v4)
+PLURAL_SUFFIXES = ("plural", "zero", "one", "two", "few", "many", "other")
+_PLURAL_SUFFIX = re.compile(r"_(?:%s)$" % "|".join(PLURAL_SUFFIXES))
+
+
+def extract_usages(text):
+    """Return (literal keys, dynamic key prefixes) referenced in a source file"""
+    keys = set()
+    prefixes = set()
+    for match in _T_CALL.finditer(text):
+        if match.group(2) is not None:
+            keys.add(match.group(2))
+            continue
+        template = match.group(3)
+        static, dynamic, _ = template.partition("${")
+        if not dynamic:
+            keys.add(static)
+        elif static:
+            prefixes.add(static)
+    for regex in (_I18N_KEY, _KEY_PROPERTY):
+        keys.update(match.group(2) for match in regex.finditer(text))
+    return keys, prefixes
+
+
+def scan_file(path):
+    """Worker: extract the usages of one file"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        keys, prefixes = extract_usages(f.read())
+    return sorted(keys), sorted(prefixes)
+
+
+def source_files(src_dir=SRC_DIR):
+    for root, dirs, files in os.walk(src_dir):
+        dirs[:] = [d for d in dirs if d not in ("node_modules", "locales")]
+        for name in files:
+            if name.endswith(SOURCE_EXTENSIONS) and not name.endswith(".d.ts"):
+                yield os.path.join(root, name)
+
+
+def _load_cache(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get("files", {}) if data.get("version") == CACHE_VERSION else {}
+
+
+@dataclass
+class UsageIndex:
+    """Keys and dynamic prefixes referenced anywhere in the source tree"""
+    keys: set = field(default_factory=set)
+    prefixes: set = field(default_factory=set)
+    files: dict = field(default_factory=dict)
+    scanned: int = 0
+
+    def is_used(self, path):
+        """True if a locale key is referenced literally, via a parent object,
+        a plural form or a dynamic template prefix"""
+        base = _PLURAL_SUFFIX.sub("", path)
+        for candidate in {path, base}:
+            if candidate in self.keys or any(p in self.keys for p in ancestors(candidate)):
+                return True
+            if any(candidate.startswith(prefix) for prefix in self.prefixes):
+                return True
+        return False
+
+
+def build_usage_index(src_dir=SRC_DIR, cache_path=USAGE_CACHE_PATH, jobs=0):
+    """Scan the sources in parallel, reusing cached results of unchanged files"""
+    cache = _load_cache(cache_path) if cache_path else {}
+    entries = {}
+    pending = []
+    for path in source_files(src_dir):
+        st = os.stat(path)
+        rel = os.path.relpath(path, src_dir)
+        cached = cache.get(rel)
+        if cached and cached["mtime"] == st.st_mtime_ns and cached["size"] == st.st_size:
+            entries[rel] = cached
+        else:
+            entries[rel] = {"mtime": st.st_mtime_ns, "size": st.st_size}
+            pending.append((rel, path))
+
+    jobs = min(resolve_jobs(jobs), len(pending))
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(scan_file, [p for _, p in pending], chunksize=8))
+    else:
+        results = [scan_file(p) for _, p in pending]
+    for (rel, _), (keys, prefixes) in zip(pending, results):
+        entries[rel].update(keys=keys, prefixes=prefixes)
+
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        payload = json.dumps({"version": CACHE_VERSION, "files": entries}, ensure_ascii=False)
+        atomic_write(cache_path, payload.encode("utf-8"))
+
+    usage = UsageIndex(files=entries, scanned=len(pending))
+    for entry in entries.values():
+        usage.keys.update(entry["keys"])
+        usage.prefixes.update(entry["prefixes"])
+    return usage
+
+
+@dataclass
+class UsageReport:
+    reference: str
+    total_keys: int
+    unused: List[str]
+    undefined: List[str]
+    files: int
+    scanned: int
+
+    def to_dict(self):
+        return {
+            "reference": self.reference,
+            "totalKeys": self.total_keys,
+            "files": self.files,
+            "scannedFiles": self.scanned,
+            "unused": self.unused,
+            "undefined": self.undefined,
+        }
+
+
+def _is_defined(index, key):
+    """A key used in code exists as a leaf, an object (returnObjects) or a plural form"""
+    if key in index or index.is_object(key):
+        return True
+    return any(f"{key}_{suffix}" in index for suffix in PLURAL_SUFFIXES)
+
+
+def usage_report(usage, reference=REFERENCE_LOCALE, locales_dir=LOCALES_DIR):
+    """Compare the usage index with the reference locale"""
+    index = load_index(locale_path(reference, locales_dir))
+    unused = [path for path in index.paths if not usage.is_used(path)]
+    undefined = sorted(key for key in usage.keys if not _is_defined(index, key))
+    return UsageReport(reference, len(index), unused, undefined, len(usage.files), usage.scanned)
+
+
+def prune_unused(keys, locales, locales_dir=LOCALES_DIR, journal=None):
+    """Remove keys from every locale file as one batch; returns {locale: removed count}
+
+    Every locale is staged in memory before anything is written, and the
+    batch goes through the same all-or-nothing commit as a sync (recorded in
+    the journal, so ``journal rollback`` restores the pruned keys). Raises
+    OSError if a write fails; the files already written are restored.
+    """
+    removed = {}
+    results = []
+    for locale_code in locales:
+        file_path = locale_path(locale_code, locales_dir)
+        raw = read_bytes(file_path)
+        index = LocaleIndex.from_tree(parse_locale(raw))
+        present = [key for key in keys if key in index]
+        removed[locale_code] = len(present)
+        if not present:
+            continue
+        index.delete_many(present)
+        payload = patch_index(raw.decode("utf-8"), index).encode("utf-8")
+        if payload != raw:
+            result = LocaleResult(locale_code, file_path, original=raw, staged=payload, changed=True,
+                                  timer=PhaseTimer(locale_code))
+            result.stats.removed = len(present)
+            results.append(result)
+    if not commit_staged(results, journal):
+        error = next(r.error for r in results if r.error)
+        raise OSError(f"prune aborted, no locale was changed: {error}")
+    return removed
@@ -0,0 +1,241 @@
+"""
+Validação dos idiomas em uma única passada por idioma.
+
+Para cada folha do índice achatado, na mesma iteração:
+
+- placeholders: ``{{var}}`` e ``$t(chave)`` têm que bater com os do idioma
+  de referência (padrões compilados uma vez);
+- plurais: os grupos ``chave_one``/``chave_other``... precisam das formas
+  exigidas pelas regras CLDR de cada idioma (ru e ar têm mais formas que pt);
+- estrutura: folha onde a referência tem objeto (e vice-versa) e tipos
+  diferentes (texto vs número/lista).
+
+Os problemas de todos os idiomas saem juntos, antes de chegarem ao app.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import List
+
+from .audit import available_locales
+from .index import LocaleIndex, ancestors, load_index
+from .locales import LOCALES_DIR, REFERENCE_LOCALE, locale_path
+from .variants import load_variants
+
+ERROR = "error"
+WARNING = "warning"
+
+# {{count}}, {{- html}}, {{value, number}} e $t(outra.chave)
+_PLACEHOLDER = re.compile(r"\{\{\s*-?\s*([^\s,}]+)[^}]*\}\}")
+_NESTING = re.compile(r"\$t\(\s*([^,)\s]+)")
+# Sufixos do i18next v4 (JSON v4, Intl.PluralRules) e o legado _plural do v3
+PLURAL_CATEGORIES = ("zero", "one", "two", "few", "many", "other")
+_PLURAL_KEY = re.compile(r"^(.+)_(zero|one|two|few|many|other|plural)$")
+LEGACY_PLURAL = "plural"
+
+# Formas que Intl.PluralRules devolve para contagens inteiras em cada idioma
+# (CLDR). As formas de números compactos (ex.: "many" de 1 milhão em es/fr/it/pt)
+# ficam de fora: sem elas o i18next usa a chave base.
+PLURAL_FORMS = {
+    "ar": ("zero", "one", "two", "few", "many", "other"),
+    "de": ("one", "other"),
+    "en": ("one", "other"),
+    "es": ("one", "other"),
+    "fr": ("one", "other"),
+    "it": ("one", "other"),
+    "ja": ("other",),
+    "pt": ("one", "other"),
+    "ru": ("one", "few", "many"),
+    "zh": ("other",),
+}
+DEFAULT_PLURAL_FORMS = ("one", "other")
+
+
+def plural_forms(locale_code):
+    """CLDR plural categories an integer count can select in a locale"""
+    return PLURAL_FORMS.get(locale_code.split("-")[0], DEFAULT_PLURAL_FORMS)
+
+
+def _show(names):
+    return ", ".join(n if n.startswith("$t(") else "{{%s}}" % n for n in sorted(names))
+
+
+def placeholders(value):
+    """Interpolation variables and nested keys of a string, as one set"""
+    found = set(_PLACEHOLDER.findall(value))
+    found.update(f"$t({key})" for key in _NESTING.findall(value))
+    return found
+
+
+@dataclass
+class Issue:
+    locale: str
+    path: str
+    kind: str
+    severity: str
+    message: str
+
+    def to_dict(self):
+        return {
+            "locale": self.locale,
+            "path": self.path,
+            "kind": self.kind,
+            "severity": self.severity,
+            "message": self.message,
+        }
+
+
+@dataclass
+class ValidationReport:
+    reference: str
+    locales: List[str]
+    issues: List[Issue] = field(default_factory=list)
+
+    @property
+    def errors(self):
+        return [i for i in self.issues if i.severity == ERROR]
+
+    @property
+    def warnings(self):
+        return [i for i in self.issues if i.severity == WARNING]
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def by_locale(self):
+        grouped = {locale: [] for locale in self.locales}
+        for issue in self.issues:
+            grouped[issue.locale].append(issue)
+        return grouped
+
+    def to_dict(self):
+        return {
+            "reference": self.reference,
+            "locales": self.locales,
+            "errors": len(self.errors),
+            "warnings": len(self.warnings),
+            "issues": [i.to_dict() for i in self.issues],
+        }
+
+
+class _Reference:
+    """What the walk compares against, computed once from the reference locale"""
+
+    def __init__(self, index):
+        self.index = index
+        self.placeholders = {}
+        self.groups = {}
+        for path, value in index.items():
+            if isinstance(value, str):
+                self.placeholders[path] = placeholders(value)
+            match = _PLURAL_KEY.match(path)
+            if match:
+                self.groups.setdefault(match.group(1), set())
+        for base in self.groups:
+            # Uma forma pode omitir {{count}} ("1 tentativa"); as demais variáveis valem para o grupo
+            for path in [base] + [f"{base}_{c}" for c in PLURAL_CATEGORIES + (LEGACY_PLURAL,)]:
+                self.groups[base] |= self.placeholders.get(path, set())
+
+
+def _validate_locale(locale_code, index, ref, issues):
+    """Single walk over one locale: structure, types, placeholders and plural groups"""
+    def report(path, kind, severity, message):
+        issues.append(Issue(locale_code, path, kind, severity, message))
+
+    forms = {}
+    for path, value in index.items():
+        match = _PLURAL_KEY.match(path)
+        if match:
+            group = forms.setdefault(match.group(1), set())
+            if match.group(2) == LEGACY_PLURAL:
+                report(path, "plural", WARNING, "sufixo _plural (i18next v3) é ignorado pelo i18next v4; use _one/_other")
+            else:
+                group.add(match.group(2))
+        elif path in ref.groups:
+            forms.setdefault(path, set())
+
+        if ref.index.is_object(path):
+            report(path, "structure", ERROR, "texto onde a referência tem um objeto")
+            continue
+        leaf_parent = next((a for a in ancestors(path) if a in ref.index), None)
+        if leaf_parent is not None:
+            report(leaf_parent, "structure", ERROR, "objeto onde a referência tem um texto")
+            continue
+        if path not in ref.index:
+            continue
+
+        expected = ref.index[path]
+        if type(value) is not type(expected):
+            report(path, "type", ERROR, f"tipo {type(value).__name__}, referência é {type(expected).__name__}")
+            continue
+        if not isinstance(value, str):
+            continue
+        if not value.strip() and expected.strip():
+            report(path, "empty", WARNING, "texto vazio")
+            continue
+
+        found = placeholders(value)
+        if match and match.group(1) in ref.groups:
+            allowed = ref.groups[match.group(1)]
+            extra = found - allowed
+            missing = set()
+        else:
+            allowed = ref.placeholders[path]
+            extra, missing = found - allowed, allowed - found
+        if missing:
+            report(path, "placeholder", ERROR, f"faltando {_show(missing)}")
+        if extra:
+            report(path, "placeholder", ERROR, f"desconhecido(s) {_show(extra)}")
+
+    required = plural_forms(locale_code)
+    for base, present in forms.items():
+        missing = [c for c in required if c not in present]
+        # Sem a forma pedida o i18next usa a chave base, que só serve para uma delas
+        covered = 1 if base in index else 0
+        if len(missing) > covered:
+            note = " (a chave base cobre só uma)" if covered else ""
+            report(base, "plural", ERROR, f"formas de plural faltando: {', '.join(f'_{c}' for c in missing)}{note}")
+        # _other continua valendo para frações mesmo onde inteiros não o usam
+        unused = sorted(present - set(required) - {"other"})
+        if unused:
+            report(base, "plural", WARNING, f"formas sem uso em {locale_code}: {', '.join(f'_{c}' for c in unused)}")
+
+
+def validate(indexes, reference=REFERENCE_LOCALE):
+    """Validate every locale against the reference, one pass per locale"""
+    if reference not in indexes:
+        raise ValueError(f"reference locale {reference!r} not loaded")
+    ref = _Reference(indexes[reference])
+    report = ValidationReport(reference, list(indexes))
+    for locale_code, index in indexes.items():
+        _validate_locale(locale_code, index, ref, report.issues)
+    return report
+
+
+def validate_locales(locales=None, reference=REFERENCE_LOCALE, locales_dir=LOCALES_DIR):
+    """Load every locale into an index and validate them together
+
+    Regional variants stored as a delta are validated in expanded form.
+    """
+    stored = {c: v.expanded for c, v in load_variants(locales_dir, include_full=False).items()}
+    locales = locales or available_locales(locales_dir) + sorted(stored)
+    ordered = [reference] + [l for l in locales if l != reference]
+    indexes = {
+        l: LocaleIndex.from_tree(stored[l]) if l in stored else load_index(locale_path(l, locales_dir))
+        for l in ordered
+    }
+    return validate(indexes, reference)
+
+
+def print_validation(report):
+    print('=== VALIDAÇÃO DOS IDIOMAS ===\n')
+    for locale, issues in report.by_locale().items():
+        errors = sum(1 for i in issues if i.severity == ERROR)
+        print(f"[{locale.upper()}] {errors} erros, {len(issues) - errors} avisos")
+        if not issues:
+            print('  ✓ Válido')
+        for issue in issues:
+            icon = "✗" if issue.severity == ERROR else "!"
+            print(f"  {icon} {issue.path} [{issue.kind}] {issue.message}")
+        print('')
+    print(f"Total: {len(report.errors)} erros, {len(report.warnings)} avisos")
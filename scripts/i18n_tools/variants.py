@@ -0,0 +1,182 @@
+"""
+Variantes regionais (pt-PT, es-MX, fr-CA...) como delta sobre o idioma base.
+
+Um delta guarda só as chaves cujo texto difere do idioma base (o subtag de
+idioma: ``es-MX`` → ``es``, o mesmo fallback do i18next). Os deltas ficam em
+``src/locales/variants/<variante>.json``, fora do diretório lido pelo app e
+pelo check-i18n-keys.js, e são expandidos sob demanda: a árvore expandida
+compartilha com a base todos os objetos que o delta não toca (copy-on-write).
+
+Idiomas completos que têm base (hoje ``pt-PT``) também podem ser emitidos como
+delta, calculado na hora.
+"""
+import glob
+import json
+import os
+from dataclasses import dataclass
+
+from .artifacts import minify
+from .audit import available_locales
+from .index import flatten
+from .locales import LOCALES_DIR, dump_locale, load_locale, locale_path, write_if_changed
+
+VARIANTS_DIRNAME = "variants"
+EXPANDED = "expanded"
+DELTA = "delta"
+EMIT_MODES = (EXPANDED, DELTA)
+INDEX_NAME = "variants.json"
+
+
+def variants_dir(locales_dir=LOCALES_DIR):
+    return os.path.join(locales_dir, VARIANTS_DIRNAME)
+
+
+def variant_base(locale_code, locales):
+    """Base locale of a regional variant (its language subtag), if available"""
+    language = locale_code.split("-")[0]
+    return language if language != locale_code and language in locales else None
+
+
+def compute_delta(base, tree):
+    """Nested delta of the keys of tree whose value differs from base"""
+    delta = {}
+    for key, value in tree.items():
+        if key not in base:
+            delta[key] = value
+        elif isinstance(value, dict) and isinstance(base[key], dict) and value:
+            sub = compute_delta(base[key], value)
+            if sub:
+                delta[key] = sub
+        elif value != base[key]:
+            delta[key] = value
+    return delta
+
+
+def expand(base, delta):
+    """Overlay a delta on its base, in base key order
+
+    Objects the delta does not touch are the base objects themselves; only
+    those on the path of an override are new dicts.
+    """
+    if not delta:
+        return base
+    result = dict(base)
+    for key, value in delta.items():
+        current = result.get(key)
+        if isinstance(value, dict) and value and isinstance(current, dict):
+            result[key] = expand(current, value)
+        else:
+            result[key] = value
+    return result
+
+
+def stored_variants(locales_dir=LOCALES_DIR):
+    """Locale codes of the delta files in src/locales/variants"""
+    return sorted(
+        os.path.splitext(os.path.basename(p))[0]
+        for p in glob.glob(os.path.join(variants_dir(locales_dir), "*.json"))
+    )
+
+
+def variant_path(locale_code, locales_dir=LOCALES_DIR):
+    return os.path.join(variants_dir(locales_dir), f"{locale_code}.json")
+
+
+@dataclass
+class Variant:
+    locale: str
+    base: str
+    delta: dict
+    expanded: dict
+    stored: bool
+
+    def sizes(self):
+        """Minified bytes of the delta and of the expanded locale"""
+        return len(minify(self.delta)), len(minify(self.expanded))
+
+    def to_dict(self):
+        delta_bytes, expanded_bytes = self.sizes()
+        return {
+            "base": self.base,
+            "stored": "delta" if self.stored else "full",
+            "keys": sum(1 for _ in flatten(self.delta)),
+            "deltaBytes": delta_bytes,
+            "expandedBytes": expanded_bytes,
+        }
+
+
+def load_variants(locales_dir=LOCALES_DIR, include_full=True):
+    """Every variant: delta files expanded, and full locales with a base reduced to a delta
+
+    A full locale wins over a delta file of the same code (an extracted
+    copy would go stale on the next sync). Base trees are parsed once and
+    shared by all their variants.
+    """
+    locales = available_locales(locales_dir)
+    bases = {}
+
+    def base_tree(code):
+        if code not in bases:
+            bases[code] = load_locale(locale_path(code, locales_dir))
+        return bases[code]
+
+    variants = {}
+    for code in stored_variants(locales_dir):
+        if code in locales:
+            continue
+        base = variant_base(code, locales)
+        if base is None:
+            raise ValueError(f"variant {code!r} has no base locale in {locales_dir}")
+        delta = load_locale(variant_path(code, locales_dir))
+        variants[code] = Variant(code, base, delta, expand(base_tree(base), delta), stored=True)
+    if include_full:
+        for code in locales:
+            base = variant_base(code, locales)
+            if base is None or code in variants:
+                continue
+            tree = load_locale(locale_path(code, locales_dir))
+            variants[code] = Variant(code, base, compute_delta(base_tree(base), tree), tree, stored=False)
+    return variants
+
+
+def extract_variant(locale_code, locales_dir=LOCALES_DIR):
+    """Write the delta of a full locale to src/locales/variants; returns the Variant
+
+    The full file stays the source: sync, watch, audit, usage and store only
+    read src/locales, and load_variants ignores the delta while it exists.
+    """
+    locales = available_locales(locales_dir)
+    base = variant_base(locale_code, locales)
+    if base is None:
+        raise ValueError(f"{locale_code!r} has no base locale to diff against")
+    tree = load_locale(locale_path(locale_code, locales_dir))
+    delta = compute_delta(load_locale(locale_path(base, locales_dir)), tree)
+    os.makedirs(variants_dir(locales_dir), exist_ok=True)
+    write_if_changed(variant_path(locale_code, locales_dir), dump_locale(delta).encode("utf-8"))
+    return Variant(locale_code, base, delta, tree, stored=True)
+
+
+def variant_trees(variants, mode=EXPANDED):
+    """{locale: tree} to emit for each variant, its delta or the expanded locale"""
+    return {code: v.delta if mode == DELTA else v.expanded for code, v in variants.items()}
+
+
+def variant_sources(variants, locales_dir=LOCALES_DIR):
+    """Source file of the variants stored as a delta (there is no src/locales/<code>.json)"""
+    return {code: variant_path(code, locales_dir) for code, v in variants.items() if v.stored}
+
+
+def write_variant_index(variants, out_dir):
+    """variants.json: the base of each delta artifact"""
+    payload = json.dumps({"version": 1, "variants": {c: v.base for c, v in variants.items()}},
+                         ensure_ascii=False, indent=2).encode("utf-8")
+    os.makedirs(out_dir, exist_ok=True)
+    write_if_changed(os.path.join(out_dir, INDEX_NAME), payload)
+
+
+def print_variants(variants):
+    print(f"{'variante':<10} {'base':<6} {'fonte':<6} {'chaves':>7} {'delta':>8} {'expandido':>10}")
+    for code, v in variants.items():
+        info = v.to_dict()
+        print(f"{code:<10} {v.base:<6} {info['stored']:<6} {info['keys']:>7} "
+              f"{info['deltaBytes'] / 1024:>6.1f}KB {info['expandedBytes'] / 1024:>8.1f}KB")
@@ -0,0 +1,274 @@
+"""
+Modo watch: reaplica os patches assim que um script de patches, um arquivo
+de dados de patch (scripts/i18n_patches) ou um arquivo de idioma muda.
+
+Usa inotify (via ctypes, sem dependências) e cai para polling por mtime
+fora do Linux. Os idiomas ficam em memória (bytes + LocaleIndex) entre os
+eventos, e cada mudança reaplica só os pares script → idioma afetados.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+from .engine import LocaleResult
+from .index import LocaleIndex
+from .locales import LOCALES_DIR, locale_path, parse_locale, read_bytes, write_if_changed
+from .manifest import patch_hash
+from .merge import merge
+from .patcher import patch_index
+from .sources import SOURCES, load_source, source_paths
+
+DEBOUNCE_SECONDS = 0.03
+POLL_SECONDS = 0.05
+
+# inotify(7)
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_DELETE = 0x200
+_IN_NONBLOCK = os.O_NONBLOCK
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """Detect changes by comparing (mtime, size) of every watched file"""
+
+    def __init__(self, paths, interval=POLL_SECONDS):
+        self.paths = list(paths)
+        self.interval = interval
+        self._stats = {path: self._stat(path) for path in self.paths}
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def wait(self, timeout=None):
+        """Block until at least one file changed (or timeout); return the changed paths"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                current = self._stat(path)
+                if current != self._stats[path]:
+                    self._stats[path] = current
+                    changed.add(path)
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Watch the parent directories of the files through inotify
+
+    Directories are watched (not the files) so editors and atomic_write,
+    which replace the file by renaming a temp file over it, are seen too.
+    """
+
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.paths = {os.path.abspath(p) for p in paths}
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}
+        for directory in {os.path.dirname(p) for p in self.paths}:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_DELETE)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self._dirs[wd] = directory
+
+    def _read(self):
+        changed = set()
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buffer):
+                wd, _, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+                path = os.path.join(self._dirs.get(wd, ""), os.fsdecode(name))
+                if path in self.paths:
+                    changed.add(path)
+
+    def wait(self, timeout=None):
+        """Block until at least one watched file changed (or timeout); return the changed paths"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            changed = self._read() if ready else set()
+            if changed or not ready:
+                return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def open_watcher(paths, poll=False):
+    """inotify where available, polling otherwise (or when poll is set)"""
+    if not poll:
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths)
+
+
+class _CachedLocale:
+    __slots__ = ("raw", "index")
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.index = LocaleIndex.from_tree(parse_locale(raw))
+
+
+class WatchSession:
+    """In-memory state of the watch loop: parsed locales and the last patch of each pair
+
+    Pairs are (source, locale). When a pair changes, it is merged into the
+    cached index together with the pairs of later sources for that locale,
+    so the precedence of a full sync is kept.
+    """
+
+    def __init__(self, names=None, locales=None, locales_dir=LOCALES_DIR):
+        self.names = list(names or SOURCES)
+        self.locales = set(locales) if locales else None
+        self.locales_dir = os.path.abspath(locales_dir)
+        self.patches = {}   # (source, locale) -> Patch
+        self.hashes = {}    # (source, locale) -> patch_hash
+        self.cache = {}     # locale -> _CachedLocale
+        self.errors = {}    # source -> str
+
+    @property
+    def watched_paths(self):
+        locales = {locale for _, locale in self.patches}
+        paths = {path for name in self.names for path in source_paths(name)}
+        return sorted(paths) + [locale_path(l, self.locales_dir) for l in sorted(locales)]
+
+    def _reload(self, name):
+        """Rebuild the patches of a source; returns the pairs whose patch changed"""
+        try:
+            patches = load_source(name).build_patches(self.locales_dir, self.locales)
+        except Exception as e:
+            # Script no meio da edição: mantém os patches anteriores
+            self.errors[name] = f"{type(e).__name__}: {e}"
+            return set()
+        self.errors.pop(name, None)
+        changed = set()
+        seen = set()
+        for patch in patches:
+            pair = (name, patch.locale)
+            seen.add(pair)
+            digest = patch_hash(patch)
+            if self.hashes.get(pair) != digest:
+                self.patches[pair] = patch
+                self.hashes[pair] = digest
+                changed.add(pair)
+        for pair in [p for p in self.patches if p[0] == name and p not in seen]:
+            del self.patches[pair]
+            del self.hashes[pair]
+        return changed
+
+    def _locale(self, locale_code, reload=False):
+        cached = self.cache.get(locale_code)
+        if cached is None or reload:
+            cached = self.cache[locale_code] = _CachedLocale(read_bytes(locale_path(locale_code, self.locales_dir)))
+        return cached
+
+    def _apply(self, locale_code, start):
+        """Merge the pairs of a locale from source position ``start`` on and write once"""
+        file_path = locale_path(locale_code, self.locales_dir)
+        pairs = [(n, locale_code) for n in self.names[start:] if (n, locale_code) in self.patches]
+        result = LocaleResult(locale_code, file_path, [n for n, _ in pairs])
+        try:
+            cached = self._locale(locale_code)
+            for pair in pairs:
+                patch = self.patches[pair]
+                result.stats.update(merge(cached.index, patch.data, patch.policy, patch.source))
+            if cached.index.changed:
+                text = patch_index(cached.raw.decode("utf-8"), cached.index)
+                payload = text.encode("utf-8")
+                result.changed = write_if_changed(file_path, payload, current=cached.raw)
+                cached.raw = payload
+                cached.index.changed.clear()
+        except Exception as e:
+            # Estado em memória pode ter ficado pela metade: relê do disco no próximo evento
+            self.cache.pop(locale_code, None)
+            result.error = str(e)
+        return result
+
+    def start(self):
+        """Load every source and locale and bring the files up to date"""
+        for name in self.names:
+            self._reload(name)
+        return self._run({pair for pair in self.patches}, set())
+
+    def handle(self, paths):
+        """Process a batch of changed files; returns the LocaleResult of each touched locale"""
+        sources = [name for name in self.names if any(p in paths for p in source_paths(name))]
+        edited = set()
+        for locale_code in {l for _, l in self.patches}:
+            file_path = locale_path(locale_code, self.locales_dir)
+            if file_path in paths and os.path.exists(file_path):
+                cached = self.cache.get(locale_code)
+                if cached is None or read_bytes(file_path) != cached.raw:
+                    edited.add(locale_code)
+        if edited:
+            # Scripts podem ler outros idiomas (ex.: fallback em inglês de add_translations)
+            sources = self.names
+        changed = set()
+        for name in sources:
+            changed |= self._reload(name)
+        return self._run(changed, edited)
+
+    def _run(self, changed, edited):
+        results = []
+        for locale_code in sorted({l for _, l in changed} | edited):
+            if locale_code in edited:
+                self._locale(locale_code, reload=True)
+                start = 0
+            else:
+                start = min(self.names.index(n) for n, l in changed if l == locale_code)
+            results.append(self._apply(locale_code, start))
+        return results
+
+
+def watch(session, on_results, poll=False, debounce=DEBOUNCE_SECONDS):
+    """Run the watch loop until interrupted
+
+    Events arriving within ``debounce`` seconds of each other are processed
+    as one batch. on_results receives (results, errors, seconds) after the
+    initial sync and after each batch; seconds runs from the first event.
+    Our own writes also raise events, but the bytes match the cache and
+    are ignored.
+    """
+    on_results(session.start(), dict(session.errors), 0.0)
+    watcher = open_watcher(session.watched_paths, poll)
+    try:
+        while True:
+            paths = watcher.wait()
+            started = time.perf_counter()
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                paths |= more
+            results = session.handle(paths)
+            if results or session.errors:
+                on_results(results, dict(session.errors), time.perf_counter() - started)
+    finally:
+        watcher.close()
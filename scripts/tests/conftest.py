@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from i18n_tools.locales import dump_locale  # noqa: E402
+
+
+class LocaleDir:
+    """A throwaway src/locales: write trees in the canonical format and read them back"""
+
+    def __init__(self, root):
+        root.mkdir(exist_ok=True)
+        self.root = root
+        self.dir = str(root)
+
+    def path(self, code):
+        return str(self.root / f"{code}.json")
+
+    def write(self, trees):
+        """Write {code: tree} (overwriting); returns the directory"""
+        for code, tree in trees.items():
+            (self.root / f"{code}.json").write_text(dump_locale(tree), encoding="utf-8")
+        return self.dir
+
+    def read(self, code):
+        return (self.root / f"{code}.json").read_text(encoding="utf-8")
+
+
+@pytest.fixture
+def locales(tmp_path):
+    return LocaleDir(tmp_path / "locales")
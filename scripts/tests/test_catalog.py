@@ -0,0 +1,73 @@
+from i18n_tools.catalog import Catalog, Catalogs, catalog_path, compile_locales, compile_tree
+from i18n_tools.index import flatten
+
+TREE = {"common": {"save": "Guardar", "count": "{{count}} itens"}, "sizes": [1, 2], "empty": {}, "n": 3}
+
+
+def _compiled(locales, tmp_path, trees):
+    locales_dir = locales.write(trees)
+    out_dir = str(tmp_path / "catalogs")
+    compile_locales(list(trees), out_dir, locales_dir)
+    return out_dir
+
+
+def test_catalog_round_trips_every_leaf(tmp_path):
+    path = tmp_path / "pt.cat"
+    path.write_bytes(compile_tree("pt", TREE))
+    with Catalog(str(path)) as catalog:
+        assert catalog.locale == "pt"
+        assert list(catalog.items()) == list(flatten(TREE))
+        assert catalog["sizes"] == [1, 2] and catalog["empty"] == {} and catalog["n"] == 3
+        assert catalog.get("common.missing") is None and "common" not in catalog
+
+
+def test_string_and_json_values_keep_their_kind(tmp_path):
+    path = tmp_path / "pt.cat"
+    path.write_bytes(compile_tree("pt", {"a": "[1]", "b": [1]}))
+    with Catalog(str(path)) as catalog:
+        assert catalog["a"] == "[1]" and catalog["b"] == [1]
+
+
+def test_fallback_skips_locales_without_catalog(locales, tmp_path):
+    out_dir = _compiled(locales, tmp_path, {
+        "en": {"common": {"save": "Save", "cancel": "Cancel"}},
+        "es": {"common": {"save": "Guardar"}},
+    })
+    with Catalogs(out_dir) as catalogs:
+        assert catalogs.get("es-MX", "common.save") == "Guardar"
+        assert catalogs.get("es-MX", "common.cancel") == "Cancel"
+        assert catalogs.get("xx", "common.save") == "Save"
+        assert catalogs.get("xx", "common.missing", "?") == "?"
+
+
+def test_check_reports_stale_catalogs_without_writing(locales, tmp_path):
+    out_dir = _compiled(locales, tmp_path, {"es": {"common": {"save": "Guardar"}}})
+    locales_dir = locales.dir
+    assert [c.changed for c in compile_locales(["es"], out_dir, locales_dir, check=True)] == [False]
+
+    locales.write({"es": {"common": {"save": "Salvar"}}})
+    before = open(catalog_path("es", out_dir), "rb").read()
+    assert [c.changed for c in compile_locales(["es"], out_dir, locales_dir, check=True)] == [True]
+    assert open(catalog_path("es", out_dir), "rb").read() == before
+
+
+def test_lookup_checks_every_segment(tmp_path):
+    path = tmp_path / "pt.cat"
+    tree = {"a": {"a": "inner", "b": {"a": "deep"}}, "b": {"a": "other"}, "x": "leaf"}
+    path.write_bytes(compile_tree("pt", tree))
+    with Catalog(str(path)) as catalog:
+        assert catalog["a.a"] == "inner" and catalog["a.b.a"] == "deep" and catalog["b.a"] == "other"
+        for missing in ("a", "a.b", "a.a.a", "b.a.a", "x.a", "a.x", "", "a..a"):
+            assert missing not in catalog
+        assert list(catalog) == ["a.a", "a.b.a", "b.a", "x"]
+
+
+def test_large_catalogs_switch_to_32_bit_fields(tmp_path):
+    tree = {f"group{g}": {f"key{k}": f"text {g}/{k}" for k in range(300)} for g in range(250)}
+    path = tmp_path / "pt.cat"
+    payload = compile_tree("pt", tree)
+    path.write_bytes(payload)
+    with Catalog(str(path)) as catalog:
+        assert catalog._width == 4 and len(catalog) == 75000
+        assert catalog["group249.key299"] == "text 249/299"
+        assert list(catalog.items()) == list(flatten(tree))
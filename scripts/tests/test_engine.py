@@ -0,0 +1,49 @@
+import json
+
+from i18n_tools import Patch, apply_patches, engine
+from i18n_tools.locales import read_bytes
+
+TREES = {"de": {"common": {"save": "Speichern"}}, "es": {"common": {"save": "Guardar"}},
+         "fr": {"common": {"save": "Enregistrer"}}}
+
+
+def _patches(codes=("de", "es", "fr")):
+    return [Patch("sync_i18n", code, {"common": {"cancel": f"cancel-{code}"}}) for code in codes]
+
+
+def test_batch_writes_every_locale(locales):
+    locales_dir = locales.write(TREES)
+    results = apply_patches(_patches(), locales_dir)
+    assert all(r.ok and r.changed for r in results)
+    assert json.loads(locales.read("es"))["common"] == {"save": "Guardar", "cancel": "cancel-es"}
+
+
+def test_failed_locale_aborts_the_whole_batch(locales):
+    locales_dir = locales.write(TREES)
+    with open(locales.path("es"), "w", encoding="utf-8") as f:
+        f.write('{"common": ')
+    before = {code: read_bytes(locales.path(code)) for code in TREES}
+    results = {r.locale: r for r in apply_patches(_patches(), locales_dir)}
+    assert results["es"].error
+    assert results["de"].aborted and results["fr"].aborted
+    assert not any(r.changed for r in results.values())
+    assert {code: read_bytes(locales.path(code)) for code in TREES} == before
+
+
+def test_failed_write_restores_the_files_already_written(locales, monkeypatch):
+    locales_dir = locales.write(TREES)
+    before = {code: read_bytes(locales.path(code)) for code in TREES}
+    write = engine._write
+
+    def failing_write(result):
+        if result.locale == "fr":
+            raise OSError("disk full")
+        write(result)
+
+    monkeypatch.setattr(engine, "_write", failing_write)
+    results = {r.locale: r for r in apply_patches(_patches(), locales_dir)}
+    assert results["fr"].error == "disk full"
+    assert results["de"].aborted and results["es"].aborted
+    assert not any(r.changed for r in results.values())
+    # de e es já tinham sido gravados e voltaram ao conteúdo anterior
+    assert {code: read_bytes(locales.path(code)) for code in TREES} == before
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from i18n_tools import Patch, apply_patches, engine
+from i18n_tools.journal import COMMITTED, ROLLED_BACK, Journal
+from i18n_tools.locales import read_bytes
+
+TREES = {"es": {"common": {"save": "Guardar"}}, "fr": {"common": {"save": "Enregistrer"}}}
+PATCHES = [Patch("sync_i18n", "es", {"common": {"cancel": "Cancelar"}}),
+           Patch("sync_i18n", "fr", {"common": {"cancel": "Annuler"}})]
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return Journal(str(tmp_path / "journal"))
+
+
+def _snapshot(locales):
+    return {code: read_bytes(locales.path(code)) for code in TREES}
+
+
+def test_batch_is_recorded_and_rolled_back(locales, journal):
+    locales_dir = locales.write(TREES)
+    before = _snapshot(locales)
+    apply_patches(PATCHES, locales_dir, journal=journal)
+    batch_id = journal.latest()
+    assert batch_id == journal.last_batch
+    assert journal.load(batch_id)["status"] == COMMITTED
+
+    assert journal.rollback(batch_id) == {"es": "restored", "fr": "restored"}
+    assert _snapshot(locales) == before
+    assert journal.load(batch_id)["status"] == ROLLED_BACK
+    with pytest.raises(ValueError, match="already rolled back"):
+        journal.rollback(batch_id)
+
+
+def test_rollback_leaves_files_edited_after_the_batch(locales, journal):
+    locales_dir = locales.write(TREES)
+    apply_patches(PATCHES, locales_dir, journal=journal)
+    batch_id = journal.latest()
+    edited = json.loads(locales.read("fr"))
+    edited["common"]["save"] = "Sauvegarder"
+    locales.write({"fr": edited})
+
+    assert journal.rollback(batch_id) == {"es": "restored", "fr": "conflict"}
+    assert json.loads(locales.read("fr")) == edited
+    # Com conflito o lote continua desfazível; es já voltou e fica "unchanged"
+    assert journal.load(batch_id)["status"] == COMMITTED
+    assert journal.rollback(batch_id, force=True) == {"es": "unchanged", "fr": "restored"}
+    assert json.loads(locales.read("fr")) == TREES["fr"]
+
+
+def test_replay_reapplies_the_recorded_patches(locales, journal):
+    locales_dir = locales.write(TREES)
+    apply_patches(PATCHES, locales_dir, journal=journal)
+    applied = _snapshot(locales)
+    batch_id = journal.latest()
+    journal.rollback(batch_id)
+
+    patches = journal.patches(batch_id)
+    assert patches == PATCHES
+    apply_patches(patches, locales_dir, journal=journal)
+    assert _snapshot(locales) == applied
+    assert journal.latest() != batch_id
+
+
+def test_failed_write_marks_the_batch_rolled_back(locales, journal, monkeypatch):
+    locales_dir = locales.write(TREES)
+
+    def failing_write(result):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(engine, "_write", failing_write)
+    apply_patches(PATCHES, locales_dir, journal=journal)
+    assert journal.load(journal.last_batch)["status"] == ROLLED_BACK
+    assert journal.latest() is None
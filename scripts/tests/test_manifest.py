@@ -0,0 +1,37 @@
+from i18n_tools import ADD_MISSING, Manifest, Patch, apply_patches
+
+SAVE = {"common": {"save": "Save"}}
+
+
+def _skipped(locales_dir, manifest_path, patches):
+    manifest = Manifest.load(manifest_path)
+    return [r.skipped for r in apply_patches(patches, locales_dir, manifest=manifest)]
+
+
+def test_alternating_patch_sets_stay_fresh(locales, tmp_path):
+    locales_dir = locales.write({"es": SAVE, "fr": SAVE})
+    manifest_path = str(tmp_path / "manifest.json")
+    first = [Patch("sync_i18n", code, {"a": {"one": code}}, ADD_MISSING) for code in ("es", "fr")]
+    second = [Patch("sync_i18n_projects", code, {"b": {"two": code}}, ADD_MISSING) for code in ("es", "fr")]
+
+    assert _skipped(locales_dir, manifest_path, first) == [False, False]
+    assert _skipped(locales_dir, manifest_path, second) == [False, False]
+    # second mudou os arquivos depois de first: first é verificado uma vez (sem mudanças)
+    assert _skipped(locales_dir, manifest_path, first) == [False, False]
+    # A partir daí os dois conjuntos constam para o conteúdo atual e nada é reprocessado
+    for _ in range(3):
+        assert _skipped(locales_dir, manifest_path, first) == [True, True]
+        assert _skipped(locales_dir, manifest_path, second) == [True, True]
+
+
+def test_file_edit_invalidates_every_patch_set(locales, tmp_path):
+    locales_dir = locales.write({"es": SAVE})
+    manifest_path = str(tmp_path / "manifest.json")
+    first = [Patch("sync_i18n", "es", {"a": {"one": "uno"}}, ADD_MISSING)]
+    second = [Patch("sync_i18n_projects", "es", {"b": {"two": "dos"}}, ADD_MISSING)]
+    _skipped(locales_dir, manifest_path, first)
+    _skipped(locales_dir, manifest_path, second)
+
+    locales.write({"es": {"common": {"save": "Guardar"}}})
+    assert _skipped(locales_dir, manifest_path, first) == [False]
+    assert _skipped(locales_dir, manifest_path, second) == [False]
@@ -0,0 +1,107 @@
+import io
+import json
+
+import pytest
+
+from i18n_tools.index import LocaleIndex
+from i18n_tools.locales import dump_locale
+from i18n_tools.merge import ADD_MISSING, ADD_SUBTREE, OVERWRITE, POLICIES, REPLACE_SUBTREE, merge
+from i18n_tools.stream import stream_merge
+
+BASE = {"common": {"save": "Salvar", "cancel": "Cancelar"}, "nav": {"home": "Início"}, "title": "App"}
+
+
+def _merge(patch, policy, base=BASE):
+    index = LocaleIndex.from_tree(base)
+    stats = merge(index, patch, policy, "test")
+    return index.to_tree(), stats.to_dict(), stats.conflicts
+
+
+def test_overwrite_sets_leaves_and_counts_them():
+    tree, stats, conflicts = _merge({"common": {"save": "Gravar", "cancel": "Cancelar", "new": "Novo"}}, OVERWRITE)
+    assert tree["common"] == {"save": "Gravar", "cancel": "Cancelar", "new": "Novo"}
+    assert tree["nav"] == BASE["nav"]
+    assert stats == {"added": 1, "overwritten": 1, "skipped": 1, "removed": 0, "conflicts": 0}
+    assert conflicts == []
+
+
+def test_overwrite_type_conflicts_replace_in_place():
+    tree, stats, conflicts = _merge({"title": {"main": "App"}, "nav": "flat"}, OVERWRITE)
+    assert list(tree) == ["common", "nav", "title"]
+    assert tree["title"] == {"main": "App"} and tree["nav"] == "flat"
+    assert stats["added"] == 2 and stats["removed"] == 2
+    assert sorted(c.path for c in conflicts) == ["nav", "title"]
+    assert all(c.kind == "type" and c.source == "test" for c in conflicts)
+
+
+def test_add_missing_keeps_existing_values():
+    tree, stats, conflicts = _merge({"common": {"save": "Gravar", "delete": "Excluir"}, "title": {"x": "y"}},
+                                    ADD_MISSING)
+    assert tree["common"] == {"save": "Salvar", "cancel": "Cancelar", "delete": "Excluir"}
+    assert tree["title"] == "App"
+    assert stats == {"added": 1, "overwritten": 0, "skipped": 2, "removed": 0, "conflicts": 2}
+    assert [(c.path, c.kind) for c in conflicts] == [("common.save", "value"), ("title", "type")]
+
+
+def test_add_missing_fills_an_empty_object():
+    tree, stats, _ = _merge({"empty": {"a": "b"}}, ADD_MISSING, {"empty": {}})
+    assert tree == {"empty": {"a": "b"}}
+    assert stats["added"] == 1 and stats["removed"] == 1
+
+
+def test_replace_subtree_swaps_top_level_keys():
+    tree, stats, _ = _merge({"common": {"save": "Gravar", "ok": "OK"}}, REPLACE_SUBTREE)
+    assert list(tree) == ["common", "nav", "title"]
+    assert tree["common"] == {"save": "Gravar", "ok": "OK"}
+    assert stats == {"added": 1, "overwritten": 1, "skipped": 0, "removed": 1, "conflicts": 0}
+
+
+BUG_REPORTS = {"bugReports": {"title": "Bugs", "status": {"open": "Aberto"}}, "navbar": {"bugReports": "Bugs"}}
+
+
+def test_add_subtree_adds_absent_subtrees_whole():
+    tree, stats, conflicts = _merge(BUG_REPORTS, ADD_SUBTREE, {"navbar": {"home": "Início"}})
+    assert tree == {"navbar": {"home": "Início", "bugReports": "Bugs"},
+                    "bugReports": {"title": "Bugs", "status": {"open": "Aberto"}}}
+    assert stats == {"added": 3, "overwritten": 0, "skipped": 0, "removed": 0, "conflicts": 0}
+    assert conflicts == []
+
+
+def test_add_subtree_leaves_an_existing_subtree_alone():
+    base = {"navbar": {"home": "Início"}, "bugReports": {"title": "Reportes"}}
+    tree, stats, conflicts = _merge(BUG_REPORTS, ADD_SUBTREE, base)
+    # Ao contrário do add-missing, bugReports.status não é completado
+    assert tree["bugReports"] == {"title": "Reportes"}
+    assert stats["added"] == 1 and stats["skipped"] == 2
+    assert conflicts == []
+
+
+def test_add_subtree_never_creates_the_parent_of_a_leaf_group():
+    tree, stats, _ = _merge(BUG_REPORTS, ADD_SUBTREE, {"title": "App"})
+    assert "navbar" not in tree
+    assert list(tree) == ["title", "bugReports"]
+    assert stats["added"] == 2 and stats["skipped"] == 1
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+@pytest.mark.parametrize("base", [BASE, {"navbar": {"home": "Início"}, "bugReports": "x"}, {"navbar": {}}])
+def test_stream_merge_matches_the_index_merge(policy, base):
+    patch = {**BUG_REPORTS, "common": {"save": "Gravar", "extra": {"a": "b"}}, "title": "Novo"}
+    tree, stats, conflicts = _merge(patch, policy, base)
+    out = io.StringIO()
+    streamed = stream_merge(io.StringIO(dump_locale(base)), out, patch, policy, "test")
+    assert json.loads(out.getvalue()) == tree
+    assert streamed.to_dict() == stats
+
+
+def test_identical_patch_changes_nothing():
+    for policy in POLICIES:
+        index = LocaleIndex.from_tree(BASE)
+        stats = merge(index, BASE, policy)
+        assert index.to_tree() == BASE
+        assert stats.added == stats.overwritten == stats.removed == 0
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError, match="unknown merge policy"):
+        merge(LocaleIndex.from_tree(BASE), {}, "deep-merge")
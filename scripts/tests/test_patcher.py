@@ -0,0 +1,43 @@
+import json
+import random
+
+import pytest
+
+from i18n_tools.index import LocaleIndex
+from i18n_tools.locales import dump_locale
+from i18n_tools.merge import POLICIES, merge
+from i18n_tools.patcher import patch_index, patch_text
+
+KEYS = ["title", "save", "list", "empty", "nav", "form", "error"]
+
+
+def _tree(rng, depth):
+    tree = {}
+    for key in rng.sample(KEYS, rng.randint(1, 5)):
+        roll = rng.random()
+        if depth and roll < 0.4:
+            tree[key] = _tree(rng, depth - 1)
+        elif roll < 0.5:
+            tree[key] = rng.choice([[1, "a"], 2.5, None, True, {}])
+        else:
+            tree[key] = rng.choice(["Salvar", "Título", "{{count}} itens", 'aspas "x"'])
+    return tree
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_span_output_equals_full_dump(seed):
+    rng = random.Random(seed)
+    text = dump_locale(_tree(rng, 3))
+    index = LocaleIndex.from_tree(json.loads(text))
+    for _ in range(rng.randint(1, 3)):
+        merge(index, _tree(rng, 2), rng.choice(POLICIES))
+    expected = dump_locale(index.to_tree())
+    assert patch_text(text, index.to_tree(), index.changed) == expected
+    assert patch_index(text, index) == expected
+
+
+def test_untouched_bytes_are_kept():
+    text = '{\n  "a": {"x": 1,   "y": "keep"},\n  "b": "old"\n}'
+    index = LocaleIndex.from_tree({"a": {"x": 1, "y": "keep"}, "b": "old"})
+    merge(index, {"b": "new"})
+    assert patch_index(text, index) == '{\n  "a": {"x": 1,   "y": "keep"},\n  "b": "new"\n}'
@@ -0,0 +1,50 @@
+import io
+import json
+
+import pytest
+
+from i18n_tools.stream import END_MAP, KEY, START_MAP, VALUE, iter_events
+
+NUMBERS = [0, 2.5, -2.5, 10, 123456, 1e3, 1.5e-7, -0.0, 2.0, 31415.9265]
+
+
+def _rebuild(events):
+    """Nested object from an event stream (the inverse of iter_events)"""
+    stack, key, root = [], None, None
+    for kind, data in events:
+        if kind == START_MAP:
+            obj = {}
+            if stack:
+                stack[-1][key] = obj
+            else:
+                root = obj
+            stack.append(obj)
+        elif kind == END_MAP:
+            stack.pop()
+        elif kind == KEY:
+            key = data
+        elif kind == VALUE:
+            if not stack:
+                return data
+            stack[-1][key] = data
+    return root
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7])
+@pytest.mark.parametrize("indent", [None, 4])
+def test_numbers_split_across_chunks(chunk_size, indent):
+    doc = {"n": {f"k{i}": value for i, value in enumerate(NUMBERS)}, "list": NUMBERS, "last": 2.5}
+    text = json.dumps(doc, indent=indent, separators=None if indent else (",", ":"))
+    assert _rebuild(iter_events(io.StringIO(text), chunk_size)) == doc
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7])
+@pytest.mark.parametrize("text", ["2.5", "-1e10", "true", '"Ol\\u00e1 {{count}}"'])
+def test_top_level_scalar_at_end_of_file(chunk_size, text):
+    assert _rebuild(iter_events(io.StringIO(text), chunk_size)) == json.loads(text)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7])
+def test_invalid_number_is_rejected(chunk_size):
+    with pytest.raises(ValueError):
+        list(iter_events(io.StringIO('{"a": 2.}'), chunk_size))
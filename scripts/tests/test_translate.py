@@ -0,0 +1,45 @@
+from i18n_tools.translate import TranslationCache, fill_missing
+
+
+class FlakyBackend:
+    """Drops the placeholders on the first request, translates correctly afterwards"""
+
+    name = "flaky"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def translate(self, texts, source, target):
+        self.calls += 1
+        if self.calls == 1:
+            return ["artículos" for _ in texts]
+        return [text.replace("itens", "artículos") for text in texts]
+
+
+TREES = {
+    "pt": {"cart": {"count": "{{count}} itens"}},
+    "en": {"cart": {"count": "{{count}} items"}},
+    "es": {"cart": {}},
+}
+
+
+def test_rejected_translation_is_requested_again(locales, tmp_path):
+    locales_dir = locales.write(TREES)
+    cache_path = str(tmp_path / "translations.jsonl")
+    backend = FlakyBackend()
+
+    first = fill_missing(backend, ["es"], locales_dir=locales_dir, cache=TranslationCache(cache_path))
+    assert [(m.locale, m.path) for m in first.rejected] == [("es", "cart.count")]
+    assert first.patches == []
+
+    second = fill_missing(backend, ["es"], locales_dir=locales_dir, cache=TranslationCache(cache_path))
+    assert backend.calls == 2
+    assert second.rejected == []
+    assert [p.data for p in second.patches] == [{"cart": {"count": "{{count}} artículos"}}]
+
+
+def test_invalid_cached_translation_counts_as_missing(tmp_path):
+    cache = TranslationCache(str(tmp_path / "translations.jsonl"))
+    cache.put_many("es", [("{{count}} itens", "artículos")], "pt")
+    assert cache.get("es", "{{count}} itens") is None
+    assert TranslationCache(cache.path).get("es", "{{count}} itens") is None
@@ -0,0 +1,36 @@
+import pytest
+
+from i18n_tools import engine
+from i18n_tools.journal import Journal
+from i18n_tools.locales import dump_locale
+from i18n_tools.usage import prune_unused
+
+TREE = {"common": {"save": "Save", "old": "Old"}, "legacy": {"title": "Legacy"}}
+
+
+def test_prune_is_journaled_and_rolls_back(locales, tmp_path):
+    locales_dir = locales.write({"es": TREE, "fr": TREE})
+    journal = Journal(str(tmp_path / "journal"))
+    removed = prune_unused(["common.old", "legacy.title"], ["es", "fr"], locales_dir, journal)
+    assert removed == {"es": 2, "fr": 2}
+    assert "old" not in locales.read("es")
+
+    outcome = journal.rollback(journal.last_batch)
+    assert outcome == {"es": "restored", "fr": "restored"}
+    assert locales.read("es") == dump_locale(TREE)
+
+
+def test_failed_write_leaves_every_locale_untouched(locales, monkeypatch):
+    locales_dir = locales.write({"es": TREE, "fr": TREE})
+    real_write = engine.atomic_write
+
+    def failing_write(path, payload):
+        if path.endswith("fr.json") and payload != dump_locale(TREE).encode("utf-8"):
+            raise OSError("disk full")
+        real_write(path, payload)
+
+    monkeypatch.setattr(engine, "atomic_write", failing_write)
+    with pytest.raises(OSError):
+        prune_unused(["common.old"], ["es", "fr"], locales_dir)
+    for code in ("es", "fr"):
+        assert locales.read(code) == dump_locale(TREE)
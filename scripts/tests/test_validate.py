@@ -0,0 +1,57 @@
+import pytest
+
+from i18n_tools.index import LocaleIndex
+from i18n_tools.validate import ERROR, WARNING, plural_forms, validate
+
+REFERENCE = {"items_one": "{{count}} item", "items_other": "{{count}} itens", "title": "Título"}
+
+
+def _plural_issues(locale_code, tree):
+    indexes = {"pt": LocaleIndex.from_tree(REFERENCE), locale_code: LocaleIndex.from_tree(tree)}
+    report = validate(indexes)
+    return [(i.path, i.severity, i.message) for i in report.by_locale()[locale_code] if i.kind == "plural"]
+
+
+@pytest.mark.parametrize("locale_code, forms", [
+    ("ru", ("one", "few", "many")),
+    ("ar", ("zero", "one", "two", "few", "many", "other")),
+    ("ja", ("other",)),
+    ("pt-PT", ("one", "other")),
+    ("xx", ("one", "other")),
+])
+def test_plural_forms(locale_code, forms):
+    assert plural_forms(locale_code) == forms
+
+
+@pytest.mark.parametrize("locale_code", ["ru", "ar", "ja"])
+def test_complete_plural_groups_pass(locale_code):
+    tree = {f"items_{c}": "{{count}}" for c in plural_forms(locale_code)}
+    tree["title"] = "x"
+    assert _plural_issues(locale_code, tree) == []
+
+
+def test_ru_needs_few_and_many():
+    issues = _plural_issues("ru", {"items_one": "{{count}} предмет", "items_other": "{{count}} предметов"})
+    assert issues == [("items", ERROR, "formas de plural faltando: _few, _many")]
+
+
+def test_base_key_covers_one_missing_form():
+    forms = {"items": "{{count}} предметов", "items_one": "{{count}} предмет", "items_few": "{{count}} предмета"}
+    assert _plural_issues("ru", forms) == []
+    issues = _plural_issues("ru", {"items": "{{count}} предметов", "items_one": "{{count}} предмет"})
+    assert issues == [("items", ERROR, "formas de plural faltando: _few, _many (a chave base cobre só uma)")]
+
+
+def test_ar_needs_all_six_forms():
+    issues = _plural_issues("ar", {"items_one": "عنصر", "items_other": "{{count}} عناصر"})
+    assert issues == [("items", ERROR, "formas de plural faltando: _zero, _two, _few, _many")]
+
+
+def test_ja_has_no_singular():
+    issues = _plural_issues("ja", {"items_one": "{{count}} 件", "items_other": "{{count}} 件"})
+    assert issues == [("items", WARNING, "formas sem uso em ja: _one")]
+
+
+def test_legacy_plural_suffix_is_reported():
+    issues = _plural_issues("ja", {"items_other": "{{count}} 件", "items_plural": "{{count}} 件"})
+    assert [(path, severity) for path, severity, _ in issues] == [("items_plural", WARNING)]
@@ -0,0 +1,48 @@
+import json
+
+from i18n_tools.variants import compute_delta, expand, extract_variant, load_variants, variant_path
+
+PT = {"common": {"save": "Salvar", "cancel": "Cancelar"}, "nav": {"home": "Início", "help": "Ajuda"},
+      "empty": {}, "title": "App"}
+PT_PT = {"common": {"save": "Guardar", "cancel": "Cancelar"}, "nav": {"home": "Início", "help": "Ajuda"},
+         "empty": {}, "title": "App", "extra": {"only": "pt-PT"}}
+
+
+def test_expand_inverts_compute_delta():
+    delta = compute_delta(PT, PT_PT)
+    assert delta == {"common": {"save": "Guardar"}, "extra": {"only": "pt-PT"}}
+    expanded = expand(PT, delta)
+    assert expanded == PT_PT
+    assert list(expanded) == list(PT_PT)
+    # Objetos que o delta não toca são os da base
+    assert expanded["nav"] is PT["nav"]
+
+
+def test_extract_then_expand_round_trips(locales):
+    locales_dir = locales.write({"pt": PT, "pt-PT": PT_PT})
+    variant = extract_variant("pt-PT", locales_dir)
+    with open(variant_path("pt-PT", locales_dir), encoding="utf-8") as f:
+        stored = json.load(f)
+    assert stored == variant.delta
+    assert expand(PT, stored) == PT_PT
+
+
+def test_full_locale_wins_over_an_extracted_delta(locales):
+    locales_dir = locales.write({"pt": PT, "pt-PT": PT_PT})
+    extract_variant("pt-PT", locales_dir)
+    synced = dict(PT_PT, title="Aplicação")
+    locales.write({"pt-PT": synced})
+
+    variant = load_variants(locales_dir)["pt-PT"]
+    assert not variant.stored and variant.expanded == synced
+    assert load_variants(locales_dir, include_full=False) == {}
+
+
+def test_delta_only_variant_is_expanded(locales):
+    locales_dir = locales.write({"pt": PT})
+    locales.root.joinpath("variants").mkdir()
+    with open(variant_path("pt-BR", locales_dir), "w", encoding="utf-8") as f:
+        json.dump({"title": "Aplicativo"}, f)
+    variant = load_variants(locales_dir)["pt-BR"]
+    assert variant.stored and variant.base == "pt"
+    assert variant.expanded == dict(PT, title="Aplicativo")